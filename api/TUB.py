@@ -1,10 +1,15 @@
 # api/TUB.py
 # Launches USER + ADMIN servers together
+# The launcher owns the single supervised Rasa process (and the shared
+# sentiment sidecar, if configured); servers never spawn them.
 
 import multiprocessing
 import uvicorn
 import os
 
+from api.rasa_supervisor import start_rasa_supervisor
+from intelligence.Sentiment_Analysis.sidecar import start_sentiment_sidecar
+
 def run_user_server():
     uvicorn.run(
         "api.api_server:app",
@@ -22,11 +27,21 @@ def run_admin_server():
     )
 
 if __name__ == "__main__":
+    # Start Rasa first, but do not wait for it: non-chat routes serve immediately
+    rasa = start_rasa_supervisor()
+    sentiment = start_sentiment_sidecar()
+
     user = multiprocessing.Process(target=run_user_server)
     admin = multiprocessing.Process(target=run_admin_server)
 
     user.start()
     admin.start()
 
-    user.join()
-    admin.join()
+    try:
+        user.join()
+        admin.join()
+    finally:
+        if rasa:
+            rasa.stop()
+        if sentiment:
+            sentiment.stop()
@@ -0,0 +1,181 @@
+# api/admission.py
+# Admission control / load shedding for expensive endpoints (/api/chat).
+#
+# At most `max_concurrency` requests run at once per worker. Up to
+# `max_queue` more may wait, but no longer than `queue_timeout` seconds;
+# everything beyond that is shed immediately with a 503 + Retry-After
+# instead of piling up until gunicorn kills the worker.
+# Authenticated customers wait in a priority lane that is always served
+# before the guest lane.
+
+import os
+import time
+import asyncio
+import logging
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict
+
+from starlette.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+from api.metrics import REGISTRY
+
+LOG = logging.getLogger(__name__)
+
+CHAT_MAX_CONCURRENCY = int(os.getenv("CHAT_MAX_CONCURRENCY", 32))
+CHAT_MAX_QUEUE = int(os.getenv("CHAT_MAX_QUEUE", 64))
+CHAT_QUEUE_TIMEOUT_MS = float(os.getenv("CHAT_QUEUE_TIMEOUT_MS", 2000))
+CHAT_RETRY_AFTER = int(os.getenv("CHAT_RETRY_AFTER", 2))
+
+PRIORITY_CUSTOMER = "customer"
+PRIORITY_GUEST = "guest"
+_LANES = (PRIORITY_CUSTOMER, PRIORITY_GUEST)   # service order
+
+ADMISSION_ACTIVE = REGISTRY.gauge("tub_admission_active", "Requests currently admitted", ("gate",))
+ADMISSION_QUEUED = REGISTRY.gauge("tub_admission_queue_depth", "Requests waiting for admission", ("gate", "lane"))
+ADMISSION_ADMITTED = REGISTRY.counter("tub_admission_admitted_total", "Requests admitted", ("gate", "lane"))
+ADMISSION_SHED = REGISTRY.counter("tub_admission_shed_total", "Requests rejected by admission control", ("gate", "lane", "reason"))
+ADMISSION_WAIT = REGISTRY.histogram(
+    "tub_admission_wait_seconds", "Time spent queued before admission", ("gate", "lane"),
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0),
+)
+
+
+class Overloaded(Exception):
+    def __init__(self, reason: str, retry_after: int = CHAT_RETRY_AFTER):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionGate:
+    """
+    Bounded-concurrency gate with a short, deadline-limited, two-lane wait queue.
+    Lives on one event loop (one per worker); not thread-safe by design.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_concurrency: int = CHAT_MAX_CONCURRENCY,
+        max_queue: int = CHAT_MAX_QUEUE,
+        queue_timeout_ms: float = CHAT_QUEUE_TIMEOUT_MS,
+        retry_after: int = CHAT_RETRY_AFTER,
+    ):
+        self.name = name
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_queue = max(0, max_queue)
+        self.queue_timeout = queue_timeout_ms / 1000.0
+        self.retry_after = retry_after
+        self._active = 0
+        self._lanes: Dict[str, Deque[asyncio.Future]] = {lane: deque() for lane in _LANES}
+
+    # ----- bookkeeping -----
+    def queued(self) -> int:
+        return sum(len(q) for q in self._lanes.values())
+
+    def _publish(self) -> None:
+        ADMISSION_ACTIVE.set(self._active, self.name)
+        for lane, q in self._lanes.items():
+            ADMISSION_QUEUED.set(len(q), self.name, lane)
+
+    def _shed(self, lane: str, reason: str) -> Overloaded:
+        ADMISSION_SHED.inc(self.name, lane, reason)
+        self._publish()
+        return Overloaded(reason, self.retry_after)
+
+    # ----- acquire / release -----
+    async def acquire(self, lane: str = PRIORITY_GUEST) -> None:
+        if lane not in self._lanes:
+            lane = PRIORITY_GUEST
+
+        if self._active < self.max_concurrency and not self.queued():
+            self._active += 1
+            ADMISSION_ADMITTED.inc(self.name, lane)
+            self._publish()
+            return
+
+        if self.queued() >= self.max_queue:
+            raise self._shed(lane, "queue_full")
+
+        fut: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._lanes[lane].append(fut)
+        self._publish()
+        start = time.perf_counter()
+        try:
+            # shield: a timeout must not cancel a slot that was just handed over
+            await asyncio.wait_for(asyncio.shield(fut), self.queue_timeout)
+        except asyncio.TimeoutError:
+            if fut.done() and not fut.cancelled():
+                pass  # granted right at the deadline; keep the slot
+            else:
+                fut.cancel()
+                self._remove(lane, fut)
+                raise self._shed(lane, "queue_timeout")
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                self.release()   # pass the slot on to the next waiter
+            else:
+                fut.cancel()
+                self._remove(lane, fut)
+                self._publish()
+            raise
+
+        ADMISSION_WAIT.observe(time.perf_counter() - start, self.name, lane)
+        ADMISSION_ADMITTED.inc(self.name, lane)
+        self._publish()
+
+    def _remove(self, lane: str, fut: asyncio.Future) -> None:
+        try:
+            self._lanes[lane].remove(fut)
+        except ValueError:
+            pass
+
+    def release(self) -> None:
+        # hand the slot straight to the next waiter, customers first
+        for lane in _LANES:
+            q = self._lanes[lane]
+            while q:
+                fut = q.popleft()
+                if not fut.done():
+                    fut.set_result(True)
+                    self._publish()
+                    return
+        self._active -= 1
+        self._publish()
+
+    @asynccontextmanager
+    async def slot(self, lane: str = PRIORITY_GUEST) -> AsyncIterator[None]:
+        await self.acquire(lane)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "active": self._active,
+            "max_concurrency": self.max_concurrency,
+            "queued": self.queued(),
+            "max_queue": self.max_queue,
+        }
+
+
+class GatedStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse that owns a slot acquired before it was created and
+    releases it when the response ends, however it ends. The body
+    generator's own `finally` is not enough: a client that disconnects
+    before the first chunk closes an unstarted generator, which never runs it.
+    """
+
+    def __init__(self, content: Any, gate: AdmissionGate, **kwargs: Any):
+        super().__init__(content, **kwargs)
+        self.gate = gate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            self.gate.release()
@@ -1,28 +1,43 @@
 # api_server.py – Trust Union Bank Backend
 # MODE: SESSIONLESS, RASA-DRIVEN RESPONSES
 
-from fastapi import FastAPI, HTTPException, Header
+from fastapi import FastAPI, HTTPException, Header, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse, FileResponse
+from fastapi.responses import HTMLResponse, FileResponse, JSONResponse, Response
 from pydantic import BaseModel
-from typing import Optional
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+import asyncio
+import httpx
+import json
 import os
+import time
 import sys
 import logging
-import requests
-import subprocess
-import time
-import atexit
+from contextlib import asynccontextmanager
 from pathlib import Path
 from dotenv import load_dotenv
 
-from database.core.connect import init_pool
+from database.core.connect import init_pool, pool_stats
+from database.core.async_db import run_in_db, get_db_executor, executor_stats
 from auth.authentication.primary_auth import login_start, login_verify
 from auth.authentication.token_manager import token_manager
-from database.user.user_db import get_user_by_customer_id, get_user_balance_from_db
+from database.user.user_db import get_user_by_customer_id, get_user_balance_from_db, get_user_summary
 from database.user.branch_db import get_all_branches, get_user_accounts
 from intelligence.Sentiment_Analysis.Detect_Sentiment import get_sentiment_analyzer
+from intelligence.resource_governor import get_resource_governor
+from api.rasa_client import get_rasa_client
+from api.rasa_supervisor import start_rasa_supervisor
+from api.admission import AdmissionGate, GatedStreamingResponse, Overloaded, PRIORITY_CUSTOMER, PRIORITY_GUEST
+from api.metrics import (
+    CONTENT_TYPE as METRICS_CONTENT_TYPE,
+    REGISTRY,
+    MetricsMiddleware,
+    export_stats,
+    register_collector,
+    render_metrics,
+    stage,
+)
 
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
@@ -35,6 +50,8 @@ sys.path.insert(0, str(PROJECT_ROOT))
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("trustunionbank")
+# httpx logs every Rasa call at INFO; that is per-message overhead on the chat path
+logging.getLogger("httpx").setLevel(logging.WARNING)
 
 try:
     init_pool()
@@ -43,60 +60,6 @@ except Exception as e:
     logger.warning("⚠️ Database init failed: %s", e)
 
 
-RASA_PROCESS = None
-RASA_URL = os.getenv(
-    "RASA_URL",
-    "http://localhost:5005/webhooks/rest/webhook"
-)
-
-def start_rasa_server():
-    global RASA_PROCESS
-
-    if os.getenv("AUTO_START_RASA", "true").lower() not in ("1", "true", "yes"):
-        logger.info("⚠️ AUTO_START_RASA disabled")
-        return
-
-    try:
-        logger.info("🚀 Starting Rasa server...")
-
-        RASA_PROCESS = subprocess.Popen(
-            [
-                "rasa",
-                "run",
-                "--enable-api",
-                "--cors",
-                "*",
-                "--port",
-                "5005",
-            ],
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL,
-        )
-
-        # Give Rasa time to boot
-        time.sleep(6)
-
-        logger.info("✅ Rasa server started")
-
-    except FileNotFoundError:
-        logger.error("❌ Rasa not found. Install with: pip install rasa")
-    except Exception as e:
-        logger.exception("❌ Failed to start Rasa: %s", e)
-
-def stop_rasa_server():
-    global RASA_PROCESS
-    if RASA_PROCESS:
-        logger.info("🛑 Stopping Rasa server...")
-        RASA_PROCESS.terminate()
-        try:
-            RASA_PROCESS.wait(timeout=10)
-        except Exception:
-            pass
-
-atexit.register(stop_rasa_server)
-
-start_rasa_server()
-
 ALLOWED_ORIGINS = [
     "http://localhost",
     "http://127.0.0.1",
@@ -106,9 +69,28 @@ ALLOWED_ORIGINS = [
     "http://127.0.0.1:8000",
 ]
 
+rasa_client = get_rasa_client()
+chat_gate = AdmissionGate("chat")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One pooled Rasa client per worker, reused across requests
+    await rasa_client.start()
+    # Model loads in the background; chat uses the lexicon fallback until it is ready
+    sentiment_analyzer.start_loading()
+    try:
+        yield
+    finally:
+        await rasa_client.close()
+        await sentiment_analyzer.aclose()
+        get_db_executor().shutdown(wait=False)
+
+
 app = FastAPI(
     title="Trust Union Bank API",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -118,6 +100,39 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(MetricsMiddleware)
+
+
+# -------------------------------------------------
+# METRICS (pull-style gauges, evaluated on scrape)
+# -------------------------------------------------
+_db_pool_gauge = REGISTRY.gauge("tub_db_pool", "Postgres pool statistics", ("stat",))
+_db_executor_gauge = REGISTRY.gauge("tub_db_executor", "DB executor statistics", ("stat",))
+_token_cache_gauge = REGISTRY.gauge("tub_token_cache", "Verified JWT cache statistics", ("stat",))
+_rasa_healthy_gauge = REGISTRY.gauge("tub_rasa_upstream_healthy", "1 if the Rasa upstream is not ejected", ("upstream",))
+_rasa_hedges_gauge = REGISTRY.gauge("tub_rasa_hedges", "Hedged Rasa requests", ("stat",))
+_inference_budget_gauge = REGISTRY.gauge("tub_inference_budget", "CPU thread budget for model inference in this worker", ("stat",))
+_sentiment_gauge = REGISTRY.gauge("tub_sentiment", "Sentiment inference statistics (batcher or sidecar client, result cache, tiers)", ("stat",))
+
+
+def _collect_runtime_stats():
+    export_stats(_db_pool_gauge, pool_stats())
+    export_stats(_db_executor_gauge, executor_stats())
+    export_stats(_token_cache_gauge, token_manager.cache.stats())
+    rasa_stats = rasa_client.stats()
+    for upstream in rasa_stats["upstreams"]:
+        _rasa_healthy_gauge.set(1 if upstream["healthy"] else 0, upstream["url"])
+    export_stats(_rasa_hedges_gauge, rasa_stats, ("hedges_fired", "hedges_won"))
+    export_stats(_sentiment_gauge, sentiment_analyzer.stats())
+    export_stats(_inference_budget_gauge, get_resource_governor().stats())
+
+
+register_collector(_collect_runtime_stats)
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return Response(render_metrics(), media_type=METRICS_CONTENT_TYPE)
 
 sentiment_analyzer = get_sentiment_analyzer()
 class ChatRequest(BaseModel):
@@ -134,14 +149,14 @@ class VerifyOTPRequest(BaseModel):
 
 @app.post("/api/auth/login/start")
 async def login_start_endpoint(request: LoginRequest):
-    result = login_start(request.identifier)
+    result = await run_in_db(login_start, request.identifier)
     if result.get("success"):
         return result
     raise HTTPException(status_code=400, detail=result.get("reason"))
 
 @app.post("/api/auth/login/verify")
 async def login_verify_endpoint(request: VerifyOTPRequest):
-    result = login_verify(request.customer_id, request.otp_code)
+    result = await run_in_db(login_verify, request.customer_id, request.otp_code)
     if result.get("success"):
         return result
     raise HTTPException(status_code=401, detail=result.get("reason"))
@@ -152,56 +167,80 @@ async def login_verify_endpoint(request: VerifyOTPRequest):
 # -------------------------------------------------
 # CHAT (RASA FULLY OWNS RESPONSE)
 # -------------------------------------------------
+FALLBACK_BOT_RESPONSE = "Sorry, I didn’t understand that."
+
+
+def _optional_customer_id(authorization: Optional[str]) -> Optional[int]:
+    if not authorization:
+        return None
+    with stage("jwt"):
+        token = authorization.replace("Bearer ", "")
+        payload = token_manager.decode_token(token)
+    sub = payload.get("sub")
+    return int(sub) if sub is not None else None
+
+
+def _rasa_payload(request: ChatRequest, customer_id: Optional[int], sentiment: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "sender": f"user_{customer_id or 'guest'}",
+        "message": request.message,
+        "metadata": {
+            "customer_id": customer_id,
+            "lang": request.lang,
+            "sentiment": sentiment,
+        },
+    }
+
+
 @app.post("/api/chat")
 async def chat_endpoint(
     request: ChatRequest,
     authorization: Optional[str] = Header(None),
 ):
     try:
-        customer_id: Optional[int] = None
-
         # JWT (optional)
-        if authorization:
-            token = authorization.replace("Bearer ", "")
-            payload = token_manager.decode_token(token)
-            sub = payload.get("sub")
-            if sub is not None:
-                customer_id = int(sub)
-
-        # Sentiment
-        sentiment = sentiment_analyzer.analyze(request.message)
-
-        # Forward to Rasa
-        rasa_payload = {
-            "sender": f"user_{customer_id or 'guest'}",
-            "message": request.message,
-            "metadata": {
-                "customer_id": customer_id,
-                "lang": request.lang,
-                "sentiment": sentiment,
-            },
-        }
+        customer_id = _optional_customer_id(authorization)
 
-        rasa_response = requests.post(
-            RASA_URL,
-            json=rasa_payload,
-            timeout=10,
-        )
-        rasa_response.raise_for_status()
+        # Admission control: customers are served ahead of guests
+        lane = PRIORITY_CUSTOMER if customer_id is not None else PRIORITY_GUEST
+        async with chat_gate.slot(lane):
+            # Sentiment
+            with stage("sentiment"):
+                sentiment = await sentiment_analyzer.analyze_async(request.message)
+
+            # Forward to Rasa
+            rasa_payload = _rasa_payload(request, customer_id, sentiment)
 
-        rasa_messages = rasa_response.json()
+            # includes Rasa's own round trip to the action server
+            with stage("rasa"):
+                rasa_messages = await rasa_client.send(rasa_payload)
 
         if isinstance(rasa_messages, list) and rasa_messages:
             return {
                 "bot_response": rasa_messages[0].get("text", ""),
+                "bot_messages": [m.get("text", "") for m in rasa_messages if m.get("text")],
                 "lang": request.lang,
             }
 
         return {
-            "bot_response": "Sorry, I didn’t understand that.",
+            "bot_response": FALLBACK_BOT_RESPONSE,
             "lang": request.lang,
         }
 
+    except Overloaded as e:
+        raise HTTPException(
+            status_code=503,
+            detail="Chat is busy, please retry shortly",
+            headers={"Retry-After": str(e.retry_after)},
+        )
+    except httpx.TransportError:
+        # Rasa still booting or restarting under the supervisor
+        logger.warning("Rasa unavailable")
+        raise HTTPException(
+            status_code=503,
+            detail="Assistant is starting, please retry shortly",
+            headers={"Retry-After": "2"},
+        )
     except Exception:
         logger.exception("❌ Chat error")
         raise HTTPException(
@@ -210,16 +249,207 @@ async def chat_endpoint(
         )
 
 
+def _sse(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@app.post("/api/chat/stream")
+async def chat_stream_endpoint(
+    request: ChatRequest,
+    authorization: Optional[str] = Header(None),
+):
+    """
+    Server-Sent Events variant of /api/chat.
+    Emits `sentiment` first, then one `message` event per Rasa bot message
+    as soon as Rasa dispatches it, then `done` (or `error`).
+    """
+    try:
+        customer_id = _optional_customer_id(authorization)
+    except Exception:
+        raise HTTPException(status_code=401, detail="Invalid token")
+
+    lane = PRIORITY_CUSTOMER if customer_id is not None else PRIORITY_GUEST
+    try:
+        # reject before the stream starts so the client sees a real 503
+        await chat_gate.acquire(lane)
+    except Overloaded as e:
+        raise HTTPException(
+            status_code=503,
+            detail="Chat is busy, please retry shortly",
+            headers={"Retry-After": str(e.retry_after)},
+        )
+
+    async def events() -> AsyncIterator[str]:
+        try:
+            with stage("sentiment"):
+                sentiment = await sentiment_analyzer.analyze_async(request.message)
+            yield _sse("sentiment", {"sentiment": sentiment, "lang": request.lang})
+
+            count = 0
+            with stage("rasa"):
+                async for message in rasa_client.stream(_rasa_payload(request, customer_id, sentiment)):
+                    count += 1
+                    yield _sse("message", message)
+
+            if count == 0:
+                yield _sse("message", {"text": FALLBACK_BOT_RESPONSE})
+            yield _sse("done", {"count": count, "lang": request.lang})
+        except httpx.TransportError:
+            logger.warning("Rasa unavailable")
+            yield _sse("error", {"detail": "Assistant is starting, please retry shortly"})
+        except Exception:
+            logger.exception("❌ Chat stream error")
+            yield _sse("error", {"detail": "Chat processing failed"})
+
+    # the response, not the generator, gives the slot back (see GatedStreamingResponse)
+    return GatedStreamingResponse(
+        events(),
+        chat_gate,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+# -------------------------------------------------
+# CHAT OVER WEBSOCKET (auth once per connection)
+# -------------------------------------------------
+# Frames received while earlier ones are still with Rasa are queued up to
+# this many; beyond that the socket stops reading (TCP backpressure).
+WS_CHAT_MAX_PENDING = int(os.getenv("WS_CHAT_MAX_PENDING", 16))
+WS_BEARER_SUBPROTOCOL = "bearer"
+
+_ws_connections_gauge = REGISTRY.gauge("tub_ws_chat_connections", "Open /ws/chat connections")
+_ws_messages_counter = REGISTRY.counter("tub_ws_chat_messages_total", "/ws/chat messages by outcome", ("outcome",))
+
+
+def _ws_credentials(websocket: WebSocket) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Returns (token, subprotocol to accept). Browsers cannot set headers on a
+    WebSocket, so the token may come as the subprotocol pair ["bearer", <jwt>];
+    non-browser clients can send an Authorization header instead.
+    """
+    authorization = websocket.headers.get("authorization")
+    if authorization:
+        return authorization.replace("Bearer ", ""), None
+    protocols = [p.strip() for p in websocket.headers.get("sec-websocket-protocol", "").split(",")]
+    if len(protocols) >= 2 and protocols[0] == WS_BEARER_SUBPROTOCOL:
+        return protocols[1], WS_BEARER_SUBPROTOCOL
+    return None, None
+
+
+async def _ws_reply(request: ChatRequest, customer_id: Optional[int]) -> Dict[str, Any]:
+    lane = PRIORITY_CUSTOMER if customer_id is not None else PRIORITY_GUEST
+    async with chat_gate.slot(lane):
+        with stage("sentiment"):
+            sentiment = await sentiment_analyzer.analyze_async(request.message)
+        with stage("rasa"):
+            rasa_messages = await rasa_client.send(_rasa_payload(request, customer_id, sentiment))
+
+    texts = [m.get("text", "") for m in rasa_messages if m.get("text")]
+    return {
+        "bot_response": texts[0] if texts else FALLBACK_BOT_RESPONSE,
+        "bot_messages": texts or [FALLBACK_BOT_RESPONSE],
+        "lang": request.lang,
+    }
+
+
+@app.websocket("/ws/chat")
+async def chat_websocket(websocket: WebSocket):
+    """
+    Long-lived chat channel. The JWT is verified once at handshake and the
+    customer_id / language are kept on the connection.
+
+    Client frames: {"message": "...", "lang"?: "hi", "id"?: any} (or plain text)
+    Server frames: {"id", "bot_response", "bot_messages", "lang"} or {"id", "error", ...}
+
+    Frames are pipelined: the socket keeps reading while earlier messages are
+    with Rasa, but replies are produced strictly in order so the conversation
+    tracker sees messages in the order they were sent.
+    """
+    # CORSMiddleware does not apply to WebSockets
+    origin = websocket.headers.get("origin")
+    if origin and origin not in ALLOWED_ORIGINS:
+        await websocket.close(code=1008)
+        return
+
+    token, subprotocol = _ws_credentials(websocket)
+    customer_id: Optional[int] = None
+    expires_at: Optional[float] = None
+    if token:
+        try:
+            with stage("jwt"):
+                claims = token_manager.decode_token(token)
+        except Exception:
+            await websocket.close(code=1008, reason="Invalid token")
+            return
+        sub = claims.get("sub")
+        customer_id = int(sub) if sub is not None else None
+        expires_at = claims.get("exp")
+
+    await websocket.accept(subprotocol=subprotocol)
+    lang = websocket.query_params.get("lang") or "en"
+
+    pending: asyncio.Queue = asyncio.Queue(maxsize=WS_CHAT_MAX_PENDING)
+    _ws_connections_gauge.inc()
+
+    async def worker():
+        while True:
+            msg_id, request = await pending.get()
+            try:
+                reply = await _ws_reply(request, customer_id)
+                _ws_messages_counter.inc("ok")
+            except Overloaded as e:
+                _ws_messages_counter.inc("overloaded")
+                reply = {"error": "busy", "retry_after": e.retry_after}
+            except httpx.TransportError:
+                logger.warning("Rasa unavailable")
+                _ws_messages_counter.inc("unavailable")
+                reply = {"error": "unavailable", "retry_after": 2}
+            except Exception:
+                logger.exception("❌ WebSocket chat error")
+                _ws_messages_counter.inc("error")
+                reply = {"error": "failed"}
+            await websocket.send_json({"id": msg_id, **reply})
+
+    worker_task = asyncio.create_task(worker())
+    try:
+        while not worker_task.done():
+            raw = await websocket.receive_text()
+            try:
+                frame = json.loads(raw)
+            except ValueError:
+                frame = {"message": raw}
+            if not isinstance(frame, dict) or not str(frame.get("message") or "").strip():
+                await websocket.send_json({"id": None, "error": "empty_message"})
+                continue
+            if expires_at is not None and time.time() >= expires_at:
+                # verified once at handshake, so expiry is enforced here
+                _ws_messages_counter.inc("token_expired")
+                await websocket.send_json({"id": frame.get("id"), "error": "token_expired"})
+                await websocket.close(code=1008, reason="Token expired")
+                break
+            lang = frame.get("lang") or lang
+            await pending.put((frame.get("id"), ChatRequest(message=str(frame["message"]), lang=lang)))
+    except WebSocketDisconnect:
+        pass
+    finally:
+        worker_task.cancel()
+        await asyncio.gather(worker_task, return_exceptions=True)
+        _ws_connections_gauge.dec()
+
+
 @app.get("/api/user/profile")
 async def get_profile(authorization: str = Header(...)):
-    token = authorization.replace("Bearer ", "")
-    payload = token_manager.decode_token(token)
+    with stage("jwt"):
+        token = authorization.replace("Bearer ", "")
+        payload = token_manager.decode_token(token)
 
     sub = payload.get("sub")
     if sub is None:
         raise HTTPException(status_code=401, detail="Invalid token")
 
-    user = get_user_by_customer_id(int(sub))
+    with stage("db"):
+        user = await run_in_db(get_user_by_customer_id, int(sub))
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
@@ -227,29 +457,69 @@ async def get_profile(authorization: str = Header(...)):
 
 @app.get("/api/user/accounts")
 async def get_accounts(authorization: str = Header(...)):
-    token = authorization.replace("Bearer ", "")
-    payload = token_manager.decode_token(token)
+    with stage("jwt"):
+        token = authorization.replace("Bearer ", "")
+        payload = token_manager.decode_token(token)
 
     sub = payload.get("sub")
     if sub is None:
         raise HTTPException(status_code=401, detail="Invalid token")
 
-    return {"accounts": get_user_accounts(int(sub))}
+    with stage("db"):
+        accounts = await run_in_db(get_user_accounts, int(sub))
+    return {"accounts": accounts}
 
 @app.get("/api/user/balance")
 async def get_balance(authorization: str = Header(...)):
-    token = authorization.replace("Bearer ", "")
-    payload = token_manager.decode_token(token)
+    with stage("jwt"):
+        token = authorization.replace("Bearer ", "")
+        payload = token_manager.decode_token(token)
 
     sub = payload.get("sub")
     if sub is None:
         raise HTTPException(status_code=401, detail="Invalid token")
 
-    return {"balance": get_user_balance_from_db(int(sub))}
+    with stage("db"):
+        balance = await run_in_db(get_user_balance_from_db, int(sub))
+    return {"balance": balance}
+
+@app.get("/api/user/summary")
+async def get_summary(authorization: str = Header(...)):
+    with stage("jwt"):
+        token = authorization.replace("Bearer ", "")
+        payload = token_manager.decode_token(token)
+
+    sub = payload.get("sub")
+    if sub is None:
+        raise HTTPException(status_code=401, detail="Invalid token")
+
+    with stage("db"):
+        summary = await run_in_db(get_user_summary, int(sub))
+    if not summary:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    return summary
+
+@app.get("/api/ready", include_in_schema=False)
+async def ready(strict: bool = False):
+    """
+    Readiness probe. The API serves as soon as it is up; pass ?strict=1 to
+    get 503 while the sentiment model is still loading.
+    """
+    loaded = sentiment_analyzer.wait_loaded(0)
+    body = {
+        "status": "ok" if sentiment_analyzer.is_ready() else ("degraded" if loaded else "warming"),
+        "sentiment": sentiment_analyzer.model_state,
+        "sentiment_load_seconds": sentiment_analyzer.load_seconds,
+    }
+    if strict and not loaded:
+        return JSONResponse(body, status_code=503)
+    return body
+
 
 @app.get("/api/branches")
 async def branches():
-    return {"branches": get_all_branches()}
+    return {"branches": await run_in_db(get_all_branches)}
 
 
 static_dir = PROJECT_ROOT / "frontend/static"
@@ -281,6 +551,9 @@ if __name__ == "__main__":
     print(f"🌐 Server URL: http://localhost:{PORT} or http://127.0.0.1:{PORT}")
     print(f"{'='*60}\n")
 
+    # Standalone run: this process is the launcher, so it owns Rasa
+    rasa_supervisor = start_rasa_supervisor()
+
     if ENVIRONMENT == "production":
         if is_windows:
             logger.warning("Running on Windows - forcing single worker to avoid child process crashes.")
@@ -289,3 +562,6 @@ if __name__ == "__main__":
             uvicorn.run(app, host=HOST, port=PORT, workers=WORKERS, log_level="info", access_log=True)
     else:
         uvicorn.run(app, host=HOST, port=PORT, log_level="debug")
+
+    if rasa_supervisor:
+        rasa_supervisor.stop()
@@ -22,6 +22,11 @@ access_log_format = '%(h)s %(l)s %(u)s %(t)s "%(r)s" %(s)s %(b)s "%(f)s" "%(a)s"
 # Process naming
 proc_name = 'trustunionbank'
 
+# Rasa and the shared sentiment sidecar are supervised by the master
+# process only (see on_starting)
+_rasa_supervisor = None
+_sentiment_sidecar = None
+
 # Server mechanics
 daemon = False
 pidfile = None
@@ -30,6 +35,21 @@ user = None
 group = None
 tmp_upload_dir = None
 
+def on_starting(server):
+    """Called in the master before workers are forked."""
+    global _rasa_supervisor, _sentiment_sidecar
+    from api.rasa_supervisor import start_rasa_supervisor
+    from intelligence.Sentiment_Analysis.sidecar import start_sentiment_sidecar
+    _rasa_supervisor = start_rasa_supervisor()
+    # one model for all workers when SENTIMENT_SIDECAR_SOCKET is set
+    _sentiment_sidecar = start_sentiment_sidecar()
+
+def post_fork(server, worker):
+    """Called in each worker right after fork, before the app is imported."""
+    # split the CPUs between workers before any model pulls in torch
+    from intelligence.resource_governor import govern_process
+    govern_process(workers=server.cfg.workers, worker_index=(worker.age - 1) % server.cfg.workers)
+
 def when_ready(server):
     """Called just after the server is started."""
     server.log.info("Trust Union Bank API Server is ready. Spawning workers")
@@ -37,3 +57,7 @@ def when_ready(server):
 def on_exit(server):
     """Called just before exiting."""
     server.log.info("Trust Union Bank API Server is shutting down")
+    if _rasa_supervisor:
+        _rasa_supervisor.stop()
+    if _sentiment_sidecar:
+        _sentiment_sidecar.stop()
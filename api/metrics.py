@@ -0,0 +1,304 @@
+# api/metrics.py
+# Minimal in-process metrics with Prometheus text exposition.
+#
+#   - MetricsMiddleware: per-route request histogram (pure ASGI, low overhead)
+#   - stage("jwt"): per-stage histogram for the current route (contextvar based)
+#   - register_collector(fn): pull-style gauges evaluated at scrape time
+#     (DB pool, DB executor, token cache, Rasa upstreams, ...)
+#
+# Metrics are per worker process; with several gunicorn workers each scrape
+# sees the worker that served it.
+
+import time
+import bisect
+import logging
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# ASGI scope of the request being served; the router sets scope["route"] in place
+_current_scope: ContextVar[Optional[dict]] = ContextVar("metrics_scope", default=None)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _route_of(scope: Optional[dict]) -> str:
+    if scope is None:
+        return "-"
+    return getattr(scope.get("route"), "path", None) or "unmatched"
+
+
+def _fmt(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+# -------------------------------------------------
+# Metric types
+# -------------------------------------------------
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+    def render(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name, documentation, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return self.header() + [f"{self.name}{_labels(self.labelnames, k)} {_fmt(v)}" for k, v in items]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name, documentation, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def set(self, value: float, *labels: str) -> None:
+        with self._lock:
+            self._values[labels] = float(value)
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return self.header() + [f"{self.name}{_labels(self.labelnames, k)} {_fmt(v)}" for k, v in items]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [bucket counts..., +Inf count, sum]
+        self._values: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        idx = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            row = self._values.get(labels)
+            if row is None:
+                row = self._values[labels] = [0.0] * (len(self.buckets) + 2)
+            row[idx] += 1
+            row[-1] += value
+
+    @contextmanager
+    def time(self, *labels: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *labels)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = [(k, list(v)) for k, v in self._values.items()]
+        lines = self.header()
+        for labels, row in items:
+            cumulative = 0.0
+            for bound, count in zip(self.buckets + (float("inf"),), row[:-1]):
+                cumulative += count
+                le = 'le="%s"' % _fmt(bound)
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, labels, le)} {_fmt(cumulative)}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {_fmt(row[-1])}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {_fmt(cumulative)}")
+        return lines
+
+
+# -------------------------------------------------
+# Registry
+# -------------------------------------------------
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))  # type: ignore[return-value]
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))  # type: ignore[return-value]
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))  # type: ignore[return-value]
+
+    def register_collector(self, fn: Callable[[], None]) -> None:
+        """
+        `fn` is called at scrape time and should set gauges from live stats.
+        """
+        with self._lock:
+            self._collectors.append(fn)
+
+    def render(self) -> str:
+        with self._lock:
+            collectors = list(self._collectors)
+            metrics = list(self._metrics.values())
+        for fn in collectors:
+            try:
+                fn()
+            except Exception:
+                LOG.exception("metrics collector failed")
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+HTTP_REQUESTS = REGISTRY.counter(
+    "tub_http_requests_total", "HTTP requests by route and status", ("method", "route", "status")
+)
+HTTP_LATENCY = REGISTRY.histogram(
+    "tub_http_request_duration_seconds", "HTTP request latency by route", ("method", "route")
+)
+STAGE_LATENCY = REGISTRY.histogram(
+    "tub_stage_duration_seconds", "Latency of named stages inside a request", ("route", "stage")
+)
+
+
+def register_collector(fn: Callable[[], None]) -> None:
+    REGISTRY.register_collector(fn)
+
+
+def render_metrics() -> str:
+    return REGISTRY.render()
+
+
+# -------------------------------------------------
+# Per-stage timing
+# -------------------------------------------------
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """
+    Time a stage of the current request, e.g.
+
+        with stage("rasa"):
+            await rasa_client.send(payload)
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_LATENCY.observe(time.perf_counter() - start, _route_of(_current_scope.get()), name)
+
+
+def export_stats(gauge: Gauge, stats: Dict, keys: Optional[Iterable[str]] = None, *labels: str) -> None:
+    """
+    Copy numeric entries of a stats() dict into a gauge labelled by key.
+    """
+    for key in keys or stats.keys():
+        value = stats.get(key)
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            gauge.set(value, *labels, key)
+
+
+# -------------------------------------------------
+# ASGI middleware
+# -------------------------------------------------
+class MetricsMiddleware:
+    """
+    Records request count and latency per route template (not raw path,
+    so customer ids in URLs do not explode label cardinality).
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "websocket":
+            # no per-request latency for long-lived sockets, but stage()
+            # timings inside them still get the route label
+            token = _current_scope.set(scope)
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                _current_scope.reset(token)
+            return
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        token = _current_scope.set(scope)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            route_path = _route_of(scope)
+            method = scope.get("method", "GET")
+            HTTP_LATENCY.observe(elapsed, method, route_path)
+            HTTP_REQUESTS.inc(method, route_path, str(status["code"]))
+            _current_scope.reset(token)
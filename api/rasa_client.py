@@ -0,0 +1,347 @@
+# api/rasa_client.py
+# Async, keep-alive pooled client for the Rasa REST webhook(s)
+#
+# Multiple Rasa upstreams are supported (RASA_URLS). Each conversation is
+# routed by consistent hashing on the `sender` id so its tracker stays on one
+# node; nodes that keep failing are ejected for a while (passive health check),
+# and a slow call can be hedged against the next node on the ring.
+
+import os
+import time
+import asyncio
+import bisect
+import json
+import hashlib
+import logging
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import httpx
+
+from api.metrics import REGISTRY
+
+LOG = logging.getLogger(__name__)
+
+RASA_LATENCY = REGISTRY.histogram(
+    "tub_rasa_upstream_duration_seconds", "Rasa webhook call latency per upstream", ("upstream",)
+)
+RASA_ERRORS = REGISTRY.counter(
+    "tub_rasa_upstream_errors_total", "Rasa webhook call errors per upstream", ("upstream", "kind")
+)
+
+RASA_URL = os.getenv(
+    "RASA_URL",
+    "http://localhost:5005/webhooks/rest/webhook"
+)
+# Comma-separated list of webhook URLs; falls back to the single RASA_URL
+RASA_URLS = [u.strip() for u in os.getenv("RASA_URLS", RASA_URL).split(",") if u.strip()]
+
+# Consistent hashing / passive health / hedging
+RASA_VNODES = int(os.getenv("RASA_VNODES", 100))
+RASA_EJECT_AFTER = int(os.getenv("RASA_EJECT_AFTER", 3))            # consecutive failures
+RASA_EJECT_SECONDS = float(os.getenv("RASA_EJECT_SECONDS", 30))
+# 0 disables hedging. Only enable with a shared tracker store: a hedged
+# message may be processed by both nodes.
+RASA_HEDGE_AFTER_MS = float(os.getenv("RASA_HEDGE_AFTER_MS", 0))
+
+# Pool sizing (per worker process)
+RASA_POOL_SIZE = int(os.getenv("RASA_POOL_SIZE", 20))
+RASA_POOL_KEEPALIVE = int(os.getenv("RASA_POOL_KEEPALIVE", RASA_POOL_SIZE))
+RASA_KEEPALIVE_EXPIRY = float(os.getenv("RASA_KEEPALIVE_EXPIRY", 30))
+
+# Per-call timeouts (seconds)
+RASA_CONNECT_TIMEOUT = float(os.getenv("RASA_CONNECT_TIMEOUT", 2))
+RASA_READ_TIMEOUT = float(os.getenv("RASA_READ_TIMEOUT", 10))
+RASA_POOL_TIMEOUT = float(os.getenv("RASA_POOL_TIMEOUT", 5))
+
+
+class Upstream:
+    """
+    One Rasa node plus its passive health state.
+    """
+
+    def __init__(self, url: str):
+        self.url = url
+        self.consecutive_failures = 0
+        self.ejected_until = 0.0
+        self.requests = 0
+        self.failures = 0
+        self.ejections = 0
+
+    def healthy(self, now: Optional[float] = None) -> bool:
+        return (now or time.monotonic()) >= self.ejected_until
+
+    def record_success(self) -> None:
+        self.requests += 1
+        self.consecutive_failures = 0
+
+    def record_failure(self, eject_after: int, eject_seconds: float) -> None:
+        self.requests += 1
+        self.failures += 1
+        self.consecutive_failures += 1
+        if self.consecutive_failures >= eject_after and self.healthy():
+            self.ejected_until = time.monotonic() + eject_seconds
+            self.ejections += 1
+            LOG.warning("Ejecting Rasa upstream %s for %.0fs", self.url, eject_seconds)
+
+
+class HashRing:
+    """
+    Consistent hash ring with virtual nodes.
+    """
+
+    def __init__(self, nodes: List[Upstream], vnodes: int = RASA_VNODES):
+        self.nodes = nodes
+        ring = []
+        for idx, node in enumerate(nodes):
+            for v in range(max(1, vnodes)):
+                ring.append((self._hash(f"{node.url}#{v}"), idx))
+        ring.sort()
+        self._keys = [h for h, _ in ring]
+        self._owners = [idx for _, idx in ring]
+
+    @staticmethod
+    def _hash(key: str) -> int:
+        return int.from_bytes(hashlib.md5(key.encode()).digest()[:8], "big")
+
+    def preference_list(self, key: str) -> List[Upstream]:
+        """
+        Distinct nodes in ring order starting at the key's position.
+        """
+        if not self._keys:
+            return []
+        start = bisect.bisect(self._keys, self._hash(key)) % len(self._keys)
+        seen: List[int] = []
+        for i in range(len(self._keys)):
+            owner = self._owners[(start + i) % len(self._keys)]
+            if owner not in seen:
+                seen.append(owner)
+                if len(seen) == len(self.nodes):
+                    break
+        return [self.nodes[i] for i in seen]
+
+
+class RasaClient:
+    """
+    Thin wrapper around a shared httpx.AsyncClient.
+    One instance lives for the app's lifetime; call start() on startup
+    and close() on shutdown so keep-alive connections are reused.
+    """
+
+    def __init__(
+        self,
+        url: Optional[str] = None,
+        pool_size: int = RASA_POOL_SIZE,
+        keepalive: int = RASA_POOL_KEEPALIVE,
+        connect_timeout: float = RASA_CONNECT_TIMEOUT,
+        read_timeout: float = RASA_READ_TIMEOUT,
+        pool_timeout: float = RASA_POOL_TIMEOUT,
+        urls: Optional[List[str]] = None,
+        hedge_after_ms: float = RASA_HEDGE_AFTER_MS,
+        eject_after: int = RASA_EJECT_AFTER,
+        eject_seconds: float = RASA_EJECT_SECONDS,
+    ):
+        urls = urls or ([url] if url else RASA_URLS)
+        self.upstreams = [Upstream(u) for u in urls]
+        self.ring = HashRing(self.upstreams)
+        self.url = self.upstreams[0].url
+        self.hedge_after = hedge_after_ms / 1000.0
+        self.eject_after = eject_after
+        self.eject_seconds = eject_seconds
+        self.hedges_fired = 0
+        self.hedges_won = 0
+        self.limits = httpx.Limits(
+            max_connections=pool_size,
+            max_keepalive_connections=keepalive,
+            keepalive_expiry=RASA_KEEPALIVE_EXPIRY,
+        )
+        self.timeout = httpx.Timeout(
+            connect=connect_timeout,
+            read=read_timeout,
+            write=read_timeout,
+            pool=pool_timeout,
+        )
+        self._client: Optional[httpx.AsyncClient] = None
+
+    async def start(self) -> None:
+        if self._client is None:
+            self._client = httpx.AsyncClient(limits=self.limits, timeout=self.timeout)
+            LOG.info(
+                "Rasa client ready (upstreams=%s pool=%s keepalive=%s)",
+                [u.url for u in self.upstreams],
+                self.limits.max_connections,
+                self.limits.max_keepalive_connections,
+            )
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _call_timeout(self, timeout: Optional[float]) -> httpx.Timeout:
+        if timeout is None:
+            return self.timeout
+        return httpx.Timeout(
+            connect=self.timeout.connect,
+            read=timeout,
+            write=timeout,
+            pool=self.timeout.pool,
+        )
+
+    def route(self, sender: str) -> List[Upstream]:
+        """
+        Upstreams for this sender, sticky node first, ejected nodes last.
+        """
+        nodes = self.ring.preference_list(sender)
+        now = time.monotonic()
+        return [n for n in nodes if n.healthy(now)] + [n for n in nodes if not n.healthy(now)]
+
+    async def _post(self, upstream: Upstream, payload: Dict[str, Any], timeout: httpx.Timeout) -> List[Dict[str, Any]]:
+        assert self._client is not None
+        start = time.perf_counter()
+        try:
+            resp = await self._client.post(upstream.url, json=payload, timeout=timeout)
+            resp.raise_for_status()
+            data = resp.json()
+        except asyncio.CancelledError:
+            raise
+        except httpx.HTTPStatusError as e:
+            RASA_ERRORS.inc(upstream.url, f"http_{e.response.status_code}")
+            if e.response.status_code >= 500:
+                upstream.record_failure(self.eject_after, self.eject_seconds)
+            raise
+        except Exception as e:
+            RASA_ERRORS.inc(upstream.url, type(e).__name__)
+            upstream.record_failure(self.eject_after, self.eject_seconds)
+            raise
+        finally:
+            RASA_LATENCY.observe(time.perf_counter() - start, upstream.url)
+        upstream.record_success()
+        return data if isinstance(data, list) else []
+
+    async def send(
+        self,
+        payload: Dict[str, Any],
+        timeout: Optional[float] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        POST a message to Rasa and return the list of bot messages.
+        `timeout` overrides the read timeout for this call only.
+        """
+        if self._client is None:
+            await self.start()
+
+        call_timeout = self._call_timeout(timeout)
+        nodes = self.route(str(payload.get("sender", "")))
+        primary = nodes[0]
+        backup = nodes[1] if len(nodes) > 1 else None
+
+        if backup is None:
+            return await self._post(primary, payload, call_timeout)
+
+        first = asyncio.ensure_future(self._post(primary, payload, call_timeout))
+        try:
+            hedge_wait = self.hedge_after if self.hedge_after > 0 else None
+            done, _ = await asyncio.wait({first}, timeout=hedge_wait)
+            if done:
+                try:
+                    return first.result()
+                except httpx.TransportError:
+                    # primary unreachable: fail over to the next node on the ring
+                    return await self._post(backup, payload, call_timeout)
+
+            # primary is slow: hedge against the next node, first success wins
+            self.hedges_fired += 1
+            second = asyncio.ensure_future(self._post(backup, payload, call_timeout))
+            pending = {first, second}
+            last_exc: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is second:
+                            self.hedges_won += 1
+                        for other in pending:
+                            other.cancel()
+                        return task.result()
+                    last_exc = task.exception()
+            assert last_exc is not None
+            raise last_exc
+        finally:
+            if not first.done():
+                first.cancel()
+
+    async def stream(
+        self,
+        payload: Dict[str, Any],
+        timeout: Optional[float] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield bot messages one by one as Rasa dispatches them
+        (REST channel `?stream=true`, newline-delimited JSON).
+        Streams go to the sender's sticky node only; they are never hedged.
+        """
+        if self._client is None:
+            await self.start()
+        assert self._client is not None
+
+        upstream = self.route(str(payload.get("sender", "")))[0]
+        url = upstream.url + ("&" if "?" in upstream.url else "?") + "stream=true"
+        start = time.perf_counter()
+        try:
+            async with self._client.stream(
+                "POST", url, json=payload, timeout=self._call_timeout(timeout)
+            ) as resp:
+                resp.raise_for_status()
+                async for line in resp.aiter_lines():
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        message = json.loads(line)
+                    except ValueError:
+                        LOG.warning("Skipping malformed Rasa stream line: %r", line[:200])
+                        continue
+                    if isinstance(message, dict):
+                        yield message
+        except httpx.HTTPStatusError as e:
+            RASA_ERRORS.inc(upstream.url, f"http_{e.response.status_code}")
+            if e.response.status_code >= 500:
+                upstream.record_failure(self.eject_after, self.eject_seconds)
+            raise
+        except (httpx.TransportError, ValueError) as e:
+            RASA_ERRORS.inc(upstream.url, type(e).__name__)
+            upstream.record_failure(self.eject_after, self.eject_seconds)
+            raise
+        finally:
+            RASA_LATENCY.observe(time.perf_counter() - start, upstream.url)
+        upstream.record_success()
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        return {
+            "hedges_fired": self.hedges_fired,
+            "hedges_won": self.hedges_won,
+            "upstreams": [
+                {
+                    "url": u.url,
+                    "healthy": u.healthy(now),
+                    "requests": u.requests,
+                    "failures": u.failures,
+                    "ejections": u.ejections,
+                }
+                for u in self.upstreams
+            ],
+        }
+
+
+# =================================================
+# Singleton accessor
+# =================================================
+_rasa_client: Optional[RasaClient] = None
+
+
+def get_rasa_client() -> RasaClient:
+    global _rasa_client
+    if _rasa_client is None:
+        _rasa_client = RasaClient()
+    return _rasa_client
@@ -0,0 +1,87 @@
+# api/rasa_supervisor.py
+# Single supervised `rasa run` process owned by the launcher / gunicorn master.
+#
+# Workers never spawn Rasa themselves. The supervisor polls Rasa's /status
+# endpoint for readiness (instead of sleeping) and restarts the process with
+# exponential backoff if it dies (see intelligence/process_supervisor.py).
+
+import os
+import logging
+from typing import List, Optional
+
+import requests
+
+from intelligence.process_supervisor import ProcessSupervisor
+
+LOG = logging.getLogger(__name__)
+
+RASA_PORT = int(os.getenv("RASA_PORT", 5005))
+RASA_STATUS_URL = os.getenv("RASA_STATUS_URL", f"http://localhost:{RASA_PORT}/status")
+RASA_READY_TIMEOUT = float(os.getenv("RASA_READY_TIMEOUT", 120))
+RASA_POLL_INTERVAL = float(os.getenv("RASA_POLL_INTERVAL", 0.5))
+RASA_BACKOFF_INITIAL = float(os.getenv("RASA_BACKOFF_INITIAL", 1))
+RASA_BACKOFF_MAX = float(os.getenv("RASA_BACKOFF_MAX", 60))
+# A run that stayed up this long resets the backoff
+RASA_STABLE_AFTER = float(os.getenv("RASA_STABLE_AFTER", 60))
+
+
+def auto_start_enabled() -> bool:
+    return os.getenv("AUTO_START_RASA", "true").lower() in ("1", "true", "yes")
+
+
+def default_rasa_command() -> List[str]:
+    return [
+        "rasa",
+        "run",
+        "--enable-api",
+        "--cors",
+        "*",
+        "--port",
+        str(RASA_PORT),
+    ]
+
+
+class RasaSupervisor(ProcessSupervisor):
+    """
+    Keeps `rasa run` running; ready once /status answers 200.
+    """
+
+    name = "Rasa"
+
+    def __init__(
+        self,
+        command: Optional[List[str]] = None,
+        status_url: str = RASA_STATUS_URL,
+        ready_timeout: float = RASA_READY_TIMEOUT,
+        poll_interval: float = RASA_POLL_INTERVAL,
+        backoff_initial: float = RASA_BACKOFF_INITIAL,
+        backoff_max: float = RASA_BACKOFF_MAX,
+        cwd: Optional[str] = None,
+    ):
+        super().__init__(
+            command=command or default_rasa_command(),
+            ready_timeout=ready_timeout,
+            poll_interval=poll_interval,
+            backoff_initial=backoff_initial,
+            backoff_max=backoff_max,
+            stable_after=RASA_STABLE_AFTER,
+            cwd=cwd,
+        )
+        self.status_url = status_url
+
+    def _probe(self) -> bool:
+        try:
+            return requests.get(self.status_url, timeout=1).status_code == 200
+        except requests.RequestException:
+            return False
+
+
+def start_rasa_supervisor() -> Optional[RasaSupervisor]:
+    """
+    Start the supervisor if AUTO_START_RASA is enabled. Call this from the
+    launcher / gunicorn master only, never from worker processes.
+    """
+    if not auto_start_enabled():
+        LOG.info("⚠️ AUTO_START_RASA disabled")
+        return None
+    return RasaSupervisor().start()
@@ -1,6 +1,14 @@
+import os
+import time
+import hashlib
+import threading
+from collections import OrderedDict
 import jwt
 from datetime import datetime, timedelta
-from typing import Dict
+from typing import Any, Dict, Optional
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
 
 from config.settings import (
     PRIVATE_KEY_PATH,
@@ -10,15 +18,117 @@ from config.settings import (
     REFRESH_TOKEN_EXPIRE_DAYS,
 )
 
-# Load keys ONCE from validated config paths
-PRIVATE_KEY = PRIVATE_KEY_PATH.read_text()
-PUBLIC_KEY = PUBLIC_KEY_PATH.read_text()
-
 ISSUER = "trust-union-bank"
 AUDIENCE = "trust-union-clients"
 
+# Max verified tokens kept in memory per process (0 disables the cache)
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", 4096))
+
+_KEY_TYPES = {
+    "RS256": (rsa.RSAPrivateKey, rsa.RSAPublicKey),
+    "EdDSA": (ed25519.Ed25519PrivateKey, ed25519.Ed25519PublicKey),
+}
+
+
+def load_signing_keys(private_pem: bytes, public_pem: bytes, algorithm: str = JWT_ALGORITHM):
+    """
+    Parse PEM keys ONCE into cryptography key objects so PyJWT does not
+    re-parse them on every encode/decode. Fails fast if the key type does
+    not match the configured algorithm.
+    """
+    private_key = serialization.load_pem_private_key(private_pem, password=None)
+    public_key = serialization.load_pem_public_key(public_pem)
+
+    expected = _KEY_TYPES.get(algorithm)
+    if expected is None:
+        raise RuntimeError(f"Unsupported JWT algorithm: {algorithm}")
+    if not isinstance(private_key, expected[0]) or not isinstance(public_key, expected[1]):
+        raise RuntimeError(f"JWT keys do not match algorithm {algorithm}")
+
+    return private_key, public_key
+
+
+# Load keys ONCE from validated config paths
+PRIVATE_KEY, PUBLIC_KEY = load_signing_keys(
+    PRIVATE_KEY_PATH.read_bytes(),
+    PUBLIC_KEY_PATH.read_bytes(),
+)
+
+
+class VerifiedTokenCache:
+    """
+    Bounded LRU of already-verified token payloads.
+    Keyed by SHA-256 of the raw token; an entry is only valid until the token's `exp`.
+    Only successful verifications are cached.
+    """
+
+    def __init__(self, maxsize: int = TOKEN_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[bytes, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        if self.maxsize <= 0:
+            return None
+        key = self._key(token)
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            payload, exp = entry
+            if exp is not None and time.time() >= exp:
+                del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+        return dict(payload)
+
+    def put(self, token: str, payload: Dict[str, Any]) -> None:
+        if self.maxsize <= 0:
+            return
+        exp = payload.get("exp")
+        key = self._key(token)
+        with self._lock:
+            self._data[key] = (dict(payload), exp)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
 
 class TokenManager:
+    def __init__(
+        self,
+        private_key=PRIVATE_KEY,
+        public_key=PUBLIC_KEY,
+        algorithm: str = JWT_ALGORITHM,
+        cache_size: int = TOKEN_CACHE_SIZE,
+    ):
+        self.private_key = private_key
+        self.public_key = public_key
+        self.algorithm = algorithm
+        self.cache = VerifiedTokenCache(cache_size)
+
     def create_access_token(self, customer_id: int) -> str:
         now = datetime.utcnow()
         payload = {
@@ -29,7 +139,7 @@ class TokenManager:
             "aud": AUDIENCE,
             "type": "access",
         }
-        return jwt.encode(payload, PRIVATE_KEY, algorithm=JWT_ALGORITHM)
+        return jwt.encode(payload, self.private_key, algorithm=self.algorithm)
 
     def create_refresh_token(self, customer_id: int) -> str:
         now = datetime.utcnow()
@@ -41,14 +151,18 @@ class TokenManager:
             "aud": AUDIENCE,
             "type": "refresh",
         }
-        return jwt.encode(payload, PRIVATE_KEY, algorithm=JWT_ALGORITHM)
+        return jwt.encode(payload, self.private_key, algorithm=self.algorithm)
 
     def decode_token(self, token: str) -> Dict:
+        cached = self.cache.get(token)
+        if cached is not None:
+            return cached
+
         try:
-            return jwt.decode(
+            payload = jwt.decode(
                 token,
-                PUBLIC_KEY,
-                algorithms=[JWT_ALGORITHM],
+                self.public_key,
+                algorithms=[self.algorithm],
                 audience=AUDIENCE,
                 issuer=ISSUER,
             )
@@ -57,5 +171,8 @@ class TokenManager:
         except jwt.InvalidTokenError:
             raise ValueError("Invalid token")
 
+        self.cache.put(token, payload)
+        return payload
+
 
 token_manager = TokenManager()
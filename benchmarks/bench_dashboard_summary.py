@@ -0,0 +1,64 @@
+# benchmarks/bench_dashboard_summary.py
+# Load test: DB round trips and latency per dashboard view,
+# legacy (profile + accounts + balance) vs the single /api/user/summary query.
+#
+# Runs in-process against the configured database (.env) so round trips can be
+# read straight from the connection pool counters.
+#
+#   python -m benchmarks.bench_dashboard_summary --customer-id 1001 --views 500 --concurrency 10
+
+import argparse
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from database.core.connect import init_pool, pool_stats
+from database.user.user_db import get_user_by_customer_id, get_user_balance_from_db, get_user_summary
+from database.user.branch_db import get_user_accounts
+
+
+def legacy_view(customer_id: int) -> None:
+    get_user_by_customer_id(customer_id)
+    get_user_accounts(customer_id)
+    get_user_balance_from_db(customer_id)
+
+
+def summary_view(customer_id: int) -> None:
+    get_user_summary(customer_id)
+
+
+def _timed(fn, customer_id: int) -> float:
+    start = time.perf_counter()
+    fn(customer_id)
+    return time.perf_counter() - start
+
+
+def run(name: str, fn, customer_id: int, views: int, concurrency: int) -> None:
+    before = pool_stats().get("acquired", 0)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as ex:
+        latencies = sorted(ex.map(lambda _: _timed(fn, customer_id), range(views)))
+    elapsed = time.perf_counter() - start
+    round_trips = pool_stats().get("acquired", 0) - before
+
+    p50 = statistics.median(latencies) * 1000
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+    print(
+        f"{name:<8} views/s={views / elapsed:8.1f}  "
+        f"round_trips/view={round_trips / views:4.1f}  "
+        f"p50={p50:6.1f}ms  p99={p99:6.1f}ms"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Dashboard summary load test")
+    parser.add_argument("--customer-id", type=int, required=True)
+    parser.add_argument("--views", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=10)
+    args = parser.parse_args()
+
+    init_pool()
+    # warm the pool so connection setup is not billed to either variant
+    run("warmup", summary_view, args.customer_id, args.concurrency, args.concurrency)
+    run("legacy", legacy_view, args.customer_id, args.views, args.concurrency)
+    run("summary", summary_view, args.customer_id, args.views, args.concurrency)
@@ -0,0 +1,121 @@
+# benchmarks/bench_fuzzy_fix.py
+# fuzzy_fix: deletion index vs the original difflib scan.
+#
+# 1. Golden check: every token of a golden set must get the same correction
+#    from both. The set is nlu.yml tokens, the typo / abbreviation keys,
+#    synthetic typos of every vocabulary word (deletions, transpositions,
+#    substitutions, doubled letters, vowels dropped) and random strings.
+#    When several vowel-fill guesses match different words, the original's
+#    answer depends on set iteration order (PYTHONHASHSEED); any of those
+#    answers is accepted.
+# 2. Throughput in tokens/sec on chat-like tokens and on vowelless tokens
+#    (the vowel-fill worst case).
+#
+#   python -m benchmarks.bench_fuzzy_fix
+#   python -m benchmarks.bench_fuzzy_fix --random 20000 --show 20
+
+import argparse
+import random
+import string
+import sys
+import time
+from difflib import get_close_matches
+from typing import Callable, List, Set
+
+from benchmarks.nlu_corpus import load_nlu_examples
+from intelligence.text.text_corrector import (
+    BANK_ABBREVIATIONS,
+    COMMON_TYPOS,
+    DOMAIN_VOCAB,
+    _INDEX,
+    attempt_vowel_fill,
+    clean_text_basic,
+    fuzzy_fix,
+    fuzzy_fix_difflib,
+)
+
+VOWELS = "aeiou"
+
+
+def _typos(word: str) -> Set[str]:
+    out = {word.translate(str.maketrans("", "", VOWELS))}
+    for i in range(len(word)):
+        out.add(word[:i] + word[i + 1:])
+        out.add(word[:i] + word[i] + word[i:])
+        if i + 1 < len(word):
+            out.add(word[:i] + word[i + 1] + word[i] + word[i + 2:])
+        for ch in string.ascii_lowercase:
+            out.add(word[:i] + ch + word[i + 1:])
+    return out
+
+
+def golden_set(random_tokens: int, seed: int) -> List[str]:
+    tokens: Set[str] = set()
+    for text in load_nlu_examples():
+        tokens.update(clean_text_basic(text).split())
+    tokens.update(COMMON_TYPOS, BANK_ABBREVIATIONS, DOMAIN_VOCAB)
+    for word in DOMAIN_VOCAB:
+        tokens.update(_typos(word))
+    rng = random.Random(seed)
+    letters = string.ascii_lowercase + "bcdfghklmnprstvwxyz" * 2   # skew towards consonants
+    for _ in range(random_tokens):
+        tokens.add("".join(rng.choice(letters) for _ in range(rng.randint(1, 16))))
+    tokens.discard("")
+    return sorted(tokens)
+
+
+def reference_outputs(token: str) -> Set[str]:
+    """
+    Every answer the original fuzzy_fix can give, whatever the set order.
+    Only its vowel-fill step is order dependent.
+    """
+    if token in COMMON_TYPOS or token in BANK_ABBREVIATIONS:
+        return {fuzzy_fix_difflib(token)}
+    for low, high, cutoff in ((5, None, 0.78), (3, 4, 0.60)):
+        if len(token) >= low and (high is None or len(token) <= high):
+            close = get_close_matches(token, DOMAIN_VOCAB, n=1, cutoff=cutoff)
+            if close:
+                return {close[0]}
+    guesses = attempt_vowel_fill(token)
+    answers = {m[0] for m in (get_close_matches(g, DOMAIN_VOCAB, n=1, cutoff=0.70) for g in guesses) if m}
+    return answers or {token}
+
+
+def throughput(fn: Callable[[str], str], tokens: List[str], seconds: float) -> float:
+    n = 0
+    start = time.perf_counter()
+    deadline = start + seconds
+    while time.perf_counter() < deadline:
+        for t in tokens:
+            fn(t)
+        n += len(tokens)
+    return n / (time.perf_counter() - start)
+
+
+def main(random_tokens: int, seed: int, seconds: float, show: int) -> int:
+    start = time.perf_counter()
+    golden = golden_set(random_tokens, seed)
+    mismatches = [(t, fuzzy_fix(t), sorted(reference_outputs(t))) for t in golden]
+    mismatches = [m for m in mismatches if m[1] not in m[2]]
+    print(f"golden set:  {len(golden)} tokens, {len(mismatches)} mismatches ({time.perf_counter() - start:.1f}s)")
+    for token, got, expected in mismatches[:show]:
+        print(f"  {token!r}: index={got!r} difflib={expected}")
+
+    print(f"index:       {_INDEX.stats()['keys']} subsequence keys over {len(DOMAIN_VOCAB)} words")
+    chat = [t for text in load_nlu_examples() for t in clean_text_basic(text).split()]
+    vowelless = [t for t in golden if t.isalpha() and not any(v in t for v in VOWELS) and len(t) >= 4][:500]
+    for label, tokens in (("chat tokens", chat), ("vowelless", vowelless)):
+        old = throughput(fuzzy_fix_difflib, tokens, seconds)
+        new = throughput(fuzzy_fix, tokens, seconds)
+        print(f"{label:<12} difflib {old:10.0f} tok/s   index {new:10.0f} tok/s   x{new / old:.1f}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="fuzzy_fix deletion index vs difflib: golden check + tokens/sec")
+    parser.add_argument("--random", type=int, default=5000, help="random tokens added to the golden set")
+    parser.add_argument("--seed", type=int, default=11)
+    parser.add_argument("--seconds", type=float, default=2.0, help="per throughput measurement")
+    parser.add_argument("--show", type=int, default=10, help="print this many mismatches")
+    args = parser.parse_args()
+    sys.exit(main(args.random, args.seed, args.seconds, args.show))
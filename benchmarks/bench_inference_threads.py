@@ -0,0 +1,118 @@
+# benchmarks/bench_inference_threads.py
+# Inference latency for a matrix of worker processes x intra-op threads.
+#
+# Each worker is a separately spawned process (like a gunicorn worker) that
+# scores single messages back to back; all workers start together. threads=0
+# is the library default (every worker sizes its pool to the whole machine,
+# the oversubscribed baseline); other values go through ResourceGovernor,
+# "auto" is the governor's own choice (usable CPUs // workers).
+#
+#   python -m benchmarks.bench_inference_threads --workers 1 2 4 --threads 0 1 2 auto
+#   python -m benchmarks.bench_inference_threads --workload synthetic --pin
+#
+# --workload model needs the sentiment checkpoint (--backend torch|onnx);
+# synthetic runs a BERT-layer-sized numpy matmul chain instead.
+
+import argparse
+import multiprocessing as mp
+import statistics
+import time
+from typing import List, Optional
+
+from benchmarks.nlu_corpus import load_nlu_examples
+from intelligence.resource_governor import ResourceGovernor, available_cpus
+
+
+def _synthetic_model():
+    import numpy as np
+
+    rng = np.random.default_rng(0)
+    weights = [rng.standard_normal((768, 768), dtype=np.float32) for _ in range(6)]
+
+    def predict(texts: List[str]):
+        x = np.ones((len(texts) * 32, 768), dtype=np.float32)
+        for w in weights:
+            x = np.tanh(x @ w * 0.03)
+        return [(0, float(x[0, 0]))]
+
+    return predict
+
+
+def _worker(index: int, workers: int, threads: Optional[int], pin: bool, workload: str, backend: str,
+            messages: int, ready, go, results) -> None:
+    if threads is not None:
+        ResourceGovernor(workers=workers, threads=threads, pin_cpus=pin).apply(index)
+
+    if workload == "model":
+        from intelligence.Sentiment_Analysis.Detect_Sentiment import DEFAULT_MODEL_PATH, load_backend
+
+        kwargs = {"device": "cpu"} if backend == "torch" else {}
+        predict = load_backend(backend, DEFAULT_MODEL_PATH, **kwargs).predict
+    else:
+        predict = _synthetic_model()
+
+    corpus = load_nlu_examples()
+    texts = [corpus[(index * 7919 + i) % len(corpus)] for i in range(messages)]
+    for text in texts[:5]:
+        predict([text])
+    ready.put(index)
+    go.wait()
+
+    latencies = []
+    for text in texts:
+        start = time.perf_counter()
+        predict([text])
+        latencies.append(time.perf_counter() - start)
+    results.put(latencies)
+
+
+def run(workers: int, threads: Optional[int], pin: bool, workload: str, backend: str, messages: int) -> None:
+    ctx = mp.get_context("spawn")
+    ready, results, go = ctx.Queue(), ctx.Queue(), ctx.Event()
+    procs = [
+        ctx.Process(target=_worker, args=(i, workers, threads, pin, workload, backend, messages, ready, go, results))
+        for i in range(workers)
+    ]
+    for p in procs:
+        p.start()
+    for _ in procs:
+        ready.get()
+    start = time.perf_counter()
+    go.set()
+    latencies = sorted(lat for _ in procs for lat in results.get())
+    wall = time.perf_counter() - start
+    for p in procs:
+        p.join()
+
+    label = "default" if threads is None else ("auto" if threads == 0 else str(threads))
+    p99 = latencies[max(0, int(len(latencies) * 0.99) - 1)]
+    print(
+        f"workers={workers:<3} threads={label:<8} p50 {statistics.median(latencies) * 1e3:7.2f} ms"
+        f"  p99 {p99 * 1e3:7.2f} ms  {len(latencies) / wall:8.1f} msg/s"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Workers x inference threads latency matrix")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--threads", nargs="+", default=["0", "1", "2", "auto"],
+                        help="intra-op threads per worker; 0 = library default, auto = governor")
+    parser.add_argument("--messages", type=int, default=200, help="messages per worker")
+    parser.add_argument("--workload", choices=("model", "synthetic"), default=None,
+                        help="default: model if the checkpoint exists, else synthetic")
+    parser.add_argument("--backend", choices=("torch", "onnx"), default="torch")
+    parser.add_argument("--pin", action="store_true", help="pin each worker to its own CPUs")
+    args = parser.parse_args()
+
+    workload = args.workload
+    if workload is None:
+        from intelligence.Sentiment_Analysis.Detect_Sentiment import DEFAULT_MODEL_PATH
+
+        workload = "model" if DEFAULT_MODEL_PATH.exists() else "synthetic"
+    print(f"usable cpus {len(available_cpus())}, workload {workload}{' (' + args.backend + ')' if workload == 'model' else ''}")
+
+    for workers in args.workers:
+        for value in args.threads:
+            # None = leave the libraries alone; 0 = governor picks
+            threads = None if value == "0" else (0 if value == "auto" else int(value))
+            run(workers, threads, args.pin, workload, args.backend, args.messages)
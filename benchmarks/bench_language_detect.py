@@ -0,0 +1,158 @@
+# benchmarks/bench_language_detect.py
+# voice_i18n.detect_language: script-histogram tier vs the original
+# langdetect-first detector.
+#
+# Labelled set: every rasa/data/nlu.yml example (en; the NLU data is English
+# only), hand-written Hindi and Bengali banking queries including code-mixed
+# ones ("UPI limit कितनी है?"), and inputs with no letters at all.
+# Reported: accuracy per language, whether repeated calls agree, and
+# messages/sec. The baseline needs langdetect installed.
+#
+#   python -m benchmarks.bench_language_detect
+#   python -m benchmarks.bench_language_detect --show 10
+
+import argparse
+import importlib.util
+import re
+import sys
+import time
+from collections import Counter
+from typing import Callable, List, Tuple
+
+from benchmarks.nlu_corpus import load_nlu_examples
+from intelligence.voice.language_detect import detect_script_language
+
+SUPPORTED_LANGS = {"en", "hi", "bn"}
+DEFAULT_LANG = "en"
+
+HINDI = [
+    "मेरा खाता बैलेंस कितना है?",
+    "मुझे अपना डेबिट कार्ड ब्लॉक करना है",
+    "मेरा एटीएम कार्ड खो गया है",
+    "मिनी स्टेटमेंट कैसे मिलेगा?",
+    "नया बचत खाता कैसे खोलें?",
+    "मेरी ईएमआई की तारीख क्या है?",
+    "मैं लोन के लिए आवेदन करना चाहता हूँ",
+    "यूपीआई से पैसे नहीं गए, क्या करूँ?",
+    "नेट बैंकिंग का पासवर्ड भूल गया हूँ",
+    "फिक्स्ड डिपॉजिट पर ब्याज दर क्या है?",
+    "मेरे खाते से गलत ट्रांसफर हो गया",
+    "क्रेडिट कार्ड के लिए आवेदन कैसे करें?",
+    "नमस्ते",
+    "धन्यवाद",
+    "हाँ",
+    "नहीं",
+    "मेरा पिन बदलना है",
+    "ग्राहक सेवा का नंबर क्या है?",
+    "दैनिक निकासी सीमा क्या है?",
+    "खाता बंद करना है।",
+    "मेरा ATM card block करो",
+    "UPI limit कितनी है?",
+    "मुझे OTP नहीं मिला",
+    "पिछले महीने का statement चाहिए",
+    "मेरे account में ₹500 जमा करें",
+]
+
+BENGALI = [
+    "আমার অ্যাকাউন্টের ব্যালেন্স কত?",
+    "আমার ডেবিট কার্ড ব্লক করতে চাই",
+    "আমার এটিএম কার্ড হারিয়ে গেছে",
+    "মিনি স্টেটমেন্ট কীভাবে পাব?",
+    "নতুন সেভিংস অ্যাকাউন্ট কীভাবে খুলব?",
+    "আমার ইএমআই কবে দিতে হবে?",
+    "আমি ঋণের জন্য আবেদন করতে চাই",
+    "ইউপিআই লেনদেন ব্যর্থ হয়েছে",
+    "নেট ব্যাংকিং পাসওয়ার্ড ভুলে গেছি",
+    "ফিক্সড ডিপোজিটের সুদের হার কত?",
+    "ভুল অ্যাকাউন্টে টাকা পাঠিয়েছি",
+    "ক্রেডিট কার্ডের জন্য কীভাবে আবেদন করব?",
+    "নমস্কার",
+    "ধন্যবাদ",
+    "হ্যাঁ",
+    "না",
+    "আমার পিন পরিবর্তন করতে চাই",
+    "গ্রাহক পরিষেবার নম্বর কী?",
+    "দৈনিক উত্তোলনের সীমা কত?",
+    "অ্যাকাউন্ট বন্ধ করতে চাই।",
+    "আমার ATM card block করুন",
+    "UPI limit কত?",
+    "আমি OTP পাইনি",
+    "গত মাসের statement দরকার",
+    "আমার অ্যাকাউন্টে ₹৫০০ জমা দিন",
+]
+
+NO_LETTERS = ["", "   ", "12345", "₹500", "👍", "?!", "🙏🙏", "1234 5678 9012"]
+
+
+def labelled_set() -> List[Tuple[str, str]]:
+    return (
+        [(t, "en") for t in load_nlu_examples()]
+        + [(t, "hi") for t in HINDI]
+        + [(t, "bn") for t in BENGALI]
+        + [(t, DEFAULT_LANG) for t in NO_LETTERS]
+    )
+
+
+def script_tier(text: str) -> str:
+    return detect_script_language(text, SUPPORTED_LANGS, DEFAULT_LANG)
+
+
+def langdetect_first(text: str) -> str:
+    """
+    The detector as it was before the script tier (langdetect, unseeded).
+    """
+    from langdetect import detect
+
+    if not text or not text.strip():
+        return DEFAULT_LANG
+    try:
+        return detect(text)
+    except Exception:
+        pass
+    if re.search(r"[ऀ-ॿ]", text):
+        return "hi"
+    if re.search(r"[ঀ-৿]", text):
+        return "bn"
+    return DEFAULT_LANG
+
+
+def evaluate(label: str, fn: Callable[[str], str], data: List[Tuple[str, str]], seconds: float, show: int) -> int:
+    first = [fn(text) for text, _ in data]
+    second = [fn(text) for text, _ in data]
+    unstable = sum(a != b for a, b in zip(first, second))
+    per_lang = Counter(expected for _, expected in data)
+    correct = Counter(expected for (_, expected), got in zip(data, first) if got == expected)
+    accuracy = "  ".join(f"{lang} {correct[lang]}/{per_lang[lang]}" for lang in sorted(per_lang))
+
+    n = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        for text, _ in data:
+            fn(text)
+        n += len(data)
+    rate = n / (time.perf_counter() - start)
+
+    wrong = [(text, expected, got) for (text, expected), got in zip(data, first) if got != expected]
+    print(f"{label:<18} {accuracy}   wrong {len(wrong)}   unstable {unstable}   {rate:10.0f} msg/s")
+    for text, expected, got in wrong[:show]:
+        print(f"    {text!r}: expected {expected}, got {got}")
+    return len(wrong)
+
+
+def main(seconds: float, show: int) -> int:
+    data = labelled_set()
+    print(f"{len(data)} labelled messages")
+    wrong = evaluate("script tier", script_tier, data, seconds, show)
+    if importlib.util.find_spec("langdetect") is None:
+        print("langdetect-first   skipped (langdetect not installed)")
+    else:
+        evaluate("langdetect-first", langdetect_first, data, seconds, show)
+    return 1 if wrong else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Language detection: script histogram tier vs langdetect-first")
+    parser.add_argument("--seconds", type=float, default=2.0, help="per throughput measurement")
+    parser.add_argument("--show", type=int, default=5, help="print this many misclassified messages")
+    args = parser.parse_args()
+    sys.exit(main(args.seconds, args.show))
@@ -0,0 +1,93 @@
+# benchmarks/bench_llm_client.py
+# intelligence/llm_client.py against benchmarks/stub_llm.py:
+#
+#   1. concurrency   N distinct texts: sequential sync calls vs one asyncio.gather
+#                    over the pooled client
+#   2. cache         the same texts again: served from the persistent cache,
+#                    no upstream call
+#   3. deadline      upstream slower than the deadline: the call gives up on time
+#   4. outage        upstream returns 503: after LLM_BREAKER_FAILURES calls the
+#                    breaker opens and the rest fail fast without a request;
+#                    once the upstream recovers a probe closes it again
+#   5. rate limit    one 429 opens the breaker for Retry-After
+#
+#   python -m benchmarks.bench_llm_client --texts 50 --latency-ms 200
+
+import os
+import tempfile
+
+_CACHE_DIR = tempfile.mkdtemp(prefix="llm_bench_")
+os.environ["LLM_CACHE_PATH"] = os.path.join(_CACHE_DIR, "llm.db")
+
+import argparse
+import asyncio
+import time
+from typing import List
+
+from benchmarks.stub_llm import start_stub_llm
+from intelligence.llm_client import CircuitBreaker, LLMClient, complete_sync
+import intelligence.llm_client as llm_client
+
+
+def _timed(label: str, fn) -> float:
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<42} {elapsed * 1000:9.1f} ms")
+    return elapsed
+
+
+def main(texts: int, latency_ms: float, deadline: float, cooldown: float) -> None:
+    server, url = start_stub_llm(latency_ms=latency_ms)
+    client = LLMClient(url=url, api_key="stub", style="openai", deadline=deadline,
+                       cache_path=os.environ["LLM_CACHE_PATH"],
+                       breaker=CircuitBreaker(failures=3, cooldown=cooldown))
+    llm_client._llm_client = client
+    system = "translate to hi"
+    batch: List[str] = [f"my card number {i} is blocked" for i in range(texts)]
+    more: List[str] = [f"show balance of account {i}" for i in range(texts)]
+
+    async def gather(items: List[str]):
+        return await asyncio.gather(*(client.complete("translation", t, system, "hi") for t in items))
+
+    print(f"stub latency {latency_ms:.0f}ms, {texts} texts, deadline {deadline}s")
+    _timed(f"1. {texts} sequential sync calls", lambda: [complete_sync("translation", t, system, "hi") for t in batch])
+    _timed(f"   {texts} concurrent calls (gather)", lambda: asyncio.run(gather(more)))
+    sent = server.requests
+    _timed(f"2. {2 * texts} repeated calls (cache)", lambda: [complete_sync("translation", t, system, "hi") for t in batch + more])
+    print(f"   upstream requests during repeat: {server.requests - sent}   {client.stats()}")
+
+    server.latency_s = 1.5
+    start = time.perf_counter()
+    out = complete_sync("translation", "slow upstream", system, "hi", deadline=0.5)
+    print(f"3. 1.5s upstream, 0.5s deadline -> {out!r} after {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    server.latency_s = latency_ms / 1000.0
+    server.status = 503
+    sent = server.requests
+    elapsed = _timed("4. 20 calls during outage", lambda: [complete_sync("correction", f"outage {i}") for i in range(20)])
+    print(f"   upstream requests: {server.requests - sent}, breaker {client.breaker.state}, "
+          f"mean {elapsed / 20 * 1000:.1f} ms/call")
+    server.status = 200
+    time.sleep(cooldown)
+    out = complete_sync("correction", "after recovery")
+    print(f"   after cool-down: {out!r}, breaker {client.breaker.state}")
+
+    server.status, server.retry_after = 429, 2
+    complete_sync("correction", "rate limited")
+    server.status = 200
+    sent = server.requests
+    out = complete_sync("correction", "right after 429")
+    print(f"5. after 429: {out!r}, breaker {client.breaker.state}, upstream requests {server.requests - sent}")
+    print(f"final {client.stats()}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="LLM client: pooling, cache, deadline and circuit breaker vs a stub")
+    parser.add_argument("--texts", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=200)
+    parser.add_argument("--deadline", type=float, default=4.0)
+    parser.add_argument("--cooldown", type=float, default=2.0)
+    args = parser.parse_args()
+    main(args.texts, args.latency_ms, args.deadline, args.cooldown)
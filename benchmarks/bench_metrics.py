@@ -0,0 +1,73 @@
+# benchmarks/bench_metrics.py
+# Overhead of the metrics surface: histogram observe, stage() and the ASGI
+# middleware around a trivial app, plus the cost of rendering /metrics.
+#
+#   python -m benchmarks.bench_metrics --n 200000
+
+import argparse
+import asyncio
+import time
+
+from api.metrics import REGISTRY, MetricsMiddleware, render_metrics, stage
+
+
+class _Route:
+    path = "/api/bench"
+
+
+async def _app(scope, receive, send):
+    scope["route"] = _Route()
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+async def _receive():
+    return {"type": "http.request", "body": b""}
+
+
+async def _send(message):
+    pass
+
+
+def _per_call(label: str, elapsed: float, n: int) -> None:
+    print(f"{label:<28} {elapsed / n * 1e9:10.0f} ns/op")
+
+
+async def _asgi_loop(app, n: int) -> float:
+    scope = {"type": "http", "method": "GET", "path": "/api/bench"}
+    start = time.perf_counter()
+    for _ in range(n):
+        await app(dict(scope), _receive, _send)
+    return time.perf_counter() - start
+
+
+def main(n: int) -> None:
+    hist = REGISTRY.histogram("bench_hist_seconds", "bench", ("route",))
+
+    start = time.perf_counter()
+    for i in range(n):
+        hist.observe(0.003, "/api/bench")
+    _per_call("histogram.observe", time.perf_counter() - start, n)
+
+    start = time.perf_counter()
+    for _ in range(n):
+        with stage("bench"):
+            pass
+    _per_call("stage()", time.perf_counter() - start, n)
+
+    bare = asyncio.run(_asgi_loop(_app, n))
+    wrapped = asyncio.run(_asgi_loop(MetricsMiddleware(_app), n))
+    _per_call("asgi app (bare)", bare, n)
+    _per_call("asgi app + middleware", wrapped, n)
+    _per_call("middleware overhead", wrapped - bare, n)
+
+    start = time.perf_counter()
+    body = render_metrics()
+    print(f"{'render /metrics':<28} {(time.perf_counter() - start) * 1e3:10.2f} ms ({len(body)} bytes)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Metrics overhead benchmark")
+    parser.add_argument("--n", type=int, default=200000)
+    args = parser.parse_args()
+    main(args.n)
@@ -0,0 +1,66 @@
+# benchmarks/bench_rasa_client.py
+# Chat throughput per worker: blocking requests.post vs pooled async RasaClient.
+#
+# Both variants run on ONE event loop, which is what a single uvicorn worker
+# gives us. The blocking variant reproduces the old chat_endpoint behaviour.
+#
+#   python -m benchmarks.bench_rasa_client --requests 400 --concurrency 50 --latency-ms 50
+
+import argparse
+import asyncio
+import time
+
+import requests
+
+from api.rasa_client import RasaClient
+from benchmarks.stub_rasa import start_stub_rasa
+
+
+def _payload(i: int) -> dict:
+    return {"sender": f"user_{i % 100}", "message": "what is my balance", "metadata": {}}
+
+
+async def _run(handler, total: int, concurrency: int) -> float:
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one(i: int):
+        async with sem:
+            await handler(i)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(total)))
+    return time.perf_counter() - start
+
+
+async def main(total: int, concurrency: int, latency_ms: float) -> None:
+    server, url = start_stub_rasa(latency_ms=latency_ms)
+
+    async def blocking_handler(i: int):
+        resp = requests.post(url, json=_payload(i), timeout=10)
+        resp.raise_for_status()
+        resp.json()
+
+    client = RasaClient(url=url, pool_size=concurrency)
+    await client.start()
+
+    async def pooled_handler(i: int):
+        await client.send(_payload(i))
+
+    try:
+        print(f"stub latency={latency_ms}ms requests={total} concurrency={concurrency}")
+        for name, handler in (("before: blocking requests.post", blocking_handler),
+                              ("after:  pooled RasaClient", pooled_handler)):
+            elapsed = await _run(handler, total, concurrency)
+            print(f"{name:<32} {total / elapsed:8.1f} req/s  ({elapsed:.2f}s)")
+    finally:
+        await client.close()
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rasa client throughput benchmark")
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency, args.latency_ms))
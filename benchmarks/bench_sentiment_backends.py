@@ -0,0 +1,67 @@
+# benchmarks/bench_sentiment_backends.py
+# CPU latency/throughput of the sentiment backends: torch eager vs ONNX
+# Runtime (int8 export by default; pass --onnx for another graph).
+#
+#   python -m intelligence.Sentiment_Analysis.export_onnx export
+#   python -m benchmarks.bench_sentiment_backends --messages 500 --batch-sizes 1 8 32
+
+import os
+
+os.environ["CUDA_VISIBLE_DEVICES"] = ""
+
+import argparse
+import statistics
+import time
+from pathlib import Path
+from typing import List, Optional
+
+from benchmarks.nlu_corpus import load_nlu_examples
+from intelligence.Sentiment_Analysis.Detect_Sentiment import DEFAULT_MODEL_PATH, default_onnx_path, load_backend
+
+
+def _size_mb(path: Path) -> float:
+    if path.is_file():
+        return path.stat().st_size / 1e6
+    weights = list(path.glob("*.safetensors")) or list(path.glob("*.bin"))
+    return sum(p.stat().st_size for p in weights) / 1e6
+
+
+def bench(name: str, texts: List[str], batch_sizes: List[int], onnx_path: Optional[Path]) -> None:
+    kwargs = {"device": "cpu"} if name == "torch" else {"onnx_path": onnx_path or default_onnx_path(DEFAULT_MODEL_PATH)}
+    start = time.perf_counter()
+    backend = load_backend(name, DEFAULT_MODEL_PATH, **kwargs)
+    load_s = time.perf_counter() - start
+    size = _size_mb(DEFAULT_MODEL_PATH if name == "torch" else kwargs["onnx_path"])
+    backend.predict(texts[:8])  # warm-up
+
+    latencies = []
+    for text in texts:
+        t = time.perf_counter()
+        backend.predict([text])
+        latencies.append(time.perf_counter() - t)
+    latencies.sort()
+    print(
+        f"{name:<6} load {load_s:5.1f}s  weights {size:6.1f} MB  "
+        f"batch=1 p50 {statistics.median(latencies) * 1e3:6.2f} ms  p99 {latencies[int(len(latencies) * 0.99) - 1] * 1e3:6.2f} ms"
+    )
+
+    for size_ in batch_sizes:
+        t = time.perf_counter()
+        for i in range(0, len(texts), size_):
+            backend.predict(texts[i:i + size_])
+        elapsed = time.perf_counter() - t
+        print(f"{name:<6} batch={size_:<3} {len(texts) / elapsed:8.1f} msg/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sentiment backend benchmark (CPU)")
+    parser.add_argument("--messages", type=int, default=500)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--backends", nargs="+", choices=("torch", "onnx"), default=["torch", "onnx"])
+    parser.add_argument("--onnx", type=Path, default=None)
+    args = parser.parse_args()
+
+    corpus = load_nlu_examples()
+    texts = [corpus[i % len(corpus)] for i in range(args.messages)]
+    for name in args.backends:
+        bench(name, texts, args.batch_sizes, args.onnx)
@@ -0,0 +1,77 @@
+# benchmarks/bench_sentiment_batching.py
+# CPU sentiment throughput: one forward pass per message (old request path)
+# vs micro-batched analyze_async(), at several concurrency levels.
+#
+# Needs the DistilBERT checkpoint under intelligence/Sentiment_Analysis/model/
+# (and its ONNX export for --backend onnx); runs on CPU regardless of CUDA.
+#
+#   python -m benchmarks.bench_sentiment_batching --messages 512 --concurrency 1 8 64 --wait-ms 0 2 5
+
+import os
+
+os.environ["CUDA_VISIBLE_DEVICES"] = ""
+
+import argparse
+import asyncio
+import time
+from typing import List
+
+from benchmarks.nlu_corpus import load_nlu_examples
+from intelligence.Sentiment_Analysis.Detect_Sentiment import SentimentAnalyzer
+from intelligence.Sentiment_Analysis.batching import SentimentBatcher
+
+
+async def _drive(handler, texts: List[str], concurrency: int) -> float:
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one(text: str):
+        async with sem:
+            await handler(text)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(t) for t in texts))
+    return time.perf_counter() - start
+
+
+async def run(analyzer: SentimentAnalyzer, texts: List[str], concurrency: int, max_batch: int, waits: List[float]) -> None:
+    async def unbatched(text: str):
+        # what chat_endpoint used to do: a blocking batch-of-1 pass on the loop
+        analyzer.analyze(text)
+
+    elapsed = await _drive(unbatched, texts, concurrency)
+    print(f"c={concurrency:<3} unbatched                 {len(texts) / elapsed:8.1f} msg/s")
+
+    for wait_ms in waits:
+        batcher = SentimentBatcher(analyzer._analyze_batch, max_batch=max_batch, max_wait_ms=wait_ms)
+        elapsed = await _drive(batcher.submit, texts, concurrency)
+        stats = batcher.stats()
+        await batcher.close()
+        print(
+            f"c={concurrency:<3} batched wait={wait_ms:<4g}ms     {len(texts) / elapsed:8.1f} msg/s"
+            f"  avg batch {stats['avg_batch']:5.1f}"
+        )
+
+
+def main(messages: int, levels: List[int], max_batch: int, waits: List[float], backend: str) -> None:
+    analyzer = SentimentAnalyzer(backend=backend)
+    if analyzer.engine is None:
+        raise SystemExit("Sentiment model not found; this benchmark needs the DistilBERT checkpoint")
+
+    corpus = load_nlu_examples()
+    texts = [corpus[i % len(corpus)] for i in range(messages)]
+    analyzer.analyze(texts[0])  # warm-up
+
+    print(f"{messages} messages, backend={backend}, max batch={max_batch}")
+    for concurrency in levels:
+        asyncio.run(run(analyzer, texts, concurrency, max_batch, waits))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sentiment micro-batching benchmark")
+    parser.add_argument("--messages", type=int, default=512)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 64])
+    parser.add_argument("--max-batch", type=int, default=32)
+    parser.add_argument("--wait-ms", type=float, nargs="+", default=[0, 2, 5])
+    parser.add_argument("--backend", choices=("torch", "onnx"), default="torch")
+    args = parser.parse_args()
+    main(args.messages, args.concurrency, args.max_batch, args.wait_ms, args.backend)
@@ -0,0 +1,103 @@
+# benchmarks/bench_sentiment_cache.py
+# Hit rate of the sentiment result cache when replaying support-like traffic.
+#
+# Messages are drawn from the rasa/data/nlu.yml examples with a Zipf
+# distribution (a few greetings / "balance" / "block my card" dominate, a long
+# tail is rare). Each cache size is replayed on the same stream; only messages
+# the lexicon tier does not answer reach the cache, as in the API. With the
+# checkpoint present the stream is also scored through SentimentAnalyzer with
+# and without the cache to show the end-to-end saving.
+#
+#   python -m benchmarks.bench_sentiment_cache --messages 20000 --sizes 64 256 1024 4096
+#   python -m benchmarks.bench_sentiment_cache --zipf 1.0 --shared /dev/shm/tub-bench.db
+
+import os
+
+os.environ["CUDA_VISIBLE_DEVICES"] = ""
+
+import argparse
+import asyncio
+import random
+import time
+from typing import List, Optional
+
+from benchmarks.nlu_corpus import load_nlu_examples
+from intelligence.Sentiment_Analysis.cache import SentimentCache, normalize_text
+from intelligence.Sentiment_Analysis.Detect_Sentiment import Lexicon, SentimentAnalyzer
+
+_DUMMY = {"label": "neutral", "score": 0.5, "is_negative": False, "is_frustrated": False}
+
+
+def replay_stream(corpus: List[str], messages: int, zipf: float, seed: int) -> List[str]:
+    rng = random.Random(seed)
+    ranked = corpus[:]
+    rng.shuffle(ranked)
+    weights = [1.0 / (rank ** zipf) for rank in range(1, len(ranked) + 1)]
+    return rng.choices(ranked, weights=weights, k=messages)
+
+
+def replay(stream: List[str], size: int, ttl: float, shared: Optional[str]) -> None:
+    cache = SentimentCache(maxsize=size, ttl=ttl, shared_path=shared)
+    if cache.shared is not None:
+        cache.clear()
+    start = time.perf_counter()
+    for text in stream:
+        key = cache.key(text)
+        if key is not None and cache.get(key) is None:
+            cache.put(key, _DUMMY)
+    us = (time.perf_counter() - start) / len(stream) * 1e6
+    st = cache.stats()
+    print(
+        f"size={size:<6} hit rate {st['cache_hit_ratio']:6.1%}  "
+        f"evictions {st['cache_evictions']:<6} {us:5.1f} us/lookup"
+    )
+
+
+async def _score(analyzer: SentimentAnalyzer, stream: List[str], concurrency: int) -> float:
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one(text: str):
+        async with sem:
+            await analyzer.analyze_async(text)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(t) for t in stream))
+    elapsed = time.perf_counter() - start
+    await analyzer.aclose()
+    return elapsed
+
+
+def end_to_end(stream: List[str], size: int, concurrency: int) -> None:
+    for label, maxsize in (("no cache", 0), (f"cache={size}", size)):
+        analyzer = SentimentAnalyzer(cache=SentimentCache(maxsize=maxsize, shared_path=None))
+        elapsed = asyncio.run(_score(analyzer, stream, concurrency))
+        st = analyzer.stats()
+        print(f"{label:<11} {len(stream) / elapsed:8.1f} msg/s  model calls {st.get('items', 0)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sentiment result cache replay")
+    parser.add_argument("--messages", type=int, default=20000)
+    parser.add_argument("--zipf", type=float, default=1.1, help="Zipf exponent of message popularity")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[64, 256, 1024, 4096])
+    parser.add_argument("--ttl", type=float, default=3600)
+    parser.add_argument("--shared", default=None, help="also write through a shared SQLite cache at this path")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    corpus = load_nlu_examples()
+    stream = replay_stream(corpus, args.messages, args.zipf, args.seed)
+    lexicon = Lexicon()
+    to_model = [t for t in stream if not lexicon.classify(t)[1]]
+    print(
+        f"corpus {len(corpus)} examples ({len({normalize_text(t) for t in corpus})} after normalization), "
+        f"stream {len(stream)} messages, {len(to_model)} past the lexicon tier"
+    )
+    for size in args.sizes:
+        replay(to_model, size, args.ttl, args.shared)
+
+    if SentimentAnalyzer(sidecar_socket="unused").model_path.exists():
+        end_to_end(stream, max(args.sizes), args.concurrency)
+    else:
+        print("model not available: end-to-end comparison needs the sentiment checkpoint")
@@ -0,0 +1,123 @@
+# benchmarks/bench_sentiment_sidecar.py
+# Memory and throughput of N API-worker-like processes scoring sentiment:
+# every worker loading its own model vs all workers sharing one sidecar.
+#
+# Workers are started with the "spawn" method so each imports the analyzer
+# on its own, like gunicorn workers without --preload. Memory is read from
+# /proc (Linux): RSS double-counts shared pages, PSS does not.
+#
+#   python -m benchmarks.bench_sentiment_sidecar --workers 4 --messages 500 --concurrency 16
+
+import argparse
+import asyncio
+import multiprocessing as mp
+import os
+import time
+from typing import Dict, Optional
+
+from benchmarks.nlu_corpus import load_nlu_examples
+
+
+def _memory_kb(pid: int) -> Dict[str, int]:
+    mem = {"rss": 0, "pss": 0}
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                mem["rss"] = int(line.split()[1])
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                if line.startswith("Pss:"):
+                    mem["pss"] = int(line.split()[1])
+    except OSError:
+        pass
+    return mem
+
+
+def _worker(sidecar_socket: Optional[str], messages: int, concurrency: int, ready, go, results) -> None:
+    from intelligence.Sentiment_Analysis.Detect_Sentiment import SentimentAnalyzer
+
+    analyzer = SentimentAnalyzer(sidecar_socket=sidecar_socket)
+    corpus = load_nlu_examples()
+    texts = [corpus[(os.getpid() + i) % len(corpus)] for i in range(messages)]
+
+    async def run() -> float:
+        await analyzer.analyze_async(texts[0])  # warm-up / connect
+        ready.put(os.getpid())
+        await asyncio.get_running_loop().run_in_executor(None, go.wait)
+
+        sem = asyncio.Semaphore(concurrency)
+
+        async def one(text: str):
+            async with sem:
+                await analyzer.analyze_async(text)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one(t) for t in texts))
+        elapsed = time.perf_counter() - start
+        await analyzer.aclose()
+        return elapsed
+
+    elapsed = asyncio.run(run())
+    results.put((os.getpid(), elapsed, analyzer.stats(), _memory_kb(os.getpid())))
+
+
+def run_mode(label: str, sidecar_socket: Optional[str], workers: int, messages: int, concurrency: int) -> None:
+    ctx = mp.get_context("spawn")
+    ready, results, go = ctx.Queue(), ctx.Queue(), ctx.Event()
+
+    supervisor = None
+    if sidecar_socket:
+        from intelligence.Sentiment_Analysis.sidecar import SentimentSidecarSupervisor
+
+        supervisor = SentimentSidecarSupervisor(sidecar_socket).start()
+        if not supervisor.wait_ready(300):
+            raise SystemExit("sentiment sidecar did not become ready")
+
+    procs = [ctx.Process(target=_worker, args=(sidecar_socket, messages, concurrency, ready, go, results)) for _ in range(workers)]
+    for p in procs:
+        p.start()
+    for _ in procs:
+        ready.get()
+    go.set()
+
+    rows = [results.get() for _ in procs]
+    for p in procs:
+        p.join()
+
+    rss = sum(r[3]["rss"] for r in rows)
+    pss = sum(r[3]["pss"] for r in rows)
+    extra = ""
+    if supervisor is not None:
+        side = _memory_kb(supervisor.process.pid)
+        rss += side["rss"]
+        pss += side["pss"]
+        fallbacks = sum(r[2].get("sidecar_fallbacks", 0) for r in rows)
+        extra = f"  (sidecar rss {side['rss'] / 1024:.0f} MB, fallbacks {fallbacks})"
+        supervisor.stop()
+
+    total = workers * messages
+    wall = max(r[1] for r in rows)
+    print(
+        f"{label:<12} workers={workers:<3} {total / wall:9.1f} msg/s"
+        f"  RSS {rss / 1024:7.0f} MB  PSS {pss / 1024:7.0f} MB{extra}"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Per-worker model vs shared sentiment sidecar")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--messages", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--socket", default="/tmp/tub-sentiment-bench.sock")
+    parser.add_argument("--mode", choices=("local", "sidecar", "both"), default="both")
+    args = parser.parse_args()
+
+    from intelligence.Sentiment_Analysis.Detect_Sentiment import SentimentAnalyzer
+    if not SentimentAnalyzer(sidecar_socket=args.socket).model_path.exists():
+        print("warning: sentiment checkpoint missing, this only measures the rule-based fallback")
+
+    if args.mode in ("local", "both"):
+        run_mode("per-worker", None, args.workers, args.messages, args.concurrency)
+    if args.mode in ("sidecar", "both"):
+        run_mode("sidecar", args.socket, args.workers, args.messages, args.concurrency)
@@ -0,0 +1,91 @@
+# benchmarks/bench_startup.py
+# Cold-start time of the API: eager sentiment model load at import vs the
+# background load started from the lifespan hook.
+#
+# Each run starts a fresh uvicorn process and reports
+#   first response  time until any HTTP response comes back (API is serving)
+#   model ready     time until /api/ready reports the load has finished
+#
+#   python -m benchmarks.bench_startup --runs 3
+
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+PENDING = ("not_loaded", "loading")
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _poll(client: httpx.Client, url: str, deadline: float) -> Optional[httpx.Response]:
+    while time.monotonic() < deadline:
+        try:
+            return client.get(url)
+        except httpx.TransportError:
+            time.sleep(0.02)
+    return None
+
+
+def run_once(background: bool, timeout: float) -> Tuple[float, float, str]:
+    port = _free_port()
+    env = {**os.environ, "SENTIMENT_BACKGROUND_LOAD": "true" if background else "false"}
+    cmd = [sys.executable, "-m", "uvicorn", "api.api_server:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"]
+    base = f"http://127.0.0.1:{port}"
+
+    start = time.monotonic()
+    deadline = start + timeout
+    proc = subprocess.Popen(cmd, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        with httpx.Client(timeout=5) as client:
+            # any status counts: the branches query may fail without a database
+            if _poll(client, f"{base}/api/branches", deadline) is None:
+                raise SystemExit(f"server did not answer within {timeout:.0f}s")
+            first = time.monotonic() - start
+
+            state = "?"
+            while time.monotonic() < deadline:
+                r = _poll(client, f"{base}/api/ready", deadline)
+                state = r.json().get("sentiment", "?") if r is not None and r.status_code == 200 else "?"
+                if state not in PENDING:
+                    break
+                time.sleep(0.05)
+            ready = time.monotonic() - start
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+    return first, ready, state
+
+
+def main(runs: int, timeout: float) -> None:
+    results: Dict[str, List[Tuple[float, float, str]]] = {}
+    for background in (False, True):
+        label = "background" if background else "eager"
+        results[label] = [run_once(background, timeout) for _ in range(runs)]
+
+    print(f"{'mode':<11} {'first response':>15} {'model ready':>12}  sentiment")
+    for label, rows in results.items():
+        first = statistics.median(r[0] for r in rows)
+        ready = statistics.median(r[1] for r in rows)
+        print(f"{label:<11} {first:14.2f}s {ready:11.2f}s  {rows[-1][2]}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="API cold start: eager vs background sentiment model load")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--timeout", type=float, default=300)
+    args = parser.parse_args()
+    main(args.runs, args.timeout)
@@ -0,0 +1,109 @@
+# benchmarks/bench_stream_admission.py
+# /api/chat/stream admission slots: the slot is acquired before the
+# StreamingResponse is returned, so it must come back however the response
+# ends. Drives the response objects directly over ASGI (no server) with
+# clients that
+#
+#   - disconnect before the first chunk (the generator never starts)
+#   - disconnect after the first chunk
+#   - read the whole stream
+#
+# and reports the gate's active count afterwards, for a plain
+# StreamingResponse whose generator releases in `finally` (the old code) and
+# for GatedStreamingResponse. Exits 1 if GatedStreamingResponse leaks.
+#
+#   python -m benchmarks.bench_stream_admission --rounds 200
+
+import argparse
+import asyncio
+import gc
+import sys
+from typing import AsyncIterator, Callable, Dict, List
+
+from starlette.requests import ClientDisconnect
+from starlette.responses import StreamingResponse
+
+from api.admission import AdmissionGate, GatedStreamingResponse
+
+# uvicorn speaks ASGI spec 2.4 (send raises OSError once the client is gone);
+# older servers make Starlette listen for http.disconnect in a task group
+SPEC_VERSIONS = ("2.3", "2.4")
+
+
+async def _events(gate: AdmissionGate, release: bool) -> AsyncIterator[str]:
+    try:
+        for i in range(3):
+            await asyncio.sleep(0.001)
+            yield f"event: message\ndata: {i}\n\n"
+    finally:
+        if release:
+            gate.release()
+
+
+def _plain(gate: AdmissionGate) -> StreamingResponse:
+    return StreamingResponse(_events(gate, release=True), media_type="text/event-stream")
+
+
+def _gated(gate: AdmissionGate) -> StreamingResponse:
+    return GatedStreamingResponse(_events(gate, release=False), gate, media_type="text/event-stream")
+
+
+async def _client(response: StreamingResponse, spec_version: str, disconnect_after: int) -> None:
+    """
+    Run `response`; the client goes away once it has seen `disconnect_after`
+    body chunks (0 = before the response starts, -1 = never).
+    """
+    scope = {"type": "http", "asgi": {"version": "3.0", "spec_version": spec_version}, "method": "POST", "headers": []}
+    chunks = 0
+    gone = asyncio.Event()
+    if disconnect_after == 0:
+        gone.set()
+
+    async def receive() -> Dict:
+        await gone.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message: Dict) -> None:
+        nonlocal chunks
+        if gone.is_set():
+            if spec_version >= "2.4":
+                raise OSError("client disconnected")
+            return                      # pre-2.4 servers drop sends to a closed connection
+        if message["type"] == "http.response.body" and message.get("body"):
+            chunks += 1
+            if chunks == disconnect_after:
+                gone.set()
+
+    try:
+        await response(scope, receive, send)
+    except ClientDisconnect:
+        pass
+
+
+async def run(label: str, make: Callable[[AdmissionGate], StreamingResponse], rounds: int) -> List[int]:
+    leaked = []
+    for spec_version in SPEC_VERSIONS:
+        for case, disconnect_after in (("before first chunk", 0), ("after first chunk", 1), ("complete", -1)):
+            gate = AdmissionGate("bench", max_concurrency=rounds, max_queue=0)
+            for _ in range(rounds):
+                await gate.acquire()
+                await _client(make(gate), spec_version, disconnect_after)
+            gc.collect()                # unstarted generators are finalized here, if ever
+            await asyncio.sleep(0.05)   # and closed asynchronously
+            held = gate.stats()["active"]
+            leaked.append(held)
+            print(f"{label:<24} asgi {spec_version}  {case:<20} slots still held {held:4d}/{rounds}")
+    return leaked
+
+
+async def main(rounds: int) -> int:
+    await run("generator finally", _plain, rounds)
+    leaked = await run("GatedStreamingResponse", _gated, rounds)
+    return 1 if any(leaked) else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Admission slots held by /api/chat/stream responses after disconnects")
+    parser.add_argument("--rounds", type=int, default=100)
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.rounds)))
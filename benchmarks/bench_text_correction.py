@@ -0,0 +1,114 @@
+# benchmarks/bench_text_correction.py
+# Rule-based text correction throughput on N chat-like messages:
+#   per-message, original difflib fuzzy_fix (before the deletion index)
+#   per-message correct_typos   (deletion index + token cache)
+#   correct_batch in chunks     (plus de-duplication across the chunk)
+#
+# Messages are nlu.yml examples with typos injected (dropped vowels, dropped /
+# swapped letters, banking abbreviations), so the token distribution looks like
+# real support chat. The index paths must produce the same text; differences
+# from the difflib baseline must all be tokens whose original correction
+# depended on set iteration order (see benchmarks/bench_fuzzy_fix.py).
+#
+#   python -m benchmarks.bench_text_correction --messages 100000
+#   python -m benchmarks.bench_text_correction --messages 100000 --skip-difflib
+
+import os
+
+os.environ["USE_LLM_CORRECTION"] = "false"
+
+import argparse
+import random
+import time
+from typing import List
+
+from benchmarks.bench_fuzzy_fix import reference_outputs
+from benchmarks.nlu_corpus import load_nlu_examples
+from intelligence.text import text_corrector
+from intelligence.text.text_corrector import (
+    BANK_ABBREVIATIONS,
+    clean_text_basic,
+    correct_batch,
+    correct_typos,
+    correction_cache_stats,
+    fuzzy_fix_difflib,
+)
+
+_ABBREVIATE = {full: short for short, full in BANK_ABBREVIATIONS.items() if short != full}
+
+
+def _typo(word: str, rng: random.Random) -> str:
+    if word in _ABBREVIATE and rng.random() < 0.5:
+        return _ABBREVIATE[word]
+    if len(word) < 4:
+        return word
+    kind = rng.randrange(3)
+    if kind == 0:
+        return word[0] + "".join(c for c in word[1:] if c not in "aeiou")
+    i = rng.randrange(1, len(word) - 1)
+    if kind == 1:
+        return word[:i] + word[i + 1:]
+    return word[:i] + word[i + 1] + word[i] + word[i + 2:]
+
+
+def make_messages(n: int, typo_rate: float, seed: int) -> List[str]:
+    rng = random.Random(seed)
+    corpus = load_nlu_examples()
+    out = []
+    for _ in range(n):
+        words = rng.choice(corpus).split()
+        out.append(" ".join(_typo(w, rng) if rng.random() < typo_rate else w for w in words))
+    return out
+
+
+def _timed(label: str, fn, messages: List[str]) -> List[str]:
+    start = time.perf_counter()
+    result = fn(messages)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {elapsed:7.2f}s  {len(messages) / elapsed:10.0f} msg/s")
+    return result
+
+
+def main(messages: int, typo_rate: float, chunk: int, seed: int, skip_difflib: bool) -> None:
+    texts = make_messages(messages, typo_rate, seed)
+    tokens = [t for text in texts for t in clean_text_basic(text).split()]
+    print(f"{messages} messages, {len(tokens)} tokens, {len(set(tokens))} distinct")
+
+    baseline = None
+    if not skip_difflib:
+        baseline = _timed(
+            "per message, difflib",
+            lambda ms: [" ".join(fuzzy_fix_difflib(t) for t in clean_text_basic(m).split()) for m in ms],
+            texts,
+        )
+    text_corrector._fuzzy_fix_cached.cache_clear()
+    results = [_timed("per message, correct_typos", lambda ms: [correct_typos(m) for m in ms], texts)]
+    print(f"  token cache {correction_cache_stats()}")
+    text_corrector._fuzzy_fix_cached.cache_clear()
+    results.append(_timed(
+        f"correct_batch (chunk={chunk})",
+        lambda ms: [out for i in range(0, len(ms), chunk) for out in correct_batch(ms[i:i + chunk])],
+        texts,
+    ))
+    print(f"  token cache {correction_cache_stats()}")
+    print("correct_typos == correct_batch:", results[0] == results[1])
+    if baseline is not None:
+        differ = [(text, old, new) for text, old, new in zip(texts, baseline, results[0]) if old != new]
+        tokens_ok = all(
+            n in reference_outputs(t)
+            for text, old, new in differ
+            for t, o, n in zip(clean_text_basic(text).split(), old.split(), new.split())
+            if o != n
+        )
+        print(f"vs difflib: {len(differ)} messages differ, all order-dependent vowel fills: {tokens_ok}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Text correction throughput: per-message vs correct_batch")
+    parser.add_argument("--messages", type=int, default=100000)
+    parser.add_argument("--typo-rate", type=float, default=0.15, help="share of words given a typo")
+    parser.add_argument("--chunk", type=int, default=1000, help="messages per correct_batch call")
+    parser.add_argument("--seed", type=int, default=3)
+    parser.add_argument("--skip-difflib", action="store_true", help="skip the slow original baseline")
+    args = parser.parse_args()
+    main(args.messages, args.typo_rate, args.chunk, args.seed, args.skip_difflib)
@@ -0,0 +1,91 @@
+# benchmarks/bench_token_manager.py
+# JWT encode/decode ops/sec: raw PEM strings (old behaviour) vs pre-parsed key
+# objects vs the verified-token cache, for RS256 and EdDSA.
+#
+# token_manager validates settings and loads its keys at import; a throwaway
+# RS256 pair is written to a temp dir for that (JWT_*_KEY_PATH), so the real
+# config/jwt_keys are neither needed nor touched. Benchmark keys are generated
+# in memory.
+#
+#   python -m benchmarks.bench_token_manager --seconds 2
+
+import os
+import argparse
+import tempfile
+import time
+
+import jwt
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
+
+
+def _pem_pair(private_key):
+    private_pem = private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode()
+    public_pem = private_key.public_key().public_bytes(
+        serialization.Encoding.PEM,
+        serialization.PublicFormat.SubjectPublicKeyInfo,
+    ).decode()
+    return private_pem, public_pem
+
+
+def _throwaway_key_files() -> None:
+    key_dir = tempfile.mkdtemp(prefix="bench_jwt_")
+    private_pem, public_pem = _pem_pair(rsa.generate_private_key(public_exponent=65537, key_size=2048))
+    for name, pem in (("private_key.pem", private_pem), ("public_key.pem", public_pem)):
+        with open(os.path.join(key_dir, name), "w") as f:
+            f.write(pem)
+    os.environ["JWT_PRIVATE_KEY_PATH"] = os.path.join(key_dir, "private_key.pem")
+    os.environ["JWT_PUBLIC_KEY_PATH"] = os.path.join(key_dir, "public_key.pem")
+    os.environ["JWT_ALGORITHM"] = "RS256"
+    os.environ.setdefault("SUPABASE_DATABASE_URL", "postgresql://bench@127.0.0.1:1/unused")
+
+
+def _ops_per_sec(fn, seconds: float) -> float:
+    n = 0
+    deadline = time.perf_counter() + seconds
+    start = time.perf_counter()
+    while time.perf_counter() < deadline:
+        fn()
+        n += 1
+    return n / (time.perf_counter() - start)
+
+
+def bench(algorithm: str, private_key, seconds: float) -> None:
+    private_pem, public_pem = _pem_pair(private_key)
+    public_key = private_key.public_key()
+
+    uncached = TokenManager(private_key, public_key, algorithm=algorithm, cache_size=0)
+    cached = TokenManager(private_key, public_key, algorithm=algorithm)
+    token = uncached.create_access_token(1001)
+
+    def pem_encode():
+        jwt.encode({"sub": "1001", "iss": ISSUER, "aud": AUDIENCE}, private_pem, algorithm=algorithm)
+
+    def pem_decode():
+        jwt.decode(token, public_pem, algorithms=[algorithm], audience=AUDIENCE, issuer=ISSUER)
+
+    rows = [
+        ("encode  PEM string", pem_encode),
+        ("encode  key object", lambda: uncached.create_access_token(1001)),
+        ("decode  PEM string", pem_decode),
+        ("decode  key object", lambda: uncached.decode_token(token)),
+        ("decode  cached", lambda: cached.decode_token(token)),
+    ]
+    for name, fn in rows:
+        print(f"{algorithm:<6} {name:<20} {_ops_per_sec(fn, seconds):>12,.0f} ops/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="TokenManager micro-benchmark")
+    parser.add_argument("--seconds", type=float, default=2.0)
+    args = parser.parse_args()
+
+    _throwaway_key_files()
+    from auth.authentication.token_manager import AUDIENCE, ISSUER, TokenManager
+
+    bench("RS256", rsa.generate_private_key(public_exponent=65537, key_size=2048), args.seconds)
+    bench("EdDSA", ed25519.Ed25519PrivateKey.generate(), args.seconds)
@@ -0,0 +1,105 @@
+# benchmarks/bench_ws_chat.py
+# Chat messages/sec for ONE worker: POST /api/chat per message vs /ws/chat.
+#
+# Each simulated user holds one conversation and sends its messages one after
+# another (a long support chat). The POST variant reuses keep-alive
+# connections, so the difference is per-message HTTP/CORS/JWT work, not TCP
+# setup. --pipeline sends all of a user's WebSocket frames before reading
+# the replies.
+#
+#   python -m benchmarks.stub_rasa --port 5005 --latency-ms 5
+#   RASA_URL=http://127.0.0.1:5005/webhooks/rest/webhook AUTO_START_RASA=false \
+#       uvicorn api.api_server:app --port 8000 --workers 1
+#   python -m benchmarks.bench_ws_chat --users 50 --messages 40 --token "$JWT"
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from typing import List, Optional
+
+import httpx
+from websockets.asyncio.client import connect
+
+
+def _report(label: str, total: int, elapsed: float, latencies: List[float]) -> None:
+    latencies.sort()
+    p50 = statistics.median(latencies) * 1000 if latencies else 0.0
+    p99 = latencies[int(len(latencies) * 0.99) - 1] * 1000 if latencies else 0.0
+    print(f"{label:<20} {total:6d} msgs in {elapsed:6.2f}s  {total / elapsed:8.1f} msg/s  p50={p50:6.1f}ms  p99={p99:6.1f}ms")
+
+
+async def bench_post(base_url: str, token: Optional[str], users: int, messages: int) -> None:
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+    latencies: List[float] = []
+    limits = httpx.Limits(max_connections=users, max_keepalive_connections=users)
+
+    async with httpx.AsyncClient(base_url=base_url, headers=headers, limits=limits, timeout=30) as client:
+        async def user(u: int):
+            for i in range(messages):
+                start = time.perf_counter()
+                resp = await client.post("/api/chat", json={"message": f"user {u} message {i}", "lang": "en"})
+                resp.raise_for_status()
+                latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(user(u) for u in range(users)))
+        elapsed = time.perf_counter() - start
+
+    _report("POST /api/chat", users * messages, elapsed, latencies)
+
+
+async def bench_ws(base_url: str, token: Optional[str], users: int, messages: int, pipeline: bool) -> None:
+    ws_url = base_url.replace("http", "ws", 1) + "/ws/chat"
+    headers = {"Authorization": f"Bearer {token}"} if token else None
+    latencies: List[float] = []
+
+    async def user(u: int):
+        async with connect(ws_url, additional_headers=headers, max_queue=None) as ws:
+            if pipeline:
+                sent = {}
+                for i in range(messages):
+                    sent[i] = time.perf_counter()
+                    await ws.send(json.dumps({"id": i, "message": f"user {u} message {i}"}))
+                for _ in range(messages):
+                    reply = json.loads(await ws.recv())
+                    if "error" in reply:
+                        raise RuntimeError(reply)
+                    latencies.append(time.perf_counter() - sent[reply["id"]])
+            else:
+                for i in range(messages):
+                    start = time.perf_counter()
+                    await ws.send(json.dumps({"id": i, "message": f"user {u} message {i}"}))
+                    reply = json.loads(await ws.recv())
+                    if "error" in reply:
+                        raise RuntimeError(reply)
+                    latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(user(u) for u in range(users)))
+    elapsed = time.perf_counter() - start
+
+    _report("WS /ws/chat" + (" (pipe)" if pipeline else ""), users * messages, elapsed, latencies)
+
+
+async def main(args) -> None:
+    base_url = args.base_url.rstrip("/")
+    print(f"{args.users} users x {args.messages} messages against {base_url} ({'customer' if args.token else 'guest'})")
+    if args.mode in ("post", "both"):
+        await bench_post(base_url, args.token, args.users, args.messages)
+    if args.mode in ("ws", "both"):
+        await bench_ws(base_url, args.token, args.users, args.messages, pipeline=False)
+        if args.pipeline:
+            await bench_ws(base_url, args.token, args.users, args.messages, pipeline=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="WebSocket vs POST chat load test")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--token", default=None, help="access token; omit to chat as guest")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--messages", type=int, default=40)
+    parser.add_argument("--mode", choices=("post", "ws", "both"), default="both")
+    parser.add_argument("--pipeline", action="store_true")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,90 @@
+# benchmarks/eval_sentiment_cascade.py
+# How much work the lexicon tier saves and what it costs in agreement.
+#
+# Every text is scored by the lexicon tier and by the model. Reports the share
+# answered by the lexicon (= model calls saved), the lexicon's agreement with
+# the model on that share, the resulting end-to-end agreement of the cascade
+# with model-only scoring, and label accuracy when a labelled CSV is given.
+# Without the checkpoint only the tier split is reported.
+#
+#   python -m benchmarks.eval_sentiment_cascade
+#   python -m benchmarks.eval_sentiment_cascade --labelled sentiment.csv --show 20
+
+import os
+
+os.environ["CUDA_VISIBLE_DEVICES"] = ""
+
+import argparse
+import time
+from collections import Counter
+from pathlib import Path
+from typing import List, Optional
+
+from benchmarks.nlu_corpus import load_nlu_examples
+from intelligence.Sentiment_Analysis.Detect_Sentiment import LABELS, SentimentAnalyzer
+
+
+def main(labelled: Optional[Path], limit: Optional[int], show: int, batch_size: int) -> None:
+    labels: List[int] = []
+    if labelled:
+        from intelligence.Sentiment_Analysis.export_onnx import load_labelled
+
+        texts, labels = load_labelled(labelled, limit)
+    else:
+        texts = load_nlu_examples(limit=limit)
+
+    analyzer = SentimentAnalyzer(sidecar_socket=None, cascade=True)
+
+    start = time.perf_counter()
+    tiered = [analyzer.lexicon.classify(t) for t in texts]
+    lexicon_us = (time.perf_counter() - start) / len(texts) * 1e6
+    confident = [c for _, c in tiered]
+    hits = sum(confident)
+
+    print(f"texts:              {len(texts)} ({'labelled CSV' if labels else 'nlu.yml'})")
+    print(f"lexicon tier:       {hits} ({hits / len(texts):.1%}) -> model calls saved")
+    print(f"escalated to model: {len(texts) - hits}")
+    print(f"lexicon cost:       {lexicon_us:.1f} us/msg")
+    print(f"lexicon labels:     {dict(Counter(r['label'] for (r, c) in tiered if c))}")
+
+    if analyzer.engine is None:
+        print("model not available: agreement needs the sentiment checkpoint")
+        return
+
+    start = time.perf_counter()
+    model = []
+    for i in range(0, len(texts), batch_size):
+        model.extend(result for result, _ in analyzer._analyze_batch(texts[i:i + batch_size]))
+    model_ms = (time.perf_counter() - start) / len(texts) * 1e3
+
+    cascade = [r if c else m for (r, c), m in zip(tiered, model)]
+    agree_tier = sum(r["label"] == m["label"] for (r, c), m in zip(tiered, model) if c)
+    agree_all = sum(c["label"] == m["label"] for c, m in zip(cascade, model))
+
+    print(f"model cost:         {model_ms:.2f} ms/msg (batch={batch_size})")
+    print(f"tier agreement:     {agree_tier / hits:.1%} of lexicon answers match the model" if hits else "tier agreement:     n/a")
+    print(f"cascade agreement:  {agree_all / len(texts):.1%} vs model-only")
+    if labels:
+        for name, preds in (("model-only", model), ("cascade", cascade)):
+            acc = sum(LABELS.index(p["label"]) == y for p, y in zip(preds, labels)) / len(labels)
+            print(f"{name:<11} accuracy {acc:.1%}")
+
+    if show:
+        print("\nlexicon answers the model disagrees with:")
+        shown = 0
+        for text, (r, c), m in zip(texts, tiered, model):
+            if c and r["label"] != m["label"]:
+                print(f"  lexicon={r['label']:<8} model={m['label']:<8} {text!r}")
+                shown += 1
+                if shown >= show:
+                    break
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Evaluate the lexicon -> model sentiment cascade")
+    parser.add_argument("--labelled", type=Path, default=None, help="CSV with Sentence,Sentiment columns")
+    parser.add_argument("--limit", type=int, default=None)
+    parser.add_argument("--show", type=int, default=10, help="print this many lexicon/model disagreements")
+    parser.add_argument("--batch-size", type=int, default=32)
+    args = parser.parse_args()
+    main(args.labelled, args.limit, args.show, args.batch_size)
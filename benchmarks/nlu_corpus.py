@@ -0,0 +1,29 @@
+# benchmarks/nlu_corpus.py
+# Real user-style messages for the benchmarks: the intent examples in
+# rasa/data/nlu.yml with entity annotations stripped.
+
+import re
+from pathlib import Path
+from typing import List, Optional
+
+NLU_PATH = Path(__file__).resolve().parents[1] / "rasa" / "data" / "nlu.yml"
+
+# "[savings](account_type)" / '[x]{"entity": ...}' -> "savings" / "x"
+_ENTITY = re.compile(r"\[([^\]]+)\](?:\([^)]*\)|\{[^}]*\})")
+
+
+def load_nlu_examples(path: Optional[Path] = None, limit: Optional[int] = None) -> List[str]:
+    examples: List[str] = []
+    in_intent = False
+    for line in (path or NLU_PATH).read_text(encoding="utf-8").splitlines():
+        if line.startswith("- "):
+            in_intent = line.startswith("- intent:")
+            continue
+        stripped = line.strip()
+        if in_intent and stripped.startswith("- "):
+            text = _ENTITY.sub(r"\1", stripped[2:]).strip()
+            if text:
+                examples.append(text)
+                if limit and len(examples) >= limit:
+                    break
+    return examples
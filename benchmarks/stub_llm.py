@@ -0,0 +1,102 @@
+# benchmarks/stub_llm.py
+# Minimal stand-in for the LLM API used by intelligence/llm_client.py.
+# Speaks both formats: POST .../chat/completions (OpenAI / Groq) and
+# POST ...:generateContent (Gemini). The reply echoes the last user text.
+#
+# server.status / server.latency_s can be changed while it runs to simulate
+# an outage (503), rate limiting (429 + Retry-After) or a slow upstream;
+# server.requests counts the calls that reached it.
+#
+#   python -m benchmarks.stub_llm --port 8099 --latency-ms 300
+#   LLM_API_URL=http://127.0.0.1:8099/v1/chat/completions ...
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+from typing import Tuple
+
+from benchmarks.stub_rasa import _StubServer
+
+
+class _StubLLMServer(_StubServer):
+    status = 200
+    latency_s = 0.3
+    retry_after = 1
+    requests = 0
+
+
+class _StubLLMHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):  # keep benchmark output clean
+        pass
+
+    def _send_json(self, status: int, body, headers=None) -> None:
+        raw = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(raw)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def do_POST(self):
+        server = self.server
+        length = int(self.headers.get("Content-Length") or 0)
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        server.requests += 1
+        time.sleep(server.latency_s)
+
+        if server.status == 429:
+            self._send_json(429, {"error": "rate limited"}, {"Retry-After": str(server.retry_after)})
+            return
+        if server.status != 200:
+            self._send_json(server.status, {"error": "stub outage"})
+            return
+
+        if ":generateContent" in self.path:
+            prompt = payload["contents"][-1]["parts"][-1]["text"]
+            # correction prompts end with "User: <text>\nCorrected:"
+            text = prompt.rsplit("User:", 1)[-1].replace("Corrected:", "").strip()
+            self._send_json(200, {"candidates": [{"content": {"parts": [{"text": f"stub {text}"}]}}]})
+        else:
+            text = payload["messages"][-1]["content"]
+            self._send_json(200, {"choices": [{"message": {"role": "assistant", "content": f"stub {text}"}}]})
+
+
+def start_stub_llm(
+    host: str = "127.0.0.1",
+    port: int = 0,
+    latency_ms: float = 300,
+    style: str = "openai",
+) -> Tuple[_StubLLMServer, str]:
+    """
+    Start the stub on a background thread.
+    Returns (server, api_url) for the given style; call server.shutdown() when done.
+    """
+    server = _StubLLMServer((host, port), _StubLLMHandler)
+    server.latency_s = latency_ms / 1000.0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    bound_host, bound_port = server.server_address[:2]
+    path = "/v1beta/models/stub:generateContent?key=stub" if style == "gemini" else "/v1/chat/completions"
+    return server, f"http://{bound_host}:{bound_port}{path}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stub LLM API (OpenAI chat completions / Gemini generateContent)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--latency-ms", type=float, default=300)
+    parser.add_argument("--status", type=int, default=200, help="answer every call with this status (429, 503, ...)")
+    args = parser.parse_args()
+
+    srv, url = start_stub_llm(args.host, args.port, args.latency_ms)
+    srv.status = args.status
+    print(f"Stub LLM listening on {url} (latency={args.latency_ms}ms, status={args.status})")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        srv.shutdown()
@@ -0,0 +1,108 @@
+# benchmarks/stub_rasa.py
+# Minimal stand-in for `rasa run --enable-api` used by the benchmarks.
+#
+#   python -m benchmarks.stub_rasa --port 5005 --latency-ms 50
+
+import argparse
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Tuple
+
+
+class _StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def handle_error(self, request, client_address):
+        # clients cancelling (hedged/timed-out calls) are expected here
+        if not isinstance(sys.exc_info()[1], (BrokenPipeError, ConnectionResetError)):
+            super().handle_error(request, client_address)
+
+
+class _StubRasaHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    latency_s = 0.05
+    messages_per_reply = 1
+
+    def log_message(self, format, *args):  # keep benchmark output clean
+        pass
+
+    def _send_json(self, status: int, body) -> None:
+        raw = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(raw)))
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def do_GET(self):
+        if self.path.startswith("/status"):
+            self._send_json(200, {"model_file": "stub.tar.gz", "num_active_training_jobs": 0})
+        else:
+            self._send_json(200, {"hello": "from stub rasa"})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        sender = payload.get("sender", "guest")
+        replies = [
+            {"recipient_id": sender, "text": f"echo {i}: {payload.get('message', '')}"}
+            for i in range(self.messages_per_reply)
+        ]
+
+        if "stream=true" in self.path:
+            # like Rasa's REST channel: one JSON document per line, as dispatched
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for reply in replies:
+                time.sleep(self.latency_s / max(1, len(replies)))
+                chunk = (json.dumps(reply) + "\n").encode()
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+                self.wfile.flush()
+            self.wfile.write(b"0\r\n\r\n")
+            return
+
+        time.sleep(self.latency_s)
+        self._send_json(200, replies)
+
+
+def start_stub_rasa(
+    host: str = "127.0.0.1",
+    port: int = 0,
+    latency_ms: float = 50,
+    messages_per_reply: int = 1,
+) -> Tuple[ThreadingHTTPServer, str]:
+    """
+    Start the stub on a background thread.
+    Returns (server, webhook_url); call server.shutdown() when done.
+    """
+    handler = type(
+        "StubRasaHandler",
+        (_StubRasaHandler,),
+        {"latency_s": latency_ms / 1000.0, "messages_per_reply": messages_per_reply},
+    )
+    server = _StubServer((host, port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    bound_host, bound_port = server.server_address[:2]
+    return server, f"http://{bound_host}:{bound_port}/webhooks/rest/webhook"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stub Rasa REST webhook")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5005)
+    parser.add_argument("--latency-ms", type=float, default=50)
+    parser.add_argument("--messages", type=int, default=1)
+    args = parser.parse_args()
+
+    srv, url = start_stub_rasa(args.host, args.port, args.latency_ms, args.messages)
+    print(f"Stub Rasa listening on {url} (latency={args.latency_ms}ms)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        srv.shutdown()
@@ -11,14 +11,15 @@ if env_file.exists():
     load_dotenv(env_file)
 
 # -----------------------------
-# JWT (RS256)
+# JWT (RS256, or EdDSA/Ed25519 for cheaper signing)
 # -----------------------------
 JWT_ALGORITHM = os.getenv("JWT_ALGORITHM", "RS256")
+SUPPORTED_JWT_ALGORITHMS = ("RS256", "EdDSA")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 30))
 REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", 14))
 
-PRIVATE_KEY_PATH = BASE_DIR / "config/jwt_keys/private_key.pem"
-PUBLIC_KEY_PATH  = BASE_DIR / "config/jwt_keys/public_key.pem"
+PRIVATE_KEY_PATH = Path(os.getenv("JWT_PRIVATE_KEY_PATH") or BASE_DIR / "config/jwt_keys/private_key.pem")
+PUBLIC_KEY_PATH  = Path(os.getenv("JWT_PUBLIC_KEY_PATH") or BASE_DIR / "config/jwt_keys/public_key.pem")
 
 # -----------------------------
 # DATABASE
@@ -46,8 +47,8 @@ DEFAULT_LANGUAGE = os.getenv("DEFAULT_LANGUAGE", "en")
 def validate_settings():
     errors = []
 
-    if JWT_ALGORITHM != "RS256":
-        errors.append("JWT_ALGORITHM must be RS256")
+    if JWT_ALGORITHM not in SUPPORTED_JWT_ALGORITHMS:
+        errors.append("JWT_ALGORITHM must be one of: " + ", ".join(SUPPORTED_JWT_ALGORITHMS))
 
     if not PRIVATE_KEY_PATH.exists():
         errors.append("Missing private_key.pem")
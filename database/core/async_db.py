@@ -0,0 +1,154 @@
+# database/core/async_db.py
+# Async facade over the synchronous psycopg2 helpers.
+#
+# DB work runs on a dedicated, bounded thread pool so `async def` endpoints
+# never block the event loop. The pool is sized to DB_MAXCONN by default:
+# more threads than pooled connections would only queue inside the pool.
+
+import os
+import time
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from database.core.connect import DB_MAXCONN
+from database.core.db import run_query
+
+LOG = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+DB_EXECUTOR_WORKERS = int(os.getenv("DB_EXECUTOR_WORKERS", DB_MAXCONN))
+
+
+class DBExecutor:
+    """
+    Bounded ThreadPoolExecutor with queue/latency counters.
+    """
+
+    def __init__(self, max_workers: int = DB_EXECUTOR_WORKERS):
+        self.max_workers = max(1, max_workers)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._queued = 0
+        self._running = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._run_total = 0.0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers,
+                        thread_name_prefix="db",
+                    )
+        return self._executor
+
+    def _instrumented(self, fn: Callable[..., T], enqueued_at: float) -> T:
+        started = time.perf_counter()
+        waited = started - enqueued_at
+        with self._lock:
+            self._queued -= 1
+            self._running += 1
+            self._wait_total += waited
+            if waited > self._wait_max:
+                self._wait_max = waited
+
+        ok = False
+        try:
+            result = fn()
+            ok = True
+            return result
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self._running -= 1
+                self._run_total += elapsed
+                if ok:
+                    self._completed += 1
+                else:
+                    self._failed += 1
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Run a blocking DB callable on the executor and await its result.
+        """
+        call = partial(fn, *args, **kwargs)
+        with self._lock:
+            self._submitted += 1
+            self._queued += 1
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._get_executor(),
+            self._instrumented,
+            call,
+            time.perf_counter(),
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            finished = self._completed + self._failed
+            return {
+                "max_workers": self.max_workers,
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "failed": self._failed,
+                "queued": self._queued,
+                "running": self._running,
+                "wait_seconds_total": self._wait_total,
+                "wait_seconds_max": self._wait_max,
+                "run_seconds_total": self._run_total,
+                "avg_wait_ms": (self._wait_total / finished * 1000.0) if finished else 0.0,
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+
+# =================================================
+# Module-level helpers
+# =================================================
+_db_executor: Optional[DBExecutor] = None
+
+
+def get_db_executor() -> DBExecutor:
+    global _db_executor
+    if _db_executor is None:
+        _db_executor = DBExecutor()
+    return _db_executor
+
+
+async def run_in_db(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Await a synchronous DB helper (e.g. get_user_by_customer_id) off the event loop.
+    """
+    return await get_db_executor().run(fn, *args, **kwargs)
+
+
+async def async_run_query(
+    query: str,
+    params: Optional[tuple] = None,
+    fetch: bool = False,
+    many: bool = False,
+    commit: bool = True,
+):
+    """
+    Async counterpart of database.core.db.run_query.
+    """
+    return await run_in_db(run_query, query, params, fetch=fetch, many=many, commit=commit)
+
+
+def executor_stats() -> Dict[str, Any]:
+    return get_db_executor().stats()
@@ -0,0 +1,125 @@
+# database/core/chat_sentiment_db.py
+# Storage for offline sentiment scores of chat_history rows (see
+# intelligence/Sentiment_Analysis/bulk_score.py) and the job checkpoint that
+# makes a bulk run resumable.
+
+from typing import Any, Iterator, List, Optional, Sequence, Tuple
+
+import psycopg2.extensions
+import psycopg2.extras
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS chat_sentiment (
+    chat_id        BIGINT PRIMARY KEY REFERENCES chat_history (chat_id) ON DELETE CASCADE,
+    label          TEXT NOT NULL,
+    score          REAL NOT NULL,
+    is_negative    BOOLEAN NOT NULL,
+    is_frustrated  BOOLEAN NOT NULL,
+    source         TEXT NOT NULL,
+    scored_at      TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+CREATE TABLE IF NOT EXISTS bulk_job_checkpoint (
+    job           TEXT PRIMARY KEY,
+    last_chat_id  BIGINT NOT NULL,
+    rows_done     BIGINT NOT NULL DEFAULT 0,
+    updated_at    TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+"""
+
+# (chat_id, label, score, is_negative, is_frustrated, source)
+ScoreRow = Tuple[int, str, float, bool, bool, str]
+
+
+def ensure_schema(conn) -> None:
+    with conn.cursor() as cur:
+        cur.execute(SCHEMA)
+    conn.commit()
+
+
+def get_checkpoint(conn, job: str) -> Tuple[int, int]:
+    """
+    (last chat_id written, rows written) for `job`; (0, 0) if it never ran.
+    """
+    with conn.cursor(cursor_factory=psycopg2.extensions.cursor) as cur:
+        cur.execute("SELECT last_chat_id, rows_done FROM bulk_job_checkpoint WHERE job = %s", (job,))
+        row = cur.fetchone()
+    conn.commit()
+    return (row[0], row[1]) if row else (0, 0)
+
+
+def reset_checkpoint(conn, job: str) -> None:
+    with conn.cursor() as cur:
+        cur.execute("DELETE FROM bulk_job_checkpoint WHERE job = %s", (job,))
+    conn.commit()
+
+
+def count_chats_after(conn, last_chat_id: int) -> int:
+    with conn.cursor(cursor_factory=psycopg2.extensions.cursor) as cur:
+        cur.execute("SELECT COUNT(*) FROM chat_history WHERE chat_id > %s", (last_chat_id,))
+        (count,) = cur.fetchone()
+    conn.commit()
+    return count
+
+
+def stream_chats(conn, after_chat_id: int, page_size: int, limit: Optional[int] = None) -> Iterator[List[Tuple[int, str]]]:
+    """
+    Yield pages of (chat_id, user_query) in chat_id order through a
+    server-side (named) cursor, so only `page_size` rows are in memory.
+    Runs in its own read transaction on `conn`.
+    """
+    q = "SELECT chat_id, user_query FROM chat_history WHERE chat_id > %s ORDER BY chat_id"
+    params: Tuple[Any, ...] = (after_chat_id,)
+    if limit:
+        q += " LIMIT %s"
+        params += (limit,)
+
+    cur = conn.cursor(name="bulk_sentiment_chats", cursor_factory=psycopg2.extensions.cursor)
+    cur.itersize = page_size
+    try:
+        cur.execute(q, params)
+        while True:
+            rows = cur.fetchmany(page_size)
+            if not rows:
+                break
+            yield rows
+    finally:
+        cur.close()
+        conn.rollback()
+
+
+def save_scores(conn, job: str, rows: Sequence[ScoreRow], overwrite: bool = True) -> None:
+    """
+    Bulk-upsert scores and advance the job checkpoint in ONE transaction,
+    so a crash never leaves the checkpoint ahead of the data.
+    """
+    if not rows:
+        return
+    conflict = (
+        "DO UPDATE SET label = EXCLUDED.label, score = EXCLUDED.score, is_negative = EXCLUDED.is_negative,"
+        " is_frustrated = EXCLUDED.is_frustrated, source = EXCLUDED.source, scored_at = NOW()"
+        if overwrite else "DO NOTHING"
+    )
+    try:
+        with conn.cursor() as cur:
+            psycopg2.extras.execute_values(
+                cur,
+                "INSERT INTO chat_sentiment (chat_id, label, score, is_negative, is_frustrated, source)"
+                f" VALUES %s ON CONFLICT (chat_id) {conflict}",
+                rows,
+                page_size=1000,
+            )
+            cur.execute(
+                """
+                INSERT INTO bulk_job_checkpoint (job, last_chat_id, rows_done, updated_at)
+                VALUES (%s, %s, %s, NOW())
+                ON CONFLICT (job) DO UPDATE
+                SET last_chat_id = GREATEST(bulk_job_checkpoint.last_chat_id, EXCLUDED.last_chat_id),
+                    rows_done = bulk_job_checkpoint.rows_done + EXCLUDED.rows_done,
+                    updated_at = NOW()
+                """,
+                (job, max(r[0] for r in rows), len(rows)),
+            )
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
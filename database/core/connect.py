@@ -2,13 +2,17 @@
 import os
 import logging
 import time
+import threading
+from collections import deque
 from contextlib import contextmanager
-from psycopg2 import pool, OperationalError
+import psycopg2
+from psycopg2 import pool, OperationalError, InterfaceError
+import psycopg2.extensions
 import psycopg2.extras
 from dotenv import load_dotenv
 from pathlib import Path
 from urllib.parse import urlparse
-from typing import Optional, Tuple
+from typing import Any, Deque, Dict, Optional, Tuple
 import codecs
 
 LOG = logging.getLogger(__name__)
@@ -57,6 +61,11 @@ _safe_load_dotenv(_env_default)
 DB_MINCONN = int(os.getenv("DB_MINCONN", 1))
 DB_MAXCONN = int(os.getenv("DB_MAXCONN", 10))
 
+# Pool health / recycling
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 10))          # max seconds to wait for a free connection
+DB_POOL_MAX_AGE = float(os.getenv("DB_POOL_MAX_AGE", 1800))        # recycle connections older than this (0 = never)
+DB_POOL_PING_IDLE = float(os.getenv("DB_POOL_PING_IDLE", 30))      # pre-ping connections idle longer than this (0 = always)
+
 # Retry behavior for establishing pool
 DB_CONN_RETRIES = int(os.getenv("DB_CONN_RETRIES", 4))
 DB_CONN_RETRY_DELAY = float(os.getenv("DB_CONN_RETRY_DELAY", 1.5))
@@ -76,7 +85,217 @@ DB_NAME = os.getenv("DATABASE_DBNAME") or os.getenv("DATABASE_dbname") or "postg
 DB_USER = os.getenv("DATABASE_USER") or os.getenv("USER") or "postgres"
 DB_PASSWORD = os.getenv("DATABASE_PASSWORD") or ""
 
-_pool: Optional[pool.SimpleConnectionPool] = None
+
+# ---------- thread-safe, health-checked pool ----------
+class HealthCheckedPool:
+    """
+    Thread-safe replacement for psycopg2's SimpleConnectionPool.
+
+    - getconn() blocks up to `acquire_timeout` seconds for a free slot
+      instead of failing as soon as `maxconn` callers overlap.
+    - Connections idle longer than `ping_idle` are validated with SELECT 1
+      before being handed out; dead ones are replaced transparently.
+    - Connections older than `max_age` are closed and recycled.
+    - stats() reports usage counters for the metrics surface.
+    """
+
+    def __init__(
+        self,
+        minconn: int,
+        maxconn: int,
+        acquire_timeout: float = DB_POOL_TIMEOUT,
+        max_age: float = DB_POOL_MAX_AGE,
+        ping_idle: float = DB_POOL_PING_IDLE,
+        **connect_kwargs: Any,
+    ):
+        if maxconn < 1 or minconn > maxconn:
+            raise ValueError("invalid pool bounds: min=%s max=%s" % (minconn, maxconn))
+
+        self.minconn = minconn
+        self.maxconn = maxconn
+        self.acquire_timeout = acquire_timeout
+        self.max_age = max_age
+        self.ping_idle = ping_idle
+        self._connect_kwargs = connect_kwargs
+
+        self._cond = threading.Condition()
+        self._idle: Deque[Tuple[Any, float]] = deque()   # (conn, returned_at)
+        self._born: Dict[int, float] = {}                  # id(conn) -> created_at
+        self._total = 0
+        self._in_use = 0
+        self._waiting = 0
+        self._closed = False
+
+        self._acquired = 0
+        self._timeouts = 0
+        self._created = 0
+        self._discarded = 0
+        self._recycled = 0
+        self._ping_failures = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+        for _ in range(minconn):
+            conn = self._connect()
+            with self._cond:
+                self._total += 1
+                self._idle.append((conn, time.monotonic()))
+
+    # ----- internals -----
+    def _connect(self):
+        conn = psycopg2.connect(**self._connect_kwargs)
+        with self._cond:
+            self._born[id(conn)] = time.monotonic()
+            self._created += 1
+        return conn
+
+    def _discard(self, conn) -> None:
+        with self._cond:
+            self._born.pop(id(conn), None)
+            self._discarded += 1
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _is_expired(self, conn) -> bool:
+        if self.max_age <= 0:
+            return False
+        born = self._born.get(id(conn))
+        return born is not None and time.monotonic() - born > self.max_age
+
+    def _is_alive(self, conn, idle_for: float) -> bool:
+        if conn.closed:
+            return False
+        if idle_for < self.ping_idle:
+            return True
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+                cur.fetchone()
+            conn.rollback()
+            return True
+        except Exception as e:
+            LOG.warning("Discarding dead pooled connection: %s", e)
+            with self._cond:
+                self._ping_failures += 1
+            return False
+
+    # ----- public API -----
+    def getconn(self, timeout: Optional[float] = None):
+        timeout = self.acquire_timeout if timeout is None else timeout
+        started = time.monotonic()
+        deadline = started + timeout
+
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise pool.PoolError("connection pool is closed")
+                if self._idle:
+                    conn, returned_at = self._idle.pop()
+                    break
+                if self._total < self.maxconn:
+                    # reserve a slot; the actual connect happens outside the lock
+                    self._total += 1
+                    conn, returned_at = None, None
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._timeouts += 1
+                    raise pool.PoolError(
+                        "timed out after %.1fs waiting for a connection (max=%d)" % (timeout, self.maxconn)
+                    )
+                self._waiting += 1
+                try:
+                    self._cond.wait(remaining)
+                finally:
+                    self._waiting -= 1
+            self._in_use += 1
+
+        try:
+            if conn is not None and self._is_expired(conn):
+                self._discard(conn)
+                with self._cond:
+                    self._recycled += 1
+                conn = None
+            elif conn is not None and not self._is_alive(conn, time.monotonic() - returned_at):
+                self._discard(conn)
+                conn = None
+
+            if conn is None:
+                conn = self._connect()
+        except Exception:
+            # give the reserved slot back so waiters are not starved
+            with self._cond:
+                self._total -= 1
+                self._in_use -= 1
+                self._cond.notify()
+            raise
+
+        waited = time.monotonic() - started
+        with self._cond:
+            self._acquired += 1
+            self._wait_total += waited
+            if waited > self._wait_max:
+                self._wait_max = waited
+        return conn
+
+    def putconn(self, conn, close: bool = False) -> None:
+        if not close and not conn.closed:
+            try:
+                status = conn.info.transaction_status
+                if status != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+            except Exception:
+                close = True
+
+        if close or conn.closed or self._is_expired(conn) or self._closed:
+            recycled = not close and not conn.closed and self._is_expired(conn)
+            self._discard(conn)
+            with self._cond:
+                self._total -= 1
+                self._in_use -= 1
+                if recycled:
+                    self._recycled += 1
+                self._cond.notify()
+            return
+
+        with self._cond:
+            self._in_use -= 1
+            self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    def closeall(self) -> None:
+        with self._cond:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._total -= len(idle)
+            self._cond.notify_all()
+        for conn, _ in idle:
+            self._discard(conn)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "min": self.minconn,
+                "max": self.maxconn,
+                "total": self._total,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "waiting": self._waiting,
+                "acquired": self._acquired,
+                "timeouts": self._timeouts,
+                "created": self._created,
+                "discarded": self._discarded,
+                "recycled": self._recycled,
+                "ping_failures": self._ping_failures,
+                "wait_seconds_total": self._wait_total,
+                "wait_seconds_max": self._wait_max,
+            }
+
+
+_pool: Optional[HealthCheckedPool] = None
 
 
 def _safe_parse_dsn(dsn: Optional[str]) -> Optional[Tuple[str, int, str, Optional[str], Optional[str]]]:
@@ -117,7 +336,7 @@ def _ensure_ssl_in_dsn(dsn: Optional[str]) -> Optional[str]:
 
 def init_pool():
     """
-    Initialize a psycopg2 SimpleConnectionPool. Prefer FULL_DSN if provided and valid.
+    Initialize the HealthCheckedPool. Prefer FULL_DSN if provided and valid.
     Retries a few times on transient failure and logs clear reasons on failure.
     """
     global _pool
@@ -139,7 +358,7 @@ def init_pool():
                 if not dsn:
                     raise RuntimeError("DSN validation failed unexpectedly")
                 LOG.info("Creating Postgres pool using FULL_DSN (ssl enforced). Attempt %d", attempts + 1)
-                _pool = pool.SimpleConnectionPool(
+                _pool = HealthCheckedPool(
                     DB_MINCONN,
                     DB_MAXCONN,
                     dsn=dsn,
@@ -153,7 +372,7 @@ def init_pool():
                     DB_NAME,
                     attempts + 1,
                 )
-                _pool = pool.SimpleConnectionPool(
+                _pool = HealthCheckedPool(
                     DB_MINCONN,
                     DB_MAXCONN,
                     host=DB_HOST,
@@ -165,7 +384,10 @@ def init_pool():
                     cursor_factory=psycopg2.extras.RealDictCursor,
                 )
 
-            LOG.info("✅ Postgres connection pool created (min=%s max=%s)", DB_MINCONN, DB_MAXCONN)
+            LOG.info(
+                "✅ Postgres connection pool created (min=%s max=%s timeout=%ss max_age=%ss)",
+                DB_MINCONN, DB_MAXCONN, DB_POOL_TIMEOUT, DB_POOL_MAX_AGE,
+            )
             return _pool
 
         except OperationalError as e:
@@ -197,20 +419,33 @@ def get_connection():
     assert _pool is not None, "Postgres pool not initialized"
 
     conn = None
+    broken = False
     try:
         conn = _pool.getconn()
         yield conn
-    except OperationalError as e:
+    except (OperationalError, InterfaceError) as e:
+        # the server side is likely gone; never hand this connection out again
+        broken = True
         LOG.exception("DB operational error: %s", e)
         raise
     finally:
         if conn is not None:
             try:
-                _pool.putconn(conn)
+                _pool.putconn(conn, close=broken)
             except Exception:
                 LOG.exception("Failed to return connection to pool")
 
 
+def pool_stats() -> Dict[str, Any]:
+    """
+    Snapshot of pool usage (in use, idle, wait time, timeouts...) for metrics.
+    Returns an empty dict before the pool is initialized.
+    """
+    if _pool is None:
+        return {}
+    return _pool.stats()
+
+
 def test_connection() -> bool:
     """
     Helper used by tests to validate DB connectivity.
@@ -38,6 +38,69 @@ def get_user_balance_from_db(customer_id: int, account_id: Optional[int] = None)
     return float(rows[0]["total_balance"])
 
 
+# ---------- Dashboard summary ----------
+_SUMMARY_SQL = """
+    SELECT
+        u.customer_id, u.name, u.email, u.phone, u.address, u.dob, u.kyc_status,
+        COALESCE((
+            SELECT json_agg(a ORDER BY a.account_id)
+            FROM (
+                SELECT account_id, account_number, ifsc_code, branch_code,
+                       type, balance, status
+                FROM accounts
+                WHERE customer_id = u.customer_id
+            ) a
+        ), '[]'::json) AS accounts,
+        COALESCE((
+            SELECT json_agg(c ORDER BY c.card_id)
+            FROM (
+                SELECT card_id, card_type, last_4_digits,
+                       delivery_status, activated
+                FROM cards
+                WHERE customer_id = u.customer_id
+            ) c
+        ), '[]'::json) AS cards,
+        COALESCE((
+            SELECT json_agg(l ORDER BY l.loan_id)
+            FROM (
+                SELECT loan_id, loan_type, principal_amount,
+                       outstanding_balance, emi_due_date, status
+                FROM loans
+                WHERE customer_id = u.customer_id
+            ) l
+        ), '[]'::json) AS loans
+    FROM users u
+    WHERE u.customer_id = %s
+"""
+
+
+def get_user_summary(customer_id: int) -> Optional[Dict[str, Any]]:
+    """
+    Profile, accounts (with balances), total balance, cards and loans
+    in ONE query on ONE pooled connection. Returns None if the user is unknown.
+    """
+    with get_connection() as conn:
+        cur = conn.cursor()
+        cur.execute(_SUMMARY_SQL, (customer_id,))
+        row = _row_to_dict(cur, cur.fetchone())
+
+    if not row:
+        return None
+
+    accounts = row.pop("accounts") or []
+    cards = row.pop("cards") or []
+    loans = row.pop("loans") or []
+    total_balance = sum(float(a.get("balance") or 0) for a in accounts)
+
+    return {
+        "profile": row,
+        "accounts": accounts,
+        "total_balance": total_balance,
+        "cards": cards,
+        "loans": loans,
+    }
+
+
 # ---------- Transactions ----------
 def get_transactions_for_customer(customer_id: int, limit: int = 10) -> List[Dict[str, Any]]:
     q = """
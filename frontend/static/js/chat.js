@@ -114,6 +114,13 @@ class ChatManager {
         const message = chatInput ? chatInput.value.trim() : '';
         if (!message) return;
 
+        // the server shed the last request; honour its Retry-After before sending again
+        const waitMs = (this.retryAfterUntil || 0) - Date.now();
+        if (waitMs > 0) {
+            this.addMessage(`The server is busy. Please try again in ${Math.ceil(waitMs / 1000)} seconds.`, 'bot');
+            return;
+        }
+
         // show user message immediately
         this.addMessage(message, 'user');
         if (chatInput) chatInput.value = '';
@@ -141,45 +148,150 @@ class ChatManager {
                 headers["X-Session-Id"] = this.sessionId;
             }
 
-            const response = await fetch(API_ENDPOINTS.chat, {
+            // Prefer the SSE stream so each bot message shows up as soon as Rasa sends it;
+            // fall back to the plain JSON endpoint only if streaming is unavailable
+            // (never after the server accepted the message, or it would reach Rasa twice).
+            const streamed = await this.sendViaStream(payload, headers);
+            if (!streamed) await this.sendViaPost(payload, headers);
+        } catch (err) {
+            console.error("sendMessage error:", err);
+            this.hideTypingIndicator();
+            this.addMessage('Sorry, I encountered an error. Please try again.', 'bot');
+        }
+    }
+
+    // 503 from admission control: tell the user and hold further sends for Retry-After.
+    handleBusy(response) {
+        const seconds = parseInt(response.headers.get('Retry-After'), 10) || 2;
+        this.retryAfterUntil = Date.now() + seconds * 1000;
+        this.hideTypingIndicator();
+        this.addMessage(`The server is busy. Please try again in ${seconds} seconds.`, 'bot');
+    }
+
+    // Returns false only when the stream endpoint is unavailable (no streaming support,
+    // fetch failed, or 404/405) and the message was not sent; the caller then uses POST.
+    async sendViaStream(payload, headers) {
+        if (!window.ReadableStream || !window.TextDecoder) return false;
+
+        let response;
+        try {
+            response = await fetch(API_ENDPOINTS.chatStream || '/api/chat/stream', {
                 method: 'POST',
-                headers,
-                credentials: "include", // crucial so cookies are accepted and sent
+                headers: { ...headers, "Accept": "text/event-stream" },
+                credentials: "include",
                 body: JSON.stringify(payload)
             });
+        } catch (err) {
+            console.warn("Chat stream unavailable, falling back:", err);
+            return false;
+        }
+        if (response.status === 404 || response.status === 405) {
+            console.warn("Chat stream endpoint missing, falling back:", response.status);
+            return false;
+        }
+        if (response.status === 503) {
+            this.handleBusy(response);
+            return true;
+        }
+        if (!response.ok || !response.body) {
+            console.error("Chat stream rejected:", response.status);
+            this.hideTypingIndicator();
+            this.addMessage('Sorry, the server returned an error. Try again.', 'bot');
+            return true;
+        }
+
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        let shown = 0;
 
-            if (!response.ok) {
-                const text = await response.text().catch(()=>'');
-                console.error("Chat API error:", response.status, text);
+        const handleEvent = (event, data) => {
+            if (event === 'message' && data && data.text) {
                 this.hideTypingIndicator();
-                this.addMessage('Sorry, the server returned an error. Try again.', 'bot');
-                return;
+                this.addMessage(data.text, 'bot');
+                shown++;
+            } else if (event === 'done') {
+                if (data && data.lang && data.lang !== currentLanguage) updateLanguage(data.lang);
+            } else if (event === 'error') {
+                throw new Error((data && data.detail) || 'stream error');
             }
+        };
 
-            const data = await response.json();
-            this.hideTypingIndicator();
-
-            // Persist authoritative server session_id if provided
-            if (data && data.session_id) {
-                if (!this.sessionId || this.sessionId !== data.session_id) {
-                    this.sessionId = data.session_id;
-                    sessionStorage.setItem('sessionId', this.sessionId);
-                    window.sessionId = this.sessionId;
-                    const el = document.getElementById('sessionId');
-                    if (el) el.textContent = `Session: ${this.sessionId.substring(0,8)}...`;
-                    console.debug("[CHAT] session persisted from server:", this.sessionId);
+        try {
+            while (true) {
+                const { value, done } = await reader.read();
+                if (done) break;
+                buffer += decoder.decode(value, { stream: true });
+
+                // SSE frames are separated by a blank line
+                let sep;
+                while ((sep = buffer.indexOf('\n\n')) !== -1) {
+                    const frame = buffer.slice(0, sep);
+                    buffer = buffer.slice(sep + 2);
+                    let event = 'message';
+                    let data = '';
+                    frame.split('\n').forEach(line => {
+                        if (line.startsWith('event:')) event = line.slice(6).trim();
+                        else if (line.startsWith('data:')) data += line.slice(5).trim();
+                    });
+                    handleEvent(event, data ? JSON.parse(data) : null);
                 }
             }
-
-            // Show bot response
-            this.addMessage(data.bot_response || "I couldn't process that right now.", 'bot');
-
-            if (data && data.lang && data.lang !== currentLanguage) updateLanguage(data.lang);
         } catch (err) {
-            console.error("sendMessage error:", err);
+            // the message was accepted: report the failure, do not resend it
+            console.error("Chat stream error:", err);
             this.hideTypingIndicator();
             this.addMessage('Sorry, I encountered an error. Please try again.', 'bot');
+            return true;
         }
+
+        this.hideTypingIndicator();
+        if (shown === 0) this.addMessage("I couldn't process that right now.", 'bot');
+        return true;
+    }
+
+    async sendViaPost(payload, headers) {
+        const response = await fetch(API_ENDPOINTS.chat, {
+            method: 'POST',
+            headers,
+            credentials: "include", // crucial so cookies are accepted and sent
+            body: JSON.stringify(payload)
+        });
+
+        if (response.status === 503) {
+            this.handleBusy(response);
+            return;
+        }
+        if (!response.ok) {
+            const text = await response.text().catch(()=>'');
+            console.error("Chat API error:", response.status, text);
+            this.hideTypingIndicator();
+            this.addMessage('Sorry, the server returned an error. Try again.', 'bot');
+            return;
+        }
+
+        const data = await response.json();
+        this.hideTypingIndicator();
+
+        // Persist authoritative server session_id if provided
+        if (data && data.session_id) {
+            if (!this.sessionId || this.sessionId !== data.session_id) {
+                this.sessionId = data.session_id;
+                sessionStorage.setItem('sessionId', this.sessionId);
+                window.sessionId = this.sessionId;
+                const el = document.getElementById('sessionId');
+                if (el) el.textContent = `Session: ${this.sessionId.substring(0,8)}...`;
+                console.debug("[CHAT] session persisted from server:", this.sessionId);
+            }
+        }
+
+        // Show bot response(s)
+        const messages = (data && data.bot_messages && data.bot_messages.length)
+            ? data.bot_messages
+            : [data.bot_response || "I couldn't process that right now."];
+        messages.forEach(text => this.addMessage(text, 'bot'));
+
+        if (data && data.lang && data.lang !== currentLanguage) updateLanguage(data.lang);
     }
 
     addMessage(text, sender) {
@@ -7,100 +7,98 @@ document.addEventListener('DOMContentLoaded', async () => {
         return;
     }
 
-    // Load user data
-    await loadUserProfile();
-    await loadAccounts();
-    await loadBalance();
-    await loadLoans();
+    // Load everything the dashboard needs in one round trip
+    await loadDashboardSummary();
 });
 
-async function loadUserProfile() {
+async function loadDashboardSummary() {
     try {
-        const response = await fetch(API_ENDPOINTS.userProfile, {
+        const response = await fetch(API_ENDPOINTS.userSummary || '/api/user/summary', {
             headers: getAuthHeaders()
         });
 
-        if (response.ok) {
-            const data = await response.json();
-            const userNameEl = document.getElementById('userName');
-            if (userNameEl && data.name) {
-                userNameEl.textContent = data.name;
-            }
-            if (data.customer_id) {
-                customerId = data.customer_id.toString();
-                localStorage.setItem('customerId', customerId);
-            }
+        if (!response.ok) {
+            renderAccounts(null);
+            renderBalance(null);
+            renderLoans([]);
+            return;
         }
+
+        const data = await response.json();
+        renderProfile(data.profile || {});
+        renderAccounts(data.accounts || []);
+        renderBalance(data.total_balance || 0);
+        renderLoans(data.loans || []);
     } catch (error) {
-        console.error('Failed to load user profile:', error);
+        console.error('Failed to load dashboard summary:', error);
+        renderAccounts(null);
+        renderBalance(null);
+        renderLoans([]);
+    }
+}
+
+function renderProfile(profile) {
+    const userNameEl = document.getElementById('userName');
+    if (userNameEl && profile.name) {
+        userNameEl.textContent = profile.name;
+    }
+    if (profile.customer_id) {
+        customerId = profile.customer_id.toString();
+        localStorage.setItem('customerId', customerId);
     }
 }
 
-async function loadAccounts() {
+function renderAccounts(accounts) {
     const accountsList = document.getElementById('accountsList');
     if (!accountsList) return;
 
-    try {
-        const response = await fetch(API_ENDPOINTS.userAccounts, {
-            headers: getAuthHeaders()
-        });
+    if (accounts === null) {
+        accountsList.innerHTML = '<p class="empty-state">Failed to load accounts</p>';
+        return;
+    }
 
-        if (response.ok) {
-            const data = await response.json();
-            const accounts = data.accounts || [];
-
-            if (accounts.length === 0) {
-                accountsList.innerHTML = '<p class="empty-state">No accounts found</p>';
-                return;
-            }
-
-            accountsList.innerHTML = accounts.map(account => `
-                <div class="account-item">
-                    <div class="account-info">
-                        <div class="account-number">${maskAccountNumber(account.account_number || 'N/A')}</div>
-                        <div class="account-type">${account.type || 'Account'}</div>
-                    </div>
-                    <div class="account-balance">₹${formatCurrency(account.balance || 0)}</div>
-                </div>
-            `).join('');
-        } else {
-            accountsList.innerHTML = '<p class="empty-state">Failed to load accounts</p>';
-        }
-    } catch (error) {
-        console.error('Failed to load accounts:', error);
-        accountsList.innerHTML = '<p class="empty-state">Error loading accounts</p>';
+    if (accounts.length === 0) {
+        accountsList.innerHTML = '<p class="empty-state">No accounts found</p>';
+        return;
     }
+
+    accountsList.innerHTML = accounts.map(account => `
+        <div class="account-item">
+            <div class="account-info">
+                <div class="account-number">${maskAccountNumber(account.account_number || 'N/A')}</div>
+                <div class="account-type">${account.type || 'Account'}</div>
+            </div>
+            <div class="account-balance">₹${formatCurrency(account.balance || 0)}</div>
+        </div>
+    `).join('');
 }
 
-async function loadBalance() {
+function renderBalance(balance) {
     const totalBalanceEl = document.getElementById('totalBalance');
     if (!totalBalanceEl) return;
 
-    try {
-        const response = await fetch(API_ENDPOINTS.userBalance, {
-            headers: getAuthHeaders()
-        });
-
-        if (response.ok) {
-            const data = await response.json();
-            const balance = data.balance || 0;
-            totalBalanceEl.innerHTML = `₹${formatCurrency(balance)}`;
-        } else {
-            totalBalanceEl.innerHTML = '₹0.00';
-        }
-    } catch (error) {
-        console.error('Failed to load balance:', error);
-        totalBalanceEl.innerHTML = '₹0.00';
-    }
+    totalBalanceEl.innerHTML = balance === null ? '₹0.00' : `₹${formatCurrency(balance)}`;
 }
 
-async function loadLoans() {
+function renderLoans(loans) {
     const loansList = document.getElementById('loansList');
     if (!loansList) return;
 
-    // This would typically call a loans API endpoint
-    // For now, show empty state
-    loansList.innerHTML = '<p class="empty-state">No active loans</p>';
+    const active = loans.filter(loan => (loan.status || '').toLowerCase() !== 'closed');
+    if (active.length === 0) {
+        loansList.innerHTML = '<p class="empty-state">No active loans</p>';
+        return;
+    }
+
+    loansList.innerHTML = active.map(loan => `
+        <div class="account-item">
+            <div class="account-info">
+                <div class="account-number">${loan.loan_type || 'Loan'}</div>
+                <div class="account-type">EMI due: ${loan.emi_due_date || 'N/A'}</div>
+            </div>
+            <div class="account-balance">₹${formatCurrency(loan.outstanding_balance || 0)}</div>
+        </div>
+    `).join('');
 }
 
 function maskAccountNumber(accountNumber) {
@@ -1,109 +1,530 @@
-import torch
-from transformers import AutoTokenizer, AutoModelForSequenceClassification
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
+import os
+import re
+import time
+import asyncio
 import logging
+import threading
 
-logger = logging.getLogger(__name__)
+from intelligence.Sentiment_Analysis.batching import SentimentBatcher
+from intelligence.Sentiment_Analysis.cache import SentimentCache
+from intelligence.Sentiment_Analysis.sidecar import SENTIMENT_SIDECAR_SOCKET, SidecarClient, request_blocking
+from intelligence.resource_governor import get_resource_governor
 
+# torch / transformers / onnxruntime are imported where the model is actually
+# used, so API workers that talk to the shared sidecar never pay for them.
 
-class SentimentAnalyzer:
-    def __init__(self, model_path: Optional[Path] = None):
-        self.model = None
-        self.tokenizer = None
-        self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+logger = logging.getLogger(__name__)
 
-        if model_path is None:
-            base_dir = Path(__file__).parent
-            model_path = base_dir / "model" / "distilbert_sentiment" / "checkpoint-1168"
+DEFAULT_MODEL_PATH = Path(__file__).parent / "model" / "distilbert_sentiment" / "checkpoint-1168"
 
-        self.model_path = model_path
-        self._load_model()
+# "torch" (eager PyTorch) or "onnx" (exported graph, int8 by default, CPU)
+SENTIMENT_BACKEND = os.getenv("SENTIMENT_BACKEND", "torch").lower()
+SENTIMENT_ONNX_PATH = os.getenv("SENTIMENT_ONNX_PATH", "")
+SENTIMENT_ONNX_THREADS = int(os.getenv("SENTIMENT_ONNX_THREADS", 0))   # 0 = resource governor budget
+# Load the model on a background thread; requests use the lexicon fallback until ready
+SENTIMENT_BACKGROUND_LOAD = os.getenv("SENTIMENT_BACKGROUND_LOAD", "true").lower() in ("1", "true", "yes")
+# Lexicon tier answers clear-cut messages itself; only ambiguous ones reach the model
+SENTIMENT_CASCADE = os.getenv("SENTIMENT_CASCADE", "true").lower() in ("1", "true", "yes")
+SENTIMENT_LEXICON_MAX_TOKENS = int(os.getenv("SENTIMENT_LEXICON_MAX_TOKENS", 20))
+SENTIMENT_LEXICON_NEUTRAL_MAX_TOKENS = int(os.getenv("SENTIMENT_LEXICON_NEUTRAL_MAX_TOKENS", 5))
+MAX_LENGTH = 256
+LABELS = ["negative", "neutral", "positive"]   # LabelEncoder order used in training
 
-    def _load_model(self):
-        try:
-            if not self.model_path.exists():
-                logger.warning("Sentiment model not found, using rule-based fallback.")
-                return
 
-            self.tokenizer = AutoTokenizer.from_pretrained(str(self.model_path))
-            self.model = AutoModelForSequenceClassification.from_pretrained(str(self.model_path))
-            self.model.to(self.device)
-            self.model.eval()
-            logger.info("✅ Sentiment model loaded successfully")
-        except Exception as e:
-            logger.exception("❌ Failed to load sentiment model, fallback enabled")
-            self.model = None
-            self.tokenizer = None
+def default_onnx_path(model_path: Path, quantized: bool = True) -> Path:
+    return model_path / "onnx" / ("model.int8.onnx" if quantized else "model.onnx")
 
 
-    def analyze(self, text: str) -> Dict[str, Any]:
-        return self._analyze_internal(text)
+# =================================================
+# Lexicon tier
+# =================================================
+# "issue" alone is mostly neutral in banking ("issue a cheque book", "card
+# issued"); it only counts in a complaint phrase
+NEGATIVE_TERMS = (
+    "angry", "frustrated", "frustrating", "worst", "bad", "poor", "hate", "problem",
+    "have an issue", "having an issue", "having issues", "facing an issue", "facing issue",
+    "facing issues", "error", "failed", "failing", "broken", "not working", "doesn't work", "delay",
+    "delayed", "complaint", "terrible", "awful", "useless", "ridiculous",
+    "disappointed", "unacceptable", "fraud", "scam", "stolen", "charged twice",
+    "still waiting", "not received", "never received",
+)
+POSITIVE_TERMS = (
+    "thanks", "thank", "thank you", "good", "great", "excellent", "happy", "love",
+    "awesome", "perfect", "helpful", "appreciate", "resolved", "works now",
+)
+NEGATORS = (
+    "not", "no", "never", "don't", "dont", "doesn't", "didn't", "isn't", "wasn't",
+    "can't", "cannot", "hardly", "without",
+)
+CONTRAST = ("but", "however", "although", "though", "yet")
+NEGATION_WINDOW = 3   # tokens before a term that a negator still applies to
 
-    def _analyze_internal(self, text: str) -> Dict[str, Any]:
-        if not text or not text.strip():
-            return self._neutral()
 
-        if self.model and self.tokenizer:
-            try:
-                inputs = self.tokenizer(
-                    text,
-                    return_tensors="pt",
-                    truncation=True,
-                    max_length=256,
-                    padding=True,
-                ).to(self.device)
-
-                with torch.no_grad():
-                    outputs = self.model(**inputs)
-                    probs = torch.softmax(outputs.logits, dim=-1)
-                    idx = int(torch.argmax(probs, dim=-1))
-                    score = float(probs[0][idx])
-
-                labels = ["negative", "neutral", "positive"]
-                label = labels[idx] if idx < len(labels) else "neutral"
-
-                return {
-                    "label": label,
-                    "score": score,
-                    "is_negative": label == "negative",
-                    "is_frustrated": label == "negative" and score > 0.7,
-                }
-            except Exception:
-                logger.exception("Model inference failed, using fallback")
+def _alternation(words) -> str:
+    # longest first so "not working" wins over "not", "thank you" over "thank"
+    return "|".join(re.escape(w) for w in sorted(set(words), key=len, reverse=True))
 
-        return self._fallback_sentiment(text)
 
-    def _fallback_sentiment(self, text: str) -> Dict[str, Any]:
-        text = text.lower()
+class Lexicon:
+    """
+    Single-pass keyword scorer: one compiled regex finds terms, negators and
+    contrast words with word boundaries. classify() says whether the
+    message is clear-cut enough to skip the model.
+    """
+
+    def __init__(self, negative=NEGATIVE_TERMS, positive=POSITIVE_TERMS):
+        self.polarity = {w: -1 for w in negative}
+        self.polarity.update({w: 1 for w in positive})
+        self.pattern = re.compile(
+            r"\b(?:(?P<term>%s)|(?P<neg>%s)|(?P<contrast>%s))\b|(?P<word>[\w']+)|(?P<stop>[.,;:!?])"
+            % (_alternation(self.polarity), _alternation(NEGATORS), _alternation(CONTRAST))
+        )
 
-        negative = [
-            "angry", "frustrated", "worst", "hate", "problem", "issue",
-            "error", "failed", "broken", "not working", "delay", "complaint"
-        ]
-        positive = [
-            "thanks", "thank", "good", "great", "excellent", "happy", "love"
-        ]
+    def score(self, text: str) -> Tuple[int, int, bool]:
+        """
+        Returns (negative hits, positive hits, ambiguous).
+        """
+        neg = pos = 0
+        ambiguous = False
+        negated = False
+        tokens = 0
+        last_negator: Optional[int] = None
+        for m in self.pattern.finditer(text.lower()):
+            kind = m.lastgroup
+            if kind == "stop":
+                last_negator = None           # negation does not cross punctuation
+                continue
+            tokens += 1
+            if kind == "word":
+                continue
+            if kind == "neg":
+                last_negator = tokens
+                negated = True
+            elif kind == "contrast":
+                ambiguous = True
+            else:
+                polarity = self.polarity[m.group("term")]
+                if last_negator is not None and tokens - last_negator <= NEGATION_WINDOW:
+                    last_negator = None       # a negator flips one term only
+                    if polarity > 0:
+                        neg += 1              # "not happy", "not good"
+                    else:
+                        ambiguous = True      # "no problem" is not clearly positive
+                    continue
+                if polarity < 0:
+                    neg += 1
+                else:
+                    pos += 1
 
-        neg = sum(1 for w in negative if w in text)
-        pos = sum(1 for w in positive if w in text)
+        if tokens > SENTIMENT_LEXICON_MAX_TOKENS or (neg and pos):
+            ambiguous = True
+        if not neg and not pos and (negated or tokens > SENTIMENT_LEXICON_NEUTRAL_MAX_TOKENS):
+            ambiguous = True                  # no cue (or "not bad"): let the model read it
+        return neg, pos, ambiguous
 
+    def classify(self, text: str) -> Tuple[Dict[str, Any], bool]:
+        neg, pos, ambiguous = self.score(text)
         if neg > pos:
-            return {
+            result = {
                 "label": "negative",
                 "score": min(0.9, 0.5 + neg * 0.1),
                 "is_negative": True,
                 "is_frustrated": neg >= 2,
             }
-        if pos > neg:
-            return {
+        elif pos > neg:
+            result = {
                 "label": "positive",
                 "score": min(0.9, 0.5 + pos * 0.1),
                 "is_negative": False,
                 "is_frustrated": False,
             }
+        else:
+            result = {
+                "label": "neutral",
+                "score": 0.5,
+                "is_negative": False,
+                "is_frustrated": False,
+            }
+        return result, not ambiguous
+
+
+# =================================================
+# Inference backends: texts -> [(label index, probability)]
+# =================================================
+class TorchBackend:
+    name = "torch"
+
+    def __init__(self, model_path: Path, device: Optional[str] = None):
+        governor = get_resource_governor()   # thread env before torch is imported
+        import torch
+        from transformers import AutoTokenizer, AutoModelForSequenceClassification
+
+        governor.configure_torch(torch)
+        self._torch = torch
+        self.device = torch.device(device or ("cuda" if torch.cuda.is_available() else "cpu"))
+        self.tokenizer = AutoTokenizer.from_pretrained(str(model_path))
+        self.model = AutoModelForSequenceClassification.from_pretrained(str(model_path))
+        self.model.to(self.device)
+        self.model.eval()
+
+    def predict(self, texts: List[str]) -> List[Tuple[int, float]]:
+        torch = self._torch
+        # pad to the longest text in this batch, not to max_length
+        inputs = self.tokenizer(
+            texts,
+            return_tensors="pt",
+            truncation=True,
+            max_length=MAX_LENGTH,
+            padding="longest",
+        ).to(self.device)
+
+        with torch.inference_mode():
+            outputs = self.model(**inputs)
+            probs = torch.softmax(outputs.logits, dim=-1)
+            scores, idxs = torch.max(probs, dim=-1)
+        return list(zip(idxs.tolist(), scores.tolist()))
+
+
+class OnnxBackend:
+    """
+    ONNX Runtime on CPU. Build the graph with
+    `python -m intelligence.Sentiment_Analysis.export_onnx export`.
+    """
+
+    name = "onnx"
+
+    def __init__(self, model_path: Path, onnx_path: Optional[Path] = None, threads: int = SENTIMENT_ONNX_THREADS):
+        governor = get_resource_governor()
+        import numpy as np
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+
+        onnx_path = onnx_path or default_onnx_path(model_path)
+        if not Path(onnx_path).exists():
+            raise FileNotFoundError(f"ONNX sentiment model not found: {onnx_path}")
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        governor.configure_onnx(options, threads)
+
+        self._np = np
+        self.onnx_path = Path(onnx_path)
+        self.tokenizer = AutoTokenizer.from_pretrained(str(model_path))
+        self.session = ort.InferenceSession(str(onnx_path), options, providers=["CPUExecutionProvider"])
+        self.input_names = [i.name for i in self.session.get_inputs()]
+
+    def predict(self, texts: List[str]) -> List[Tuple[int, float]]:
+        np = self._np
+        enc = self.tokenizer(
+            texts,
+            return_tensors="np",
+            truncation=True,
+            max_length=MAX_LENGTH,
+            padding="longest",
+        )
+        feed = {name: enc[name].astype(np.int64) for name in self.input_names}
+        logits = self.session.run(None, feed)[0]
+        logits = logits - logits.max(axis=-1, keepdims=True)
+        probs = np.exp(logits)
+        probs /= probs.sum(axis=-1, keepdims=True)
+        idxs = probs.argmax(axis=-1)
+        return [(int(i), float(probs[row, i])) for row, i in enumerate(idxs)]
+
+
+BACKENDS = {
+    TorchBackend.name: TorchBackend,
+    OnnxBackend.name: OnnxBackend,
+}
+
+
+def load_backend(name: str, model_path: Path = DEFAULT_MODEL_PATH, **kwargs):
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown SENTIMENT_BACKEND {name!r}; expected one of {sorted(BACKENDS)}")
+    if name == OnnxBackend.name and SENTIMENT_ONNX_PATH and "onnx_path" not in kwargs:
+        kwargs["onnx_path"] = Path(SENTIMENT_ONNX_PATH)
+    return BACKENDS[name](model_path, **kwargs)
+
+
+class SentimentAnalyzer:
+    def __init__(
+        self,
+        model_path: Optional[Path] = None,
+        sidecar_socket: Optional[str] = None,
+        backend: Optional[str] = None,
+        cascade: bool = SENTIMENT_CASCADE,
+        defer_load: bool = False,
+        cache: Optional[SentimentCache] = None,
+    ):
+        self.model_path = model_path or DEFAULT_MODEL_PATH
+        self.backend_name = (backend or SENTIMENT_BACKEND).lower()
+        self.engine = None
+        self.sidecar_socket = sidecar_socket
+        self.sidecar_fallbacks = 0
+        self.lexicon = Lexicon()
+        self.cascade = cascade
+        self.tier_counts = {"lexicon": 0, "model": 0, "fallback": 0}
+        self.cache = cache if cache is not None else SentimentCache()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.coalesced = 0
+        self.model_state = "not_loaded"
+        self.load_seconds: Optional[float] = None
+        self._loaded = threading.Event()
+        self._load_lock = threading.Lock()
+        self._batcher: Optional[SentimentBatcher] = None
+        self._sidecar: Optional[SidecarClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        if sidecar_socket:
+            logger.info("Sentiment served by sidecar at %s", sidecar_socket)
+            self.model_state = "remote"
+            self._loaded.set()
+        elif not defer_load:
+            self._load_model()
 
-        return self._neutral()
+    # ----- model lifecycle -----
+    def _load_model(self):
+        with self._load_lock:
+            if self._loaded.is_set():
+                return
+            self.model_state = "loading"
+            start = time.perf_counter()
+            try:
+                if not self.model_path.exists():
+                    logger.warning("Sentiment model not found, using rule-based fallback.")
+                    self.model_state = "unavailable"
+                    return
+
+                self.engine = load_backend(self.backend_name, self.model_path)
+                self.model_state = "ready"
+                logger.info("✅ Sentiment model loaded successfully (backend=%s)", self.backend_name)
+            except Exception as e:
+                logger.exception("❌ Failed to load sentiment model, fallback enabled")
+                self.engine = None
+                self.model_state = "failed"
+            finally:
+                self.load_seconds = time.perf_counter() - start
+                self._loaded.set()
+
+    def start_loading(self) -> None:
+        """
+        Load the model on a daemon thread. Until it is ready, analyze() uses
+        the lexicon fallback. Safe to call more than once.
+        """
+        if self.model_state != "not_loaded":
+            return
+        self.model_state = "loading"
+        threading.Thread(target=self._load_model, name="sentiment-model-load", daemon=True).start()
+
+    def is_ready(self) -> bool:
+        """
+        True once the model (or the sidecar) is serving predictions.
+        """
+        return self.model_state in ("ready", "remote")
+
+    def wait_loaded(self, timeout: Optional[float] = None) -> bool:
+        return self._loaded.wait(timeout)
+
+    def _lexicon_tier(self, text: str) -> Optional[Dict[str, Any]]:
+        if self.model_state == "not_loaded":
+            self.start_loading()
+        if not self.cascade:
+            return None
+        result, confident = self.lexicon.classify(text)
+        if confident:
+            self.tier_counts["lexicon"] += 1
+            return result
+        return None
+
+    def analyze(self, text: str) -> Dict[str, Any]:
+        if not text or not text.strip():
+            return self._neutral()
+        quick = self._lexicon_tier(text)
+        if quick is not None:
+            return quick
+        key = self.cache.key(text)
+        if key is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+        if self.sidecar_socket:
+            try:
+                result, from_model = request_blocking(self.sidecar_socket, text)
+            except (OSError, ValueError):
+                self.sidecar_fallbacks += 1
+                self.tier_counts["fallback"] += 1
+                return self._fallback_sentiment(text)
+            if not from_model:
+                self.tier_counts["fallback"] += 1
+                return result
+        elif self.engine is not None:
+            result, from_model = self._analyze_batch([text])[0]
+            if not from_model:
+                self.tier_counts["fallback"] += 1
+                return result
+        else:
+            self.tier_counts["fallback"] += 1
+            return self._fallback_sentiment(text)
+        self.tier_counts["model"] += 1
+        if key is not None:
+            self.cache.put(key, result)
+        return result
+
+    async def analyze_async(self, text: str) -> Dict[str, Any]:
+        """
+        Event-loop friendly analyze(): clear-cut messages are answered by the
+        lexicon tier and repeats by the result cache; the rest are
+        micro-batched into one forward pass off the loop thread (here or in
+        the sidecar).
+        """
+        if not text or not text.strip():
+            return self._neutral()
+        quick = self._lexicon_tier(text)
+        if quick is not None:
+            return quick
+        key = self.cache.key(text)
+        if key is None:
+            return (await self._model_async(text))[0]
+
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        # identical messages arriving together share one model call
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.coalesced += 1
+            try:
+                return dict(await asyncio.shield(pending))
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise
+            return (await self._model_async(text))[0]
+
+        fut = asyncio.get_running_loop().create_future()
+        self._inflight[key] = fut
+        try:
+            result, from_model = await self._model_async(text)
+            fut.set_result(dict(result))
+            if from_model:
+                self.cache.put(key, result)
+            return result
+        except asyncio.CancelledError:
+            fut.cancel()
+            raise
+        except Exception as e:
+            fut.set_exception(e)
+            fut.exception()   # retrieved: followers re-raise it, if there are any
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _model_async(self, text: str) -> Tuple[Dict[str, Any], bool]:
+        """
+        Model (or sidecar) result for `text`, and whether it really came from
+        the model rather than the rule fallback.
+        """
+        if self.sidecar_socket:
+            try:
+                result, from_model = await self._get_sidecar().analyze(text)
+            except (OSError, ValueError, asyncio.TimeoutError):
+                # slow or missing sidecar must not stall the chat path
+                self.sidecar_fallbacks += 1
+                self.tier_counts["fallback"] += 1
+                return self._fallback_sentiment(text), False
+        elif self.engine is None:
+            self.tier_counts["fallback"] += 1
+            return self._fallback_sentiment(text), False
+        else:
+            result, from_model = await self._get_batcher().submit(text)
+        self.tier_counts["model" if from_model else "fallback"] += 1
+        return result, from_model
+
+    def _bind_loop(self) -> None:
+        # batcher / sidecar connection belong to one event loop
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._release_loop_state()
+            self._loop = loop
+
+    def _release_loop_state(self) -> None:
+        # close them on their own loop if it still runs (in another thread);
+        # otherwise free what outlives a stopped loop (thread, socket)
+        old_loop = self._loop
+        for resource in (self._batcher, self._sidecar):
+            if resource is None:
+                continue
+            if old_loop is not None and old_loop.is_running():
+                asyncio.run_coroutine_threadsafe(resource.close(), old_loop)
+            else:
+                resource.close_nowait()
+        self._batcher = None
+        self._sidecar = None
+
+    def _get_batcher(self) -> SentimentBatcher:
+        self._bind_loop()
+        if self._batcher is None:
+            self._batcher = SentimentBatcher(self._analyze_batch)
+        return self._batcher
+
+    def _get_sidecar(self) -> SidecarClient:
+        self._bind_loop()
+        if self._sidecar is None:
+            self._sidecar = SidecarClient(self.sidecar_socket)
+        return self._sidecar
+
+    async def aclose(self) -> None:
+        if self._batcher is not None:
+            await self._batcher.close()
+            self._batcher = None
+        if self._sidecar is not None:
+            await self._sidecar.close()
+            self._sidecar = None
+
+    def stats(self) -> Dict[str, Any]:
+        if self.sidecar_socket:
+            stats = self._sidecar.stats() if self._sidecar is not None else {}
+            stats = {**stats, "sidecar_fallbacks": self.sidecar_fallbacks}
+        else:
+            stats = self._batcher.stats() if self._batcher is not None else {}
+        total = sum(self.tier_counts.values())
+        stats["model_ready"] = int(self.is_ready())
+        stats.update(self.cache.stats())
+        stats["cache_coalesced"] = self.coalesced
+        stats.update({f"tier_{tier}": n for tier, n in self.tier_counts.items()})
+        stats["lexicon_hit_ratio"] = round(self.tier_counts["lexicon"] / total, 4) if total else 0.0
+        return stats
+
+    def _analyze_internal(self, text: str) -> Dict[str, Any]:
+        if not text or not text.strip():
+            return self._neutral()
+        return self._analyze_batch([text])[0][0]
+
+    def _analyze_batch(self, texts: List[str]) -> List[Tuple[Dict[str, Any], bool]]:
+        """
+        (result, from_model) per text. from_model is False when inference
+        failed and the rule fallback answered; callers must not cache those.
+        """
+        if self.engine is not None:
+            try:
+                return [(self._result(idx, score), True) for idx, score in self.engine.predict(texts)]
+            except Exception:
+                logger.exception("Model inference failed, using fallback")
+
+        return [(self._fallback_sentiment(t), False) for t in texts]
+
+    def _result(self, idx: int, score: float) -> Dict[str, Any]:
+        label = LABELS[idx] if idx < len(LABELS) else "neutral"
+
+        return {
+            "label": label,
+            "score": score,
+            "is_negative": label == "negative",
+            "is_frustrated": label == "negative" and score > 0.7,
+        }
+
+    def _fallback_sentiment(self, text: str) -> Dict[str, Any]:
+        return self.lexicon.classify(text)[0]
 
     def _neutral(self) -> Dict[str, Any]:
         return {
@@ -123,5 +544,8 @@ _sentiment_analyzer: Optional[SentimentAnalyzer] = None
 def get_sentiment_analyzer() -> SentimentAnalyzer:
     global _sentiment_analyzer
     if _sentiment_analyzer is None:
-        _sentiment_analyzer = SentimentAnalyzer()
+        _sentiment_analyzer = SentimentAnalyzer(
+            sidecar_socket=SENTIMENT_SIDECAR_SOCKET or None,
+            defer_load=SENTIMENT_BACKGROUND_LOAD,
+        )
     return _sentiment_analyzer
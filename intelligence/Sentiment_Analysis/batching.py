@@ -0,0 +1,122 @@
+# intelligence/Sentiment_Analysis/batching.py
+# Dynamic (micro-)batching for sentiment inference.
+#
+# Concurrent callers submit one text each; a collector task gathers them for
+# up to SENTIMENT_BATCH_WAIT_MS or SENTIMENT_MAX_BATCH texts, runs ONE padded
+# forward pass on a dedicated inference thread and resolves every caller's
+# future. While a batch is on the thread, new texts queue up for the next one,
+# so under load batches fill without any extra waiting. SENTIMENT_BATCH_WAIT_MS=0
+# batches only what queued during the previous pass (no added latency at
+# low concurrency).
+
+import os
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+LOG = logging.getLogger(__name__)
+
+SENTIMENT_MAX_BATCH = int(os.getenv("SENTIMENT_MAX_BATCH", 32))
+SENTIMENT_BATCH_WAIT_MS = float(os.getenv("SENTIMENT_BATCH_WAIT_MS", 2))
+
+BatchFn = Callable[[List[str]], List[Any]]
+
+
+class SentimentBatcher:
+    """
+    Async front-end for a `texts -> results` batch function.
+    Bound to the event loop it was first used on (one per worker).
+    """
+
+    def __init__(
+        self,
+        batch_fn: BatchFn,
+        max_batch: int = SENTIMENT_MAX_BATCH,
+        max_wait_ms: float = SENTIMENT_BATCH_WAIT_MS,
+    ):
+        self.batch_fn = batch_fn
+        self.max_batch = max(1, max_batch)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self._queue: "asyncio.Queue[Tuple[str, asyncio.Future]]" = asyncio.Queue()
+        # torch already parallelises inside a forward pass; one thread keeps
+        # batches from competing with each other for cores
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sentiment")
+        self._task: Optional[asyncio.Task] = None
+        self.batches = 0
+        self.items = 0
+        self.max_seen = 0
+
+    async def submit(self, text: str) -> Any:
+        if self._task is None:
+            self._task = asyncio.create_task(self._collect())
+        fut = asyncio.get_running_loop().create_future()
+        await self._queue.put((text, fut))
+        return await fut
+
+    async def _next_batch(self) -> List[Tuple[str, asyncio.Future]]:
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.max_wait
+        while len(batch) < self.max_batch:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _collect(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._next_batch()
+            # callers that went away (client disconnect) are not scored
+            batch = [(text, fut) for text, fut in batch if not fut.done()]
+            if not batch:
+                continue
+
+            self.batches += 1
+            self.items += len(batch)
+            self.max_seen = max(self.max_seen, len(batch))
+            try:
+                results = await loop.run_in_executor(self._executor, self.batch_fn, [t for t, _ in batch])
+            except Exception as e:
+                for _, fut in batch:
+                    if not fut.done():
+                        fut.set_exception(e)
+                continue
+            for (_, fut), result in zip(batch, results):
+                if not fut.done():
+                    fut.set_result(result)
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        while not self._queue.empty():
+            _, fut = self._queue.get_nowait()
+            fut.cancel()
+        self._executor.shutdown(wait=False)
+
+    def close_nowait(self) -> None:
+        """
+        close() for when the owning event loop has stopped: release the
+        inference thread. Queued callers went away with the loop.
+        """
+        self._task = None
+        self._executor.shutdown(wait=False)
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "avg_batch": round(self.items / self.batches, 2) if self.batches else 0.0,
+            "max_batch_seen": self.max_seen,
+            "queued": self._queue.qsize(),
+        }
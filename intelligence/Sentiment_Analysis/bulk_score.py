@@ -0,0 +1,163 @@
+# intelligence/Sentiment_Analysis/bulk_score.py
+# Offline sentiment scoring of the whole chat_history table into
+# chat_sentiment, for trend analysis.
+#
+#   reader    one server-side cursor, --page rows at a time, chat_id order
+#   scorers   --workers processes, each with its own model; a page is scored
+#             with the lexicon tier first, the rest in length-sorted padded
+#             batches of --batch-size
+#   writer    execute_values upsert + checkpoint in one transaction per page,
+#             pages written strictly in chat_id order
+#
+# At most 2 x --workers pages are in flight, so memory stays bounded no matter
+# how many rows there are. Re-running the same --job resumes after the last
+# committed chat_id; --restart starts over.
+#
+#   python -m intelligence.Sentiment_Analysis.bulk_score --workers 4
+#   python -m intelligence.Sentiment_Analysis.bulk_score --job backfill-2026 --restart --limit 100000
+
+import os
+import time
+import logging
+import argparse
+from collections import Counter, deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Deque, List, Optional, Tuple
+
+LOG = logging.getLogger(__name__)
+
+BULK_SCORE_PAGE = int(os.getenv("BULK_SCORE_PAGE", 2000))
+BULK_SCORE_BATCH = int(os.getenv("BULK_SCORE_BATCH", 64))
+
+_analyzer = None
+
+
+def _init_worker(workers: int, cascade: bool) -> None:
+    # every scorer gets its share of the CPUs before torch is imported
+    from intelligence.resource_governor import govern_process
+
+    govern_process(workers=workers)
+    from intelligence.Sentiment_Analysis.Detect_Sentiment import SentimentAnalyzer
+    from intelligence.Sentiment_Analysis.cache import SentimentCache
+
+    global _analyzer
+    _analyzer = SentimentAnalyzer(sidecar_socket=None, cascade=cascade, cache=SentimentCache(maxsize=0))
+
+
+def score_page(rows: List[Tuple[int, str]], batch_size: int) -> List[tuple]:
+    """
+    [(chat_id, text)] -> [(chat_id, label, score, is_negative, is_frustrated, source)]
+    in input order. Runs inside a scorer process.
+    """
+    analyzer = _analyzer
+    results: List[Optional[tuple]] = [None] * len(rows)
+    to_model: List[int] = []
+
+    for i, (chat_id, text) in enumerate(rows):
+        text = text or ""
+        if not text.strip():
+            results[i] = _row(chat_id, analyzer._neutral(), "empty")
+            continue
+        if analyzer.cascade:
+            result, confident = analyzer.lexicon.classify(text)
+            if confident:
+                results[i] = _row(chat_id, result, "lexicon")
+                continue
+        to_model.append(i)
+
+    # similar lengths in one batch = little padding
+    to_model.sort(key=lambda i: len(rows[i][1]))
+    for start in range(0, len(to_model), batch_size):
+        chunk = to_model[start:start + batch_size]
+        for i, (result, from_model) in zip(chunk, analyzer._analyze_batch([rows[i][1] for i in chunk])):
+            results[i] = _row(rows[i][0], result, "model" if from_model else "fallback")
+    return results
+
+
+def _row(chat_id: int, result: dict, source: str) -> tuple:
+    return (chat_id, result["label"], float(result["score"]), bool(result["is_negative"]), bool(result["is_frustrated"]), source)
+
+
+def run(
+    job: str,
+    workers: int,
+    page_size: int,
+    batch_size: int,
+    limit: Optional[int],
+    restart: bool,
+    overwrite: bool,
+    cascade: bool,
+) -> None:
+    from database.core.connect import get_connection
+    from database.core.chat_sentiment_db import (
+        count_chats_after,
+        ensure_schema,
+        get_checkpoint,
+        reset_checkpoint,
+        save_scores,
+        stream_chats,
+    )
+
+    with get_connection() as read_conn, get_connection() as write_conn:
+        ensure_schema(write_conn)
+        if restart:
+            reset_checkpoint(write_conn, job)
+        last_chat_id, done_before = get_checkpoint(write_conn, job)
+        total = count_chats_after(write_conn, last_chat_id)
+        if limit:
+            total = min(total, limit)
+        LOG.info("Job %r: resuming after chat_id=%s (%s rows already scored), %s to go", job, last_chat_id, done_before, total)
+        if not total:
+            return
+
+        labels: Counter = Counter()
+        sources: Counter = Counter()
+        done = 0
+        start = time.perf_counter()
+        pending: Deque[Future] = deque()
+
+        def write_oldest() -> None:
+            nonlocal done
+            scored = pending.popleft().result()
+            save_scores(write_conn, job, scored, overwrite)
+            done += len(scored)
+            labels.update(r[1] for r in scored)
+            sources.update(r[5] for r in scored)
+            rate = done / (time.perf_counter() - start)
+            LOG.info("%s/%s rows (%.1f%%) %.0f rows/s, checkpoint chat_id=%s", done, total, 100 * done / total, rate, scored[-1][0])
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(workers, cascade)) as pool:
+            for page in stream_chats(read_conn, last_chat_id, page_size, limit):
+                pending.append(pool.submit(score_page, page, batch_size))
+                if len(pending) >= 2 * workers:
+                    write_oldest()
+            while pending:
+                write_oldest()
+
+        elapsed = time.perf_counter() - start
+        LOG.info("✅ Job %r done: %s rows in %.1fs (%.0f rows/s)", job, done, elapsed, done / elapsed if elapsed else 0.0)
+        LOG.info("labels: %s  sources: %s", dict(labels), dict(sources))
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    parser = argparse.ArgumentParser(description="Bulk sentiment scoring of chat_history into chat_sentiment")
+    parser.add_argument("--job", default="chat_sentiment", help="checkpoint name; re-run the same job to resume")
+    parser.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 2) - 1))
+    parser.add_argument("--page", type=int, default=BULK_SCORE_PAGE, help="rows per cursor fetch / write transaction")
+    parser.add_argument("--batch-size", type=int, default=BULK_SCORE_BATCH, help="texts per forward pass")
+    parser.add_argument("--limit", type=int, default=None, help="score at most this many rows in this run")
+    parser.add_argument("--restart", action="store_true", help="ignore the checkpoint and start from the first chat")
+    parser.add_argument("--keep-existing", action="store_true", help="do not overwrite rows that already have a score")
+    parser.add_argument("--no-cascade", action="store_true", help="send every message to the model")
+    args = parser.parse_args()
+    run(
+        args.job,
+        args.workers,
+        args.page,
+        args.batch_size,
+        args.limit,
+        args.restart,
+        not args.keep_existing,
+        not args.no_cascade,
+    )
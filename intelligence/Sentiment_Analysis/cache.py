@@ -0,0 +1,219 @@
+# intelligence/Sentiment_Analysis/cache.py
+# Memoized sentiment results for repeated messages ("hi", "balance",
+# "block my card", "thank you", ...).
+#
+# Two levels:
+#   L1  SentimentCache        per-process LRU with TTL (OrderedDict + lock)
+#   L2  SharedSentimentCache  optional SQLite file, shared by every worker on
+#                             the host; put it on tmpfs (/dev/shm) so it is
+#                             effectively shared memory
+#
+# Keys are normalized text (NFKC, case-folded, whitespace collapsed), so
+# "Block my card " and "block my  card" share one entry. Only model results
+# are cached; rule-based fallbacks never are, so nothing stale survives the
+# model finishing its load.
+
+import os
+import time
+import sqlite3
+import logging
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+LOG = logging.getLogger(__name__)
+
+SENTIMENT_CACHE_SIZE = int(os.getenv("SENTIMENT_CACHE_SIZE", 4096))            # 0 disables the cache
+SENTIMENT_CACHE_TTL_SECONDS = float(os.getenv("SENTIMENT_CACHE_TTL_SECONDS", 3600))  # 0 = no expiry
+SENTIMENT_CACHE_SHARED_PATH = os.getenv("SENTIMENT_CACHE_SHARED_PATH", "")       # e.g. /dev/shm/tub-sentiment.db
+SENTIMENT_CACHE_SHARED_SIZE = int(os.getenv("SENTIMENT_CACHE_SHARED_SIZE", 50000))
+# messages longer than this are almost never repeated verbatim
+SENTIMENT_CACHE_MAX_CHARS = int(os.getenv("SENTIMENT_CACHE_MAX_CHARS", 200))
+
+_FIELDS = ("label", "score", "is_negative", "is_frustrated")
+
+
+def normalize_text(text: str) -> str:
+    return " ".join(unicodedata.normalize("NFKC", text).casefold().split())
+
+
+class SharedSentimentCache:
+    """
+    Host-wide cache in one SQLite file (WAL). Any SQLite error turns into a
+    miss; a broken shared store must never fail a chat request.
+    """
+
+    PRUNE_EVERY = 256   # puts between size checks
+
+    def __init__(self, path: str, maxsize: int = SENTIMENT_CACHE_SHARED_SIZE):
+        self.path = path
+        self.maxsize = maxsize
+        self._local = threading.local()
+        self._puts = 0
+        self.errors = 0
+        self._conn()   # create the table now, not on the first request
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=0.05, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=OFF")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS sentiment ("
+                " key TEXT PRIMARY KEY, label TEXT, score REAL,"
+                " is_negative INTEGER, is_frustrated INTEGER, expires REAL)"
+            )
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str, now: float) -> Optional[Tuple[Dict[str, Any], float]]:
+        try:
+            row = self._conn().execute(
+                "SELECT label, score, is_negative, is_frustrated, expires FROM sentiment WHERE key = ?", (key,)
+            ).fetchone()
+        except sqlite3.Error as e:
+            self.errors += 1
+            LOG.debug("Shared sentiment cache read failed: %s", e)
+            return None
+        if row is None or (row[4] and row[4] <= now):
+            return None
+        result = {"label": row[0], "score": row[1], "is_negative": bool(row[2]), "is_frustrated": bool(row[3])}
+        return result, row[4]
+
+    def put(self, key: str, result: Dict[str, Any], expires: float) -> None:
+        try:
+            conn = self._conn()
+            conn.execute(
+                "INSERT OR REPLACE INTO sentiment VALUES (?, ?, ?, ?, ?, ?)",
+                (key, result["label"], result["score"], int(result["is_negative"]), int(result["is_frustrated"]), expires),
+            )
+            self._puts += 1
+            if self._puts % self.PRUNE_EVERY == 0:
+                self._prune(conn)
+        except sqlite3.Error as e:
+            self.errors += 1
+            LOG.debug("Shared sentiment cache write failed: %s", e)
+
+    def _prune(self, conn: sqlite3.Connection) -> None:
+        conn.execute("DELETE FROM sentiment WHERE expires > 0 AND expires <= ?", (time.time(),))
+        (count,) = conn.execute("SELECT COUNT(*) FROM sentiment").fetchone()
+        if count > self.maxsize:
+            # REPLACE re-inserts, so the lowest rowids are the least recently written
+            conn.execute(
+                "DELETE FROM sentiment WHERE rowid IN (SELECT rowid FROM sentiment ORDER BY rowid LIMIT ?)",
+                (count - self.maxsize,),
+            )
+
+    def clear(self) -> None:
+        self._conn().execute("DELETE FROM sentiment")
+
+
+class SentimentCache:
+    """
+    Bounded LRU of sentiment results keyed by normalized text, each entry
+    valid for `ttl` seconds, optionally backed by a SharedSentimentCache.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = SENTIMENT_CACHE_SIZE,
+        ttl: float = SENTIMENT_CACHE_TTL_SECONDS,
+        shared_path: Optional[str] = SENTIMENT_CACHE_SHARED_PATH or None,
+        max_chars: int = SENTIMENT_CACHE_MAX_CHARS,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.max_chars = max_chars
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.shared: Optional[SharedSentimentCache] = None
+        if shared_path and maxsize > 0:
+            try:
+                self.shared = SharedSentimentCache(shared_path)
+                LOG.info("Shared sentiment cache at %s", shared_path)
+            except sqlite3.Error as e:
+                LOG.warning("Shared sentiment cache disabled (%s): %s", shared_path, e)
+
+    @property
+    def enabled(self) -> bool:
+        return self.maxsize > 0
+
+    def key(self, text: str) -> Optional[str]:
+        """
+        Cache key for `text`, or None if it should not be cached.
+        """
+        if not self.enabled or len(text) > self.max_chars:
+            return None
+        return normalize_text(text)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                result, expires = entry
+                if expires and expires <= now:
+                    del self._data[key]
+                    self.expirations += 1
+                else:
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return dict(result)
+
+        if self.shared is not None:
+            found = self.shared.get(key, now)
+            if found is not None:
+                result, expires = found
+                self._store(key, result, expires)
+                with self._lock:
+                    self.shared_hits += 1
+                return dict(result)
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, result: Dict[str, Any]) -> None:
+        expires = time.time() + self.ttl if self.ttl > 0 else 0.0
+        entry = {field: result[field] for field in _FIELDS}
+        self._store(key, entry, expires)
+        if self.shared is not None:
+            self.shared.put(key, entry, expires)
+
+    def _store(self, key: str, result: Dict[str, Any], expires: float) -> None:
+        with self._lock:
+            self._data[key] = (result, expires)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+        if self.shared is not None:
+            self.shared.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.shared_hits + self.misses
+            stats = {
+                "cache_size": len(self._data),
+                "cache_maxsize": self.maxsize,
+                "cache_hits": self.hits,
+                "cache_shared_hits": self.shared_hits,
+                "cache_misses": self.misses,
+                "cache_evictions": self.evictions,
+                "cache_expirations": self.expirations,
+                "cache_hit_ratio": round((self.hits + self.shared_hits) / lookups, 4) if lookups else 0.0,
+            }
+        if self.shared is not None:
+            stats["cache_shared_errors"] = self.shared.errors
+        return stats
@@ -0,0 +1,168 @@
+# intelligence/Sentiment_Analysis/export_onnx.py
+# Export the DistilBERT sentiment checkpoint to ONNX, quantize it to int8
+# (dynamic quantization, CPU) and check it agrees with the torch model.
+#
+#   python -m intelligence.Sentiment_Analysis.export_onnx export
+#   python -m intelligence.Sentiment_Analysis.export_onnx check --labelled sentiment.csv
+#
+# `check` exits non-zero if the backends agree on fewer than --min-agreement
+# of the sample, so it can gate a model rollout. The labelled CSV uses the
+# training notebook's columns: Sentence, Sentiment.
+
+import csv
+import sys
+import inspect
+import argparse
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from intelligence.Sentiment_Analysis.Detect_Sentiment import (
+    DEFAULT_MODEL_PATH,
+    LABELS,
+    OnnxBackend,
+    TorchBackend,
+    default_onnx_path,
+)
+
+
+def export(model_path: Path, out_dir: Path, opset: int = 17, quantize: bool = True) -> Path:
+    import torch
+    from transformers import AutoTokenizer, AutoModelForSequenceClassification
+
+    tokenizer = AutoTokenizer.from_pretrained(str(model_path))
+    model = AutoModelForSequenceClassification.from_pretrained(str(model_path))
+    model.eval()
+
+    sample = tokenizer(["my card payment failed twice"], return_tensors="pt")
+    input_names = list(sample.keys())
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["logits"] = {0: "batch"}
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    fp32_path = out_dir / "model.onnx"
+
+    kwargs = {}
+    if "dynamo" in inspect.signature(torch.onnx.export).parameters:
+        kwargs["dynamo"] = False   # TorchScript exporter handles dynamic_axes
+    with torch.inference_mode():
+        torch.onnx.export(
+            model,
+            (dict(sample),),
+            str(fp32_path),
+            input_names=input_names,
+            output_names=["logits"],
+            dynamic_axes=dynamic_axes,
+            opset_version=opset,
+            do_constant_folding=True,
+            **kwargs,
+        )
+    print(f"exported {fp32_path} ({fp32_path.stat().st_size / 1e6:.1f} MB)")
+    if not quantize:
+        return fp32_path
+
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    int8_path = out_dir / "model.int8.onnx"
+    quantize_dynamic(str(fp32_path), str(int8_path), weight_type=QuantType.QInt8)
+    print(f"quantized {int8_path} ({int8_path.stat().st_size / 1e6:.1f} MB)")
+    return int8_path
+
+
+def load_labelled(path: Path, limit: Optional[int] = None) -> Tuple[List[str], List[int]]:
+    texts: List[str] = []
+    labels: List[int] = []
+    with path.open(newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            row = {k.strip(): v for k, v in row.items() if k}
+            label = (row.get("Sentiment") or "").strip().lower()
+            text = (row.get("Sentence") or "").strip()
+            if text and label in LABELS:
+                texts.append(text)
+                labels.append(LABELS.index(label))
+                if limit and len(texts) >= limit:
+                    break
+    return texts, labels
+
+
+def _predict(backend, texts: List[str], batch_size: int) -> List[Tuple[int, float]]:
+    out: List[Tuple[int, float]] = []
+    for i in range(0, len(texts), batch_size):
+        out.extend(backend.predict(texts[i:i + batch_size]))
+    return out
+
+
+def _accuracy(preds: List[Tuple[int, float]], labels: List[int]) -> float:
+    return sum(p == y for (p, _), y in zip(preds, labels)) / len(labels)
+
+
+def _macro_f1(preds: List[Tuple[int, float]], labels: List[int]) -> float:
+    scores = []
+    for cls in range(len(LABELS)):
+        tp = sum(p == cls and y == cls for (p, _), y in zip(preds, labels))
+        fp = sum(p == cls and y != cls for (p, _), y in zip(preds, labels))
+        fn = sum(p != cls and y == cls for (p, _), y in zip(preds, labels))
+        scores.append(2 * tp / (2 * tp + fp + fn) if tp else 0.0)
+    return sum(scores) / len(scores)
+
+
+def check(
+    model_path: Path,
+    onnx_path: Path,
+    labelled: Optional[Path],
+    limit: Optional[int],
+    batch_size: int,
+    min_agreement: float,
+) -> bool:
+    if labelled:
+        texts, labels = load_labelled(labelled, limit)
+    else:
+        from benchmarks.nlu_corpus import load_nlu_examples
+
+        texts, labels = load_nlu_examples(limit=limit), []
+    if not texts:
+        raise SystemExit("no texts to compare")
+
+    torch_preds = _predict(TorchBackend(model_path, device="cpu"), texts, batch_size)
+    onnx_preds = _predict(OnnxBackend(model_path, onnx_path), texts, batch_size)
+
+    agreement = sum(t[0] == o[0] for t, o in zip(torch_preds, onnx_preds)) / len(texts)
+    max_diff = max((abs(t[1] - o[1]) for t, o in zip(torch_preds, onnx_preds) if t[0] == o[0]), default=0.0)
+    print(f"sample:           {len(texts)} texts ({'labelled' if labels else 'nlu.yml, unlabelled'})")
+    print(f"label agreement:  {agreement:.4f}")
+    print(f"max score diff:   {max_diff:.4f} (where labels agree)")
+    if labels:
+        for name, preds in (("torch", torch_preds), ("onnx", onnx_preds)):
+            print(f"{name:<6} accuracy {_accuracy(preds, labels):.4f}  macro-F1 {_macro_f1(preds, labels):.4f}")
+    return agreement >= min_agreement
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export / quantize / parity-check the sentiment model")
+    parser.add_argument("--model", type=Path, default=DEFAULT_MODEL_PATH)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_export = sub.add_parser("export", help="export to ONNX and quantize to int8")
+    p_export.add_argument("--out", type=Path, default=None, help="output dir (default: <model>/onnx)")
+    p_export.add_argument("--opset", type=int, default=17)
+    p_export.add_argument("--no-quantize", action="store_true")
+
+    p_check = sub.add_parser("check", help="compare ONNX predictions against torch")
+    p_check.add_argument("--onnx", type=Path, default=None, help="default: <model>/onnx/model.int8.onnx")
+    p_check.add_argument("--labelled", type=Path, default=None, help="CSV with Sentence,Sentiment columns")
+    p_check.add_argument("--limit", type=int, default=2000)
+    p_check.add_argument("--batch-size", type=int, default=32)
+    p_check.add_argument("--min-agreement", type=float, default=0.99)
+
+    args = parser.parse_args()
+    if args.command == "export":
+        export(args.model, args.out or default_onnx_path(args.model).parent, args.opset, not args.no_quantize)
+    else:
+        ok = check(
+            args.model,
+            args.onnx or default_onnx_path(args.model),
+            args.labelled,
+            args.limit,
+            args.batch_size,
+            args.min_agreement,
+        )
+        sys.exit(0 if ok else 1)
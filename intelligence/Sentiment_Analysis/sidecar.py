@@ -0,0 +1,311 @@
+# intelligence/Sentiment_Analysis/sidecar.py
+# One shared sentiment model for all gunicorn workers.
+#
+# The sidecar process loads SentimentAnalyzer once and serves it over a Unix
+# domain socket. Each worker keeps one multiplexed connection; requests from
+# every worker land in the same SentimentBatcher, so they share forward passes
+# and one torch thread pool instead of N models fighting over the cores.
+#
+# The sidecar only runs the model. The lexicon tier and the result cache stay
+# in the caller, so each message is tiered exactly once. from_model is false
+# when the sidecar's own inference failed and it answered with the rule
+# fallback. The caller counts those as fallbacks and does not cache them.
+#
+# Wire format: 4-byte big-endian length + msgpack body
+#   request   [id, text]                                  (empty text = ping)
+#   response  [id, label, score, is_negative, is_frustrated, from_model]
+#
+#   python -m intelligence.Sentiment_Analysis.sidecar --socket /tmp/tub-sentiment.sock
+
+import os
+import sys
+import time
+import socket
+import struct
+import asyncio
+import logging
+import argparse
+from typing import Any, Dict, List, Optional, Tuple
+
+import msgpack
+
+from intelligence.process_supervisor import ProcessSupervisor
+
+LOG = logging.getLogger(__name__)
+
+SENTIMENT_SIDECAR_SOCKET = os.getenv("SENTIMENT_SIDECAR_SOCKET", "")
+SENTIMENT_SIDECAR_TIMEOUT_MS = float(os.getenv("SENTIMENT_SIDECAR_TIMEOUT_MS", 250))
+# after a failed connect, fall back immediately for this long instead of retrying
+SENTIMENT_SIDECAR_RETRY_SECONDS = float(os.getenv("SENTIMENT_SIDECAR_RETRY_SECONDS", 1))
+SENTIMENT_SIDECAR_READY_TIMEOUT = float(os.getenv("SENTIMENT_SIDECAR_READY_TIMEOUT", 120))
+
+_HEADER = struct.Struct(">I")
+MAX_FRAME = 64 * 1024
+
+
+def encode_frame(obj: Any) -> bytes:
+    body = msgpack.packb(obj, use_bin_type=True)
+    return _HEADER.pack(len(body)) + body
+
+
+async def read_frame(reader: asyncio.StreamReader) -> Any:
+    (size,) = _HEADER.unpack(await reader.readexactly(_HEADER.size))
+    if size > MAX_FRAME:
+        raise ValueError(f"frame too large: {size}")
+    return msgpack.unpackb(await reader.readexactly(size), raw=False)
+
+
+def _to_wire(req_id: int, result: Dict[str, Any], from_model: bool) -> List[Any]:
+    return [req_id, result["label"], result["score"], result["is_negative"], result["is_frustrated"], from_model]
+
+
+def _from_wire(frame: List[Any]) -> Tuple[Dict[str, Any], bool]:
+    _, label, score, is_negative, is_frustrated, from_model = frame
+    return {
+        "label": label,
+        "score": score,
+        "is_negative": is_negative,
+        "is_frustrated": is_frustrated,
+    }, from_model
+
+
+# =================================================
+# Server (runs inside the sidecar process)
+# =================================================
+async def _serve_connection(analyzer, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    tasks = set()
+
+    async def answer(req_id: int, text: str) -> None:
+        # model tier only: the caller already ran the lexicon and its cache
+        result, from_model = await analyzer._model_async(text) if text else (analyzer._neutral(), False)
+        writer.write(encode_frame(_to_wire(req_id, result, from_model)))
+        await writer.drain()
+
+    try:
+        while True:
+            req_id, text = await read_frame(reader)
+            task = asyncio.create_task(answer(req_id, text))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    except Exception:
+        LOG.exception("Sentiment sidecar connection failed")
+    finally:
+        for task in tasks:
+            task.cancel()
+        writer.close()
+
+
+async def serve(path: str) -> None:
+    # model is loaded here, once, not in the workers, and gets every CPU
+    from intelligence.resource_governor import govern_process
+
+    govern_process(workers=1)
+    from intelligence.Sentiment_Analysis.Detect_Sentiment import SentimentAnalyzer
+
+    analyzer = SentimentAnalyzer(cascade=False)
+    if os.path.exists(path):
+        os.unlink(path)
+    server = await asyncio.start_unix_server(
+        lambda r, w: _serve_connection(analyzer, r, w), path=path
+    )
+    os.chmod(path, 0o660)
+    LOG.info("✅ Sentiment sidecar listening on %s", path)
+    async with server:
+        await server.serve_forever()
+
+
+# =================================================
+# Client (runs inside each API worker)
+# =================================================
+class SidecarClient:
+    """
+    One multiplexed connection per worker event loop. analyze() returns
+    (result, from_model). It raises on timeout or connection failure, and
+    SentimentAnalyzer turns that into the rule fallback.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        timeout_ms: float = SENTIMENT_SIDECAR_TIMEOUT_MS,
+        retry_seconds: float = SENTIMENT_SIDECAR_RETRY_SECONDS,
+    ):
+        self.path = path
+        self.timeout = timeout_ms / 1000.0
+        self.retry_seconds = retry_seconds
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._read_task: Optional[asyncio.Task] = None
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._next_id = 0
+        self._connect_lock = asyncio.Lock()
+        self._down_until = 0.0
+        self.requests = 0
+        self.timeouts = 0
+        self.errors = 0
+        self.remote_fallbacks = 0
+
+    async def _connect(self) -> None:
+        async with self._connect_lock:
+            if self._writer is not None:
+                return
+            if time.monotonic() < self._down_until:
+                raise ConnectionError("sentiment sidecar marked down")
+            try:
+                self._reader, self._writer = await asyncio.wait_for(
+                    asyncio.open_unix_connection(self.path), self.timeout
+                )
+            except (OSError, asyncio.TimeoutError) as e:
+                self._down_until = time.monotonic() + self.retry_seconds
+                LOG.warning("Sentiment sidecar unavailable at %s: %s", self.path, e)
+                raise ConnectionError(str(e)) from e
+            self._read_task = asyncio.create_task(self._read_loop(self._reader))
+
+    async def _read_loop(self, reader: asyncio.StreamReader) -> None:
+        try:
+            while True:
+                frame = await read_frame(reader)
+                fut = self._pending.pop(frame[0], None)
+                if fut is not None and not fut.done():
+                    fut.set_result(_from_wire(frame))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self._reset(ConnectionError(f"sentiment sidecar connection lost: {e}"))
+
+    def _reset(self, exc: BaseException) -> None:
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = self._writer = None
+        pending, self._pending = self._pending, {}
+        for fut in pending.values():
+            if not fut.done():
+                fut.set_exception(exc)
+
+    async def analyze(self, text: str) -> Tuple[Dict[str, Any], bool]:
+        if self._writer is None:
+            await self._connect()
+        assert self._writer is not None
+
+        self._next_id = (self._next_id + 1) & 0x7FFFFFFF
+        req_id = self._next_id
+        fut = asyncio.get_running_loop().create_future()
+        self._pending[req_id] = fut
+        self.requests += 1
+        try:
+            self._writer.write(encode_frame([req_id, text]))
+            result, from_model = await asyncio.wait_for(fut, self.timeout)
+            if not from_model:
+                self.remote_fallbacks += 1
+            return result, from_model
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise
+        except Exception:
+            self.errors += 1
+            raise
+        finally:
+            self._pending.pop(req_id, None)
+
+    async def close(self) -> None:
+        if self._read_task is not None:
+            self._read_task.cancel()
+            await asyncio.gather(self._read_task, return_exceptions=True)
+            self._read_task = None
+        self._reset(ConnectionError("sentiment sidecar client closed"))
+
+    def close_nowait(self) -> None:
+        """
+        close() for when the event loop this client ran on has stopped. The
+        transport cannot be closed through that loop any more, so the socket
+        is shut down directly (the sidecar sees EOF) and collected later.
+        """
+        if self._writer is not None:
+            sock = self._writer.get_extra_info("socket")
+            if sock is not None:
+                try:
+                    sock.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+        self._read_task = None
+        self._reader = self._writer = None
+        self._pending = {}
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "sidecar_requests": self.requests,
+            "sidecar_timeouts": self.timeouts,
+            "sidecar_errors": self.errors,
+            "sidecar_remote_fallbacks": self.remote_fallbacks,
+            "sidecar_in_flight": len(self._pending),
+        }
+
+
+def request_blocking(
+    path: str, text: str, timeout: float = SENTIMENT_SIDECAR_TIMEOUT_MS / 1000.0
+) -> Tuple[Dict[str, Any], bool]:
+    """
+    One-shot request on a fresh connection (sync callers, readiness probe).
+    Returns (result, from_model).
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(path)
+        sock.sendall(encode_frame([1, text]))
+        buf = b""
+        while len(buf) < _HEADER.size:
+            chunk = sock.recv(4096)
+            if not chunk:
+                raise ConnectionError("sentiment sidecar closed the connection")
+            buf += chunk
+        (size,) = _HEADER.unpack(buf[:_HEADER.size])
+        while len(buf) < _HEADER.size + size:
+            chunk = sock.recv(max(4096, size))
+            if not chunk:
+                raise ConnectionError("sentiment sidecar closed the connection")
+            buf += chunk
+    return _from_wire(msgpack.unpackb(buf[_HEADER.size:_HEADER.size + size], raw=False))
+
+
+# =================================================
+# Supervision (gunicorn master / launcher)
+# =================================================
+class SentimentSidecarSupervisor(ProcessSupervisor):
+    name = "Sentiment sidecar"
+
+    def __init__(self, path: str, ready_timeout: float = SENTIMENT_SIDECAR_READY_TIMEOUT):
+        super().__init__(
+            command=[sys.executable, "-m", "intelligence.Sentiment_Analysis.sidecar", "--socket", path],
+            ready_timeout=ready_timeout,
+        )
+        self.path = path
+
+    def _probe(self) -> bool:
+        try:
+            request_blocking(self.path, "", timeout=1)
+            return True
+        except (OSError, ValueError):
+            return False
+
+
+def start_sentiment_sidecar() -> Optional[SentimentSidecarSupervisor]:
+    """
+    Start the shared sidecar if SENTIMENT_SIDECAR_SOCKET is set. Call this
+    from the launcher / gunicorn master only, never from worker processes.
+    """
+    if not SENTIMENT_SIDECAR_SOCKET:
+        return None
+    return SentimentSidecarSupervisor(SENTIMENT_SIDECAR_SOCKET).start()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Shared sentiment inference sidecar")
+    parser.add_argument("--socket", default=SENTIMENT_SIDECAR_SOCKET or "/tmp/tub-sentiment.sock")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.socket))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,444 @@
+# intelligence/llm_client.py
+# One shared client for the LLM calls made by text correction and
+# translation (intelligence/text/text_corrector.py, intelligence/voice/voice_i18n.py).
+#
+#   - async httpx client with a keep-alive connection pool
+#   - persistent response cache (SQLite) keyed by (kind, target language,
+#     model, prompt): a repeated correction / translation never hits the API.
+#     Only a sha256 of the prompt is stored, but the cached *response* is the
+#     corrected / translated customer text itself, so entries expire after
+#     LLM_CACHE_TTL_SECONDS and the table is capped at LLM_CACHE_MAX_ENTRIES
+#     (LLM_CACHE_PATH=off disables it).
+#   - a deadline per call: the whole call, connect included, must fit in it
+#   - a circuit breaker: after LLM_BREAKER_FAILURES consecutive failures (or
+#     any 429) calls fail fast for a cool-down, then one probe call decides
+#     whether to close it again. Failing fast returns None, and every caller
+#     already falls back to its local path on None.
+#
+# Sync callers use complete_sync(), which runs the same coroutine on one
+# background event loop. The cache and breaker are shared by every loop; the
+# httpx client and in-flight map are per event loop (asyncio objects cannot
+# cross loops).
+#
+# API formats: "openai" (chat completions, Bearer key; Groq etc.) or
+# "gemini" (generateContent, key in the URL). LLM_API_STYLE picks one;
+# by default it is guessed from LLM_API_URL.
+
+import os
+import time
+import sqlite3
+import asyncio
+import hashlib
+import logging
+import threading
+import weakref
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+from dotenv import load_dotenv
+
+LOG = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+load_dotenv(dotenv_path=PROJECT_ROOT / ".env")
+
+LLM_API_URL = os.getenv("LLM_API_URL", "")
+LLM_API_KEY = os.getenv("LLM_API_KEY", "")
+LLM_API_STYLE = os.getenv("LLM_API_STYLE", "")                      # openai | gemini | "" = guess from URL
+LLM_MODEL = os.getenv("GROQ_MODEL", "llama-3.3-70b-versatile")
+LLM_DEADLINE_SECONDS = float(os.getenv("LLM_DEADLINE_SECONDS", 4))
+LLM_POOL_SIZE = int(os.getenv("LLM_POOL_SIZE", 10))
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH") or str(PROJECT_ROOT / ".cache" / "llm_responses.db")  # "off" = no cache
+LLM_CACHE_TTL_SECONDS = float(os.getenv("LLM_CACHE_TTL_SECONDS", 30 * 24 * 3600))               # 0 = forever
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", 100000))
+LLM_BREAKER_FAILURES = int(os.getenv("LLM_BREAKER_FAILURES", 3))
+LLM_BREAKER_COOLDOWN_SECONDS = float(os.getenv("LLM_BREAKER_COOLDOWN_SECONDS", 30))
+
+
+class LLMUnavailable(Exception):
+    """
+    The call failed or was refused by the circuit breaker.
+    """
+
+
+# =================================================
+# Persistent response cache
+# =================================================
+class ResponseCache:
+    """
+    key (sha256 of kind, target, model, prompt) -> response text.
+    """
+
+    PRUNE_EVERY = 256   # puts between expiry / size checks
+
+    def __init__(self, path: str, ttl: float = LLM_CACHE_TTL_SECONDS, maxsize: int = LLM_CACHE_MAX_ENTRIES):
+        self.path = path
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._puts = 0
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=0.5, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_response (key TEXT PRIMARY KEY, kind TEXT, target TEXT,"
+            " response TEXT NOT NULL, created REAL NOT NULL)"
+        )
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        with self._lock:
+            self._prune()
+
+    @staticmethod
+    def key(kind: str, target: str, model: str, system: str, text: str) -> str:
+        return hashlib.sha256("\x1f".join((kind, target, model, system, text)).encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        try:
+            with self._lock:
+                row = self._conn.execute("SELECT response, created FROM llm_response WHERE key = ?", (key,)).fetchone()
+        except sqlite3.Error as e:
+            LOG.warning("LLM cache read failed: %s", e)
+            row = None
+        if row is None or (self.ttl > 0 and row[1] + self.ttl < time.time()):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return row[0]
+
+    def put(self, key: str, kind: str, target: str, response: str) -> None:
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO llm_response VALUES (?, ?, ?, ?, ?)",
+                    (key, kind, target, response, time.time()),
+                )
+                self._puts += 1
+                if self._puts % self.PRUNE_EVERY == 0:
+                    self._prune()
+        except sqlite3.Error as e:
+            LOG.warning("LLM cache write failed: %s", e)
+
+    def _prune(self) -> None:
+        # caller holds self._lock
+        if self.ttl > 0:
+            self._conn.execute("DELETE FROM llm_response WHERE created < ?", (time.time() - self.ttl,))
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM llm_response").fetchone()
+        if count > self.maxsize:
+            self._conn.execute(
+                "DELETE FROM llm_response WHERE key IN (SELECT key FROM llm_response ORDER BY created LIMIT ?)",
+                (count - self.maxsize,),
+            )
+
+
+# =================================================
+# Circuit breaker
+# =================================================
+class CircuitBreaker:
+    """
+    closed -> (N consecutive failures | 429) -> open -> (cool-down) ->
+    half-open: one probe; success closes, failure re-opens.
+    """
+
+    def __init__(self, failures: int = LLM_BREAKER_FAILURES, cooldown: float = LLM_BREAKER_COOLDOWN_SECONDS):
+        self.failures = max(1, failures)
+        self.cooldown = cooldown
+        self.consecutive = 0
+        self.open_until = 0.0
+        self.probing = False
+        self.opened = 0
+        self.rejected = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.open_until == 0.0:
+            return "closed"
+        return "open" if time.monotonic() < self.open_until else "half_open"
+
+    def allow(self) -> Optional[str]:
+        """
+        "call" (closed), "probe" (the one half-open trial call) or None (open).
+        """
+        with self._lock:
+            if self.open_until == 0.0:
+                return "call"
+            if time.monotonic() >= self.open_until and not self.probing:
+                self.probing = True
+                return "probe"
+            self.rejected += 1
+            return None
+
+    def release(self) -> None:
+        """
+        The probe ended without success() / failure() (cancelled, or an
+        unexpected error): let the next call probe instead.
+        """
+        with self._lock:
+            self.probing = False
+
+    def success(self) -> None:
+        with self._lock:
+            self.consecutive = 0
+            self.open_until = 0.0
+            self.probing = False
+
+    def failure(self, retry_after: Optional[float] = None) -> None:
+        with self._lock:
+            self.consecutive += 1
+            if self.probing or retry_after is not None or self.consecutive >= self.failures:
+                if self.open_until == 0.0 or self.probing:
+                    self.opened += 1
+                    LOG.warning("LLM circuit open for %.0fs", max(self.cooldown, retry_after or 0.0))
+                self.open_until = time.monotonic() + max(self.cooldown, retry_after or 0.0)
+                self.probing = False
+
+
+# =================================================
+# Client
+# =================================================
+def _guess_style(url: str) -> str:
+    return "gemini" if "generativelanguage" in url or ":generateContent" in url else "openai"
+
+
+class LLMClient:
+    def __init__(
+        self,
+        url: str = LLM_API_URL,
+        api_key: str = LLM_API_KEY,
+        model: str = LLM_MODEL,
+        style: str = LLM_API_STYLE,
+        deadline: float = LLM_DEADLINE_SECONDS,
+        pool_size: int = LLM_POOL_SIZE,
+        cache_path: Optional[str] = None if LLM_CACHE_PATH == "off" else LLM_CACHE_PATH,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
+        self.url = url
+        self.api_key = api_key
+        self.model = model
+        self.style = style or _guess_style(url)
+        self.deadline = deadline
+        self.pool_size = pool_size
+        self.breaker = breaker or CircuitBreaker()
+        self.cache: Optional[ResponseCache] = None
+        if cache_path:
+            try:
+                self.cache = ResponseCache(cache_path)
+            except (OSError, sqlite3.Error) as e:
+                LOG.warning("LLM response cache disabled (%s): %s", cache_path, e)
+        # per event loop: the sync facade's loop and the server's loop each get their own
+        self._clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+        self._inflight: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Future]]" = weakref.WeakKeyDictionary()
+        self._loops_lock = threading.Lock()
+        self.requests = 0
+        self.failures = 0
+        self.timeouts = 0
+
+    @property
+    def configured(self) -> bool:
+        return bool(self.url)
+
+    def _get_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        with self._loops_lock:
+            client = self._clients.get(loop)
+            if client is None:
+                client = httpx.AsyncClient(
+                    limits=httpx.Limits(max_connections=self.pool_size, max_keepalive_connections=self.pool_size),
+                )
+                self._clients[loop] = client
+        return client
+
+    def _loop_inflight(self) -> Dict[str, asyncio.Future]:
+        loop = asyncio.get_running_loop()
+        with self._loops_lock:
+            return self._inflight.setdefault(loop, {})
+
+    def _request(self, system: str, text: str) -> Tuple[Dict[str, str], Dict[str, Any]]:
+        headers = {"Content-Type": "application/json"}
+        if self.style == "gemini":
+            prompt = f"{system}\n\n{text}" if system else text
+            return headers, {"contents": [{"parts": [{"text": prompt}]}]}
+        if self.api_key:
+            headers["Authorization"] = f"Bearer {self.api_key}"
+        messages = [{"role": "system", "content": system}] if system else []
+        messages.append({"role": "user", "content": text})
+        return headers, {"model": self.model, "messages": messages, "temperature": 0.2}
+
+    def _parse(self, data: Dict[str, Any]) -> Optional[str]:
+        if self.style == "gemini":
+            for cand in data.get("candidates") or []:
+                parts = cand.get("content", {}).get("parts", [])
+                if parts and "text" in parts[0]:
+                    return parts[0]["text"].strip()
+            return None
+        choices = data.get("choices") or []
+        if choices:
+            return (choices[0].get("message", {}).get("content") or "").strip() or None
+        return None
+
+    async def _call(self, system: str, text: str, deadline: float) -> str:
+        headers, payload = self._request(system, text)
+        self.requests += 1
+        try:
+            resp = await asyncio.wait_for(
+                self._get_client().post(self.url, headers=headers, json=payload, timeout=deadline),
+                deadline,
+            )
+        except (asyncio.TimeoutError, httpx.TimeoutException) as e:
+            self.timeouts += 1
+            self.breaker.failure()
+            raise LLMUnavailable(f"deadline of {deadline:.1f}s exceeded") from e
+        except httpx.HTTPError as e:
+            self.failures += 1
+            self.breaker.failure()
+            raise LLMUnavailable(str(e)) from e
+
+        if resp.status_code == 429:
+            self.failures += 1
+            try:
+                retry_after = float(resp.headers.get("Retry-After", 0))
+            except ValueError:
+                retry_after = 0.0
+            self.breaker.failure(retry_after=retry_after)
+            raise LLMUnavailable("rate limited (429)")
+        if resp.status_code >= 500:
+            self.failures += 1
+            self.breaker.failure()
+            raise LLMUnavailable(f"upstream error {resp.status_code}")
+        if resp.status_code >= 400:
+            # our request is wrong; retrying later will not help either
+            self.failures += 1
+            self.breaker.failure()
+            raise LLMUnavailable(f"request rejected {resp.status_code}: {resp.text[:200]}")
+
+        try:
+            result = self._parse(resp.json())
+        except (ValueError, AttributeError, TypeError):
+            result = None
+        if not result:
+            self.failures += 1
+            self.breaker.failure()
+            raise LLMUnavailable("unrecognised response format")
+        self.breaker.success()
+        return result
+
+    async def complete(
+        self,
+        kind: str,
+        text: str,
+        system: str = "",
+        target: str = "",
+        deadline: Optional[float] = None,
+    ) -> Optional[str]:
+        """
+        Cached LLM answer for `text`, or None when the API is not configured,
+        the breaker is open, or the call fails / misses its deadline.
+        `kind` and `target` label the entry; the cache key also covers the
+        model and the full prompt, so editing a prompt starts a fresh cache.
+        """
+        if not self.configured or not text:
+            return None
+        key = ResponseCache.key(kind, target, self.model, system, text)
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        # the same text requested concurrently (on this loop) is sent once
+        inflight = self._loop_inflight()
+        pending = inflight.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+        ticket = self.breaker.allow()
+        if ticket is None:
+            return None
+
+        fut = asyncio.get_running_loop().create_future()
+        inflight[key] = fut
+        result = None
+        try:
+            result = await self._call(system, text, deadline or self.deadline)
+            if self.cache is not None:
+                self.cache.put(key, kind, target, result)
+        except LLMUnavailable as e:
+            LOG.warning("LLM %s call failed, using local path: %s", kind, e)
+        finally:
+            if ticket == "probe":
+                self.breaker.release()
+            inflight.pop(key, None)
+            if not fut.done():
+                fut.set_result(result)
+        return result
+
+    async def aclose(self) -> None:
+        """
+        Close the pool of the running loop.
+        """
+        loop = asyncio.get_running_loop()
+        with self._loops_lock:
+            client = self._clients.pop(loop, None)
+        if client is not None:
+            await client.aclose()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "failures": self.failures,
+            "timeouts": self.timeouts,
+            "cache_hits": self.cache.hits if self.cache else 0,
+            "cache_misses": self.cache.misses if self.cache else 0,
+            "breaker_state": self.breaker.state,
+            "breaker_opened": self.breaker.opened,
+            "breaker_rejected": self.breaker.rejected,
+        }
+
+
+# =================================================
+# Sync facade (one background event loop per process)
+# =================================================
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def _background_loop() -> asyncio.AbstractEventLoop:
+    global _loop
+    with _loop_lock:
+        if _loop is None or _loop.is_closed():
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="llm-client", daemon=True).start()
+        return _loop
+
+
+def complete_sync(
+    kind: str,
+    text: str,
+    system: str = "",
+    target: str = "",
+    deadline: Optional[float] = None,
+) -> Optional[str]:
+    """
+    Blocking LLMClient.complete() on the shared client.
+    """
+    client = get_llm_client()
+    if not client.configured:
+        return None
+    deadline = deadline or client.deadline
+    fut = asyncio.run_coroutine_threadsafe(client.complete(kind, text, system, target, deadline), _background_loop())
+    try:
+        return fut.result(deadline + 1.0)
+    except Exception:
+        fut.cancel()
+        LOG.exception("LLM %s call failed", kind)
+        return None
+
+
+_llm_client: Optional[LLMClient] = None
+
+
+def get_llm_client() -> LLMClient:
+    global _llm_client
+    if _llm_client is None:
+        _llm_client = LLMClient()
+    return _llm_client
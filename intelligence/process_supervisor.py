@@ -0,0 +1,147 @@
+# intelligence/process_supervisor.py
+# One supervised child process owned by the launcher / gunicorn master.
+#
+# Used for Rasa (api/rasa_supervisor.py) and the sentiment sidecar
+# (intelligence/Sentiment_Analysis/sidecar.py). The supervisor polls the
+# child's readiness probe (instead of sleeping) and restarts the process with
+# exponential backoff if it dies.
+
+import time
+import logging
+import threading
+import subprocess
+from typing import List, Optional
+
+LOG = logging.getLogger(__name__)
+
+POLL_INTERVAL = 0.5
+BACKOFF_INITIAL = 1.0
+BACKOFF_MAX = 60.0
+# A run that stayed up this long resets the backoff
+STABLE_AFTER = 60.0
+
+
+class ProcessSupervisor:
+    """
+    Keeps one child process running and tracks its readiness. Subclasses
+    set `name` and implement `_probe()`.
+    """
+
+    name = "process"
+
+    def __init__(
+        self,
+        command: List[str],
+        ready_timeout: float,
+        poll_interval: float = POLL_INTERVAL,
+        backoff_initial: float = BACKOFF_INITIAL,
+        backoff_max: float = BACKOFF_MAX,
+        stable_after: float = STABLE_AFTER,
+        cwd: Optional[str] = None,
+    ):
+        self.command = command
+        self.ready_timeout = ready_timeout
+        self.poll_interval = poll_interval
+        self.backoff_initial = backoff_initial
+        self.backoff_max = backoff_max
+        self.stable_after = stable_after
+        self.cwd = cwd
+
+        self.process: Optional[subprocess.Popen] = None
+        self.restarts = 0
+        self._ready = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # ----- readiness -----
+    def _probe(self) -> bool:
+        raise NotImplementedError
+
+    def is_ready(self) -> bool:
+        return self._ready.is_set()
+
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        return self._ready.wait(timeout)
+
+    # ----- lifecycle -----
+    def _spawn(self) -> bool:
+        try:
+            self.process = subprocess.Popen(
+                self.command,
+                cwd=self.cwd,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+            LOG.info("🚀 %s started (pid=%s)", self.name, self.process.pid)
+            return True
+        except FileNotFoundError:
+            LOG.error("❌ %s not found: %s", self.name, self.command[0])
+        except Exception as e:
+            LOG.exception("❌ Failed to start %s: %s", self.name, e)
+        return False
+
+    def _wait_until_ready(self) -> bool:
+        deadline = time.monotonic() + self.ready_timeout
+        while not self._stopping.is_set() and time.monotonic() < deadline:
+            if self.process is not None and self.process.poll() is not None:
+                return False
+            if self._probe():
+                return True
+            self._stopping.wait(self.poll_interval)
+        return False
+
+    def _run(self) -> None:
+        backoff = self.backoff_initial
+        while not self._stopping.is_set():
+            if not self._spawn():
+                # binary missing or unstartable; retrying will not help
+                return
+
+            started = time.monotonic()
+            if self._wait_until_ready():
+                self._ready.set()
+                LOG.info("✅ %s ready after %.1fs", self.name, time.monotonic() - started)
+            elif not self._stopping.is_set():
+                LOG.warning("%s did not become ready within %.0fs", self.name, self.ready_timeout)
+
+            # watch the process until it exits or we are asked to stop
+            while not self._stopping.is_set() and self.process.poll() is None:
+                self._stopping.wait(self.poll_interval)
+
+            self._ready.clear()
+            if self._stopping.is_set():
+                return
+
+            if time.monotonic() - started > self.stable_after:
+                backoff = self.backoff_initial
+            LOG.error(
+                "💥 %s exited (code=%s); restarting in %.1fs",
+                self.name,
+                self.process.returncode,
+                backoff,
+            )
+            self.restarts += 1
+            self._stopping.wait(backoff)
+            backoff = min(backoff * 2, self.backoff_max)
+
+    def start(self) -> "ProcessSupervisor":
+        if self._thread is None:
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._run, name=f"{self.name.lower()}-supervisor", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: float = 10) -> None:
+        self._stopping.set()
+        proc = self.process
+        if proc is not None and proc.poll() is None:
+            LOG.info("🛑 Stopping %s...", self.name)
+            proc.terminate()
+            try:
+                proc.wait(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self._ready.clear()
@@ -0,0 +1,156 @@
+# intelligence/resource_governor.py
+# CPU thread budget for model inference, applied once per process.
+#
+# Every gunicorn worker that runs torch / onnxruntime would otherwise start an
+# intra-op pool as wide as the machine, so N workers put N x cores threads on
+# `cores` CPUs and tail latency collapses. The governor splits the CPUs the
+# process may actually use (affinity mask and cgroup quota) between the
+# workers:
+#
+#   intra-op threads = usable CPUs // workers   (INFERENCE_THREADS overrides)
+#   inter-op threads = INFERENCE_INTEROP_THREADS (1: BERT-style graphs are sequential)
+#
+# and, with INFERENCE_PIN_CPUS=true, pins worker i to its own slice of CPUs.
+# The OMP/MKL/OpenBLAS variables are set too, so they only take effect if
+# apply() runs before torch / numpy are imported (gunicorn post_fork, sidecar
+# start); torch and onnxruntime are also configured directly when a model loads.
+
+import os
+import math
+import logging
+from typing import Any, Dict, List, Optional
+
+LOG = logging.getLogger(__name__)
+
+# processes sharing this host's CPUs for inference (gunicorn workers)
+INFERENCE_WORKERS = int(os.getenv("INFERENCE_WORKERS", os.getenv("WORKERS", 1)))
+INFERENCE_THREADS = int(os.getenv("INFERENCE_THREADS", 0))   # 0 = usable CPUs // workers
+INFERENCE_INTEROP_THREADS = int(os.getenv("INFERENCE_INTEROP_THREADS", 1))
+INFERENCE_PIN_CPUS = os.getenv("INFERENCE_PIN_CPUS", "false").lower() in ("1", "true", "yes")
+
+_THREAD_ENV = ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS", "NUMEXPR_NUM_THREADS")
+
+
+def _cgroup_cpu_limit() -> Optional[float]:
+    # cgroup v2 "quota period" / v1 cfs files; None when unlimited or unknown
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()[:2]
+        if quota != "max":
+            return int(quota) / int(period)
+    except (OSError, ValueError):
+        pass
+    try:
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_quota_us") as f:
+            quota = int(f.read())
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_period_us") as f:
+            period = int(f.read())
+        if quota > 0:
+            return quota / period
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def available_cpus() -> List[int]:
+    """
+    CPU ids this process may run on, trimmed to the cgroup quota.
+    """
+    if hasattr(os, "sched_getaffinity"):
+        cpus = sorted(os.sched_getaffinity(0))
+    else:
+        cpus = list(range(os.cpu_count() or 1))
+    limit = _cgroup_cpu_limit()
+    if limit is not None:
+        cpus = cpus[:max(1, math.ceil(limit))]
+    return cpus
+
+
+class ResourceGovernor:
+    def __init__(
+        self,
+        workers: int = INFERENCE_WORKERS,
+        threads: int = INFERENCE_THREADS,
+        interop_threads: int = INFERENCE_INTEROP_THREADS,
+        pin_cpus: bool = INFERENCE_PIN_CPUS,
+        cpus: Optional[List[int]] = None,
+    ):
+        self.cpus = cpus if cpus is not None else available_cpus()
+        self.workers = max(1, workers)
+        self.intra_threads = threads if threads > 0 else max(1, len(self.cpus) // self.workers)
+        self.interop_threads = max(1, interop_threads)
+        self.pin_cpus = pin_cpus
+        self.pinned: List[int] = []
+        self._torch_configured = False
+
+    def cpu_slice(self, worker_index: int) -> List[int]:
+        """
+        CPUs for worker `worker_index`: `intra_threads` consecutive CPUs,
+        wrapping around when workers x threads exceeds the CPU count.
+        """
+        start = (worker_index * self.intra_threads) % len(self.cpus)
+        return [self.cpus[(start + i) % len(self.cpus)] for i in range(min(self.intra_threads, len(self.cpus)))]
+
+    def apply(self, worker_index: Optional[int] = None) -> "ResourceGovernor":
+        for var in _THREAD_ENV:
+            os.environ[var] = str(self.intra_threads)
+        # HF fast tokenizers run their own Rust pool per process
+        os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+
+        if self.pin_cpus and worker_index is not None and hasattr(os, "sched_setaffinity"):
+            self.pinned = self.cpu_slice(worker_index)
+            try:
+                os.sched_setaffinity(0, self.pinned)
+            except OSError as e:
+                LOG.warning("CPU pinning failed for worker %s: %s", worker_index, e)
+                self.pinned = []
+
+        LOG.info(
+            "Inference budget: %s intra-op / %s inter-op threads (cpus=%s workers=%s pinned=%s)",
+            self.intra_threads, self.interop_threads, len(self.cpus), self.workers, self.pinned or "no",
+        )
+        return self
+
+    def configure_torch(self, torch: Any) -> None:
+        if self._torch_configured:
+            return
+        torch.set_num_threads(self.intra_threads)
+        try:
+            torch.set_num_interop_threads(self.interop_threads)
+        except RuntimeError:
+            # only settable before the first parallel op in this process
+            LOG.debug("torch inter-op threads already fixed at %s", torch.get_num_interop_threads())
+        self._torch_configured = True
+
+    def configure_onnx(self, options: Any, threads: int = 0) -> None:
+        options.intra_op_num_threads = threads if threads > 0 else self.intra_threads
+        options.inter_op_num_threads = self.interop_threads
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "cpus": len(self.cpus),
+            "workers": self.workers,
+            "intra_threads": self.intra_threads,
+            "interop_threads": self.interop_threads,
+            "pinned_cpus": len(self.pinned),
+        }
+
+
+_governor: Optional[ResourceGovernor] = None
+
+
+def govern_process(workers: Optional[int] = None, worker_index: Optional[int] = None) -> ResourceGovernor:
+    """
+    Set this process's inference budget. Call early, before any model is
+    imported: gunicorn post_fork, the sentiment sidecar (workers=1).
+    """
+    global _governor
+    _governor = ResourceGovernor(workers=workers or INFERENCE_WORKERS).apply(worker_index)
+    return _governor
+
+
+def get_resource_governor() -> ResourceGovernor:
+    global _governor
+    if _governor is None:
+        _governor = ResourceGovernor().apply()
+    return _governor
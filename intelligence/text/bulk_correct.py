@@ -0,0 +1,166 @@
+# intelligence/text/bulk_correct.py
+# Bulk pre-processing with the rule-based text corrector (no LLM).
+#
+#   text  one message per line (chat log export, ...), streamed in chunks of
+#         --batch lines through text_corrector.correct_batch, so memory stays
+#         flat
+#   nlu   a Rasa NLU file: only words in the known typo / abbreviation maps
+#         (COMMON_TYPOS, BANK_ABBREVIATIONS) are replaced, keeping their case.
+#         There is no fuzzy step and no lowercasing. Entity annotations
+#         ("[savings](account_type)") and everything else are kept verbatim
+#
+#   python -m intelligence.text.bulk_correct text --input chats.txt --output chats.clean.txt
+#   python -m intelligence.text.bulk_correct nlu                                   # diff only
+#   python -m intelligence.text.bulk_correct nlu --output /tmp/nlu.corrected.yml
+#
+# Rasa training data contains typos on purpose, so nlu mode prints a unified
+# diff by default and writes nothing. Review it, then write with --output.
+
+import re
+import sys
+import time
+import difflib
+import argparse
+from itertools import islice
+from pathlib import Path
+from typing import Iterator, List, TextIO, Tuple
+
+from intelligence.text.text_corrector import (
+    BANK_ABBREVIATIONS,
+    COMMON_TYPOS,
+    correct_batch,
+    correction_cache_stats,
+)
+
+NLU_PATH = Path(__file__).resolve().parents[2] / "rasa" / "data" / "nlu.yml"
+
+_EXAMPLE = re.compile(r"^(\s*- )(.*)$")
+# same annotation forms as benchmarks/nlu_corpus.py
+_ENTITY = re.compile(r"\[[^\]]+\](?:\([^)]*\)|\{[^}]*\})")
+
+# typos win over abbreviations, as in text_corrector.fuzzy_fix
+_KNOWN = {k: v for k, v in {**BANK_ABBREVIATIONS, **COMMON_TYPOS}.items() if k != v}
+_KNOWN_WORD = re.compile(
+    r"(?<![\w/])(?:%s)(?![\w/])" % "|".join(re.escape(w) for w in sorted(_KNOWN, key=len, reverse=True)),
+    re.IGNORECASE,
+)
+
+
+def _chunks(lines: Iterator[str], size: int) -> Iterator[List[str]]:
+    while True:
+        chunk = list(islice(lines, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def correct_stream(src: TextIO, dst: TextIO, batch: int) -> Tuple[int, int]:
+    """
+    Correct `src` line by line into `dst`. Returns (lines, lines changed).
+    """
+    lines = changed = 0
+    for chunk in _chunks((line.rstrip("\n") for line in src), batch):
+        for before, after in zip(chunk, correct_batch(chunk)):
+            dst.write(after + "\n")
+            changed += after != before
+        lines += len(chunk)
+    return lines, changed
+
+
+def _split_example(text: str) -> List[Tuple[bool, str]]:
+    """
+    [(is_entity, segment)] covering `text`.
+    """
+    parts, pos = [], 0
+    for m in _ENTITY.finditer(text):
+        if m.start() > pos:
+            parts.append((False, text[pos:m.start()]))
+        parts.append((True, m.group(0)))
+        pos = m.end()
+    if pos < len(text):
+        parts.append((False, text[pos:]))
+    return parts
+
+
+def _fix_word(m: "re.Match") -> str:
+    word = m.group(0)
+    if len(word) > 1 and word.isupper():
+        return word                       # an acronym ("UPI ID", "AC"), not an abbreviation
+    fix = _KNOWN[word.lower()]
+    return fix[:1].upper() + fix[1:] if word[:1].isupper() else fix
+
+
+def fix_known_words(text: str) -> str:
+    """
+    `text` with known typos / abbreviations replaced; everything else,
+    including case and spacing, untouched.
+    """
+    return _KNOWN_WORD.sub(_fix_word, text)
+
+
+def correct_nlu(path: Path) -> Tuple[List[str], List[Tuple[str, str]]]:
+    """
+    Lines of a Rasa NLU file with fix_known_words() applied to the intent
+    examples, and the (before, after) examples that changed.
+    """
+    lines = path.read_text(encoding="utf-8").splitlines()
+    slots: List[Tuple[int, List[Tuple[bool, str]]]] = []
+    in_intent = False
+    for i, line in enumerate(lines):
+        if line.startswith("- "):
+            in_intent = line.startswith("- intent:")
+            continue
+        m = _EXAMPLE.match(line)
+        if in_intent and m and line.startswith(" "):
+            slots.append((i, _split_example(m.group(2))))
+
+    changes = []
+    for i, parts in slots:
+        prefix, before = _EXAMPLE.match(lines[i]).groups()
+        after = "".join(seg if is_entity else fix_known_words(seg) for is_entity, seg in parts)
+        if after != before:
+            changes.append((before, after))
+            lines[i] = prefix + after
+    return lines, changes
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk rule-based text correction")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_text = sub.add_parser("text", help="one message per line")
+    p_text.add_argument("--input", type=Path, default=None, help="default: stdin")
+    p_text.add_argument("--output", type=Path, default=None, help="default: stdout")
+    p_text.add_argument("--batch", type=int, default=1000)
+
+    p_nlu = sub.add_parser("nlu", help="correct the intent examples of a Rasa NLU file")
+    p_nlu.add_argument("--input", type=Path, default=NLU_PATH)
+    p_nlu.add_argument("--output", type=Path, default=None, help="write the corrected file here (default: print a diff)")
+
+    args = parser.parse_args()
+    start = time.perf_counter()
+    if args.command == "text":
+        src = args.input.open(encoding="utf-8") if args.input else sys.stdin
+        dst = args.output.open("w", encoding="utf-8") if args.output else sys.stdout
+        try:
+            total, changed = correct_stream(src, dst, args.batch)
+        finally:
+            if args.input:
+                src.close()
+            if args.output:
+                dst.close()
+    else:
+        lines, changes = correct_nlu(args.input)
+        total, changed = len(lines), len(changes)
+        if args.output:
+            args.output.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        else:
+            original = args.input.read_text(encoding="utf-8").splitlines()
+            sys.stdout.writelines(
+                line + "\n"
+                for line in difflib.unified_diff(original, lines, str(args.input), "corrected", lineterm="")
+            )
+
+    elapsed = time.perf_counter() - start
+    stats = f"; token cache {correction_cache_stats()}" if args.command == "text" else ""
+    print(f"{total} lines, {changed} changed in {elapsed:.2f}s{stats}", file=sys.stderr)
@@ -0,0 +1,137 @@
+# intelligence/text/correction_index.py
+# Precomputed lookup for text_corrector.fuzzy_fix (SymSpell-style).
+#
+# fuzzy_fix accepts a vocabulary word when difflib's ratio 2*M/(len(a)+len(b))
+# reaches a cutoff. M never exceeds the longest common subsequence, so a word
+# can only qualify if it shares a subsequence with the token that is at most
+# `len(token) - ceil(cutoff * (len(token) + len(word)) / 2)` deletions away
+# from the token. The index stores EVERY subsequence of every vocabulary word
+# (the vocabulary is small, so this is a few thousand keys) and a query only
+# generates the token's deletions up to that depth. Candidates are then scored
+# with the same SequenceMatcher.ratio() and tie-break as get_close_matches, so
+# results are identical, only without scanning the vocabulary for every
+# token (and every vowel-fill guess).
+#
+# Tokens that would need more than MAX_QUERY_DELETES deletions (long tokens)
+# are compared against the words whose length can reach the cutoff at all,
+# which for such tokens is only a handful of long words.
+
+import math
+from collections import Counter
+from difflib import SequenceMatcher
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+MAX_QUERY_DELETES = 2
+
+
+def _subsequences(word: str) -> Set[str]:
+    out = {word}
+    frontier = {word}
+    while frontier:
+        frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))} - out
+        out |= frontier
+    return out
+
+
+def _deletes(token: str, depth: int) -> Set[str]:
+    out = {token}
+    level = {token}
+    for _ in range(depth):
+        level = {w[:i] + w[i + 1:] for w in level for i in range(len(w))}
+        out |= level
+    return out
+
+
+class DeletionIndex:
+    """
+    Answers get_close_matches(token, vocab, n=1, cutoff)[0] (or None)
+    without scanning the vocabulary.
+    """
+
+    def __init__(self, vocab: Iterable[str]):
+        self.vocab = sorted(set(vocab))
+        self.lengths = sorted({len(w) for w in self.vocab})
+        self._by_subsequence: Dict[str, Set[str]] = {}
+        for word in self.vocab:
+            for sub in _subsequences(word):
+                self._by_subsequence.setdefault(sub, set()).add(word)
+        self._counts = {word: Counter(word) for word in self.vocab}
+        self._plans: Dict[Tuple[int, float], Tuple[int, FrozenSet[str]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._by_subsequence)
+
+    def _plan(self, length: int, cutoff: float) -> Tuple[int, FrozenSet[str]]:
+        """
+        (query deletion depth, words long/short enough to reach cutoff)
+        """
+        key = (length, cutoff)
+        plan = self._plans.get(key)
+        if plan is None:
+            depth = -1
+            words = []
+            for word in self.vocab:
+                needed = math.ceil(cutoff * (length + len(word)) / 2 - 1e-9)
+                if needed <= min(length, len(word)):
+                    words.append(word)
+                    depth = max(depth, length - needed)
+            plan = (depth, frozenset(words))
+            self._plans[key] = plan
+        return plan
+
+    def candidates(self, token: str, cutoff: float) -> FrozenSet[str]:
+        depth, eligible = self._plan(len(token), cutoff)
+        if depth < 0 or depth > MAX_QUERY_DELETES:
+            return eligible
+        found: Set[str] = set()
+        for sub in _deletes(token, depth):
+            words = self._by_subsequence.get(sub)
+            if words:
+                found |= words
+        return frozenset(found & eligible)
+
+    def best(self, token: str, cutoff: float, candidates: Optional[Iterable[str]] = None) -> Optional[str]:
+        """
+        Same result as difflib.get_close_matches(token, vocab, n=1, cutoff).
+        """
+        if candidates is None:
+            candidates = self.candidates(token, cutoff)
+        s = SequenceMatcher()
+        s.set_seq2(token)
+        best = None
+        for word in candidates:
+            s.set_seq1(word)
+            # quick_ratio() bounds ratio() from above and is much cheaper
+            if s.quick_ratio() < cutoff:
+                continue
+            score = s.ratio()
+            if score >= cutoff and (best is None or (score, word) > best):
+                best = (score, word)
+        return best[1] if best else None
+
+    def best_with_insert(self, token: str, guesses: List[str], cutoff: float) -> Optional[str]:
+        """
+        best() of the first guess that has a match, where every guess is
+        `token` with one character inserted. A guess shares at most one more
+        character with a word than the token does, which rules out most
+        words for all guesses at once.
+        """
+        if not guesses:
+            return None
+        length = len(token) + 1
+        _, eligible = self._plan(length, cutoff)
+        counts = Counter(token)
+        words = [
+            w for w in eligible
+            if sum((counts & self._counts[w]).values()) + 1 >= math.ceil(cutoff * (length + len(w)) / 2 - 1e-9)
+        ]
+        if not words:
+            return None
+        for guess in guesses:
+            close = self.best(guess, cutoff, words)
+            if close:
+                return close
+        return None
+
+    def stats(self) -> Dict[str, int]:
+        return {"words": len(self.vocab), "keys": len(self._by_subsequence), "plans": len(self._plans)}
@@ -2,12 +2,15 @@
 import os
 import re
 import json
-import requests
 from difflib import get_close_matches
-from typing import List, Optional
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional
 from pathlib import Path
 from dotenv import load_dotenv
 
+from intelligence.llm_client import complete_sync
+from intelligence.text.correction_index import DeletionIndex
+
 load_dotenv()
 
 
@@ -58,6 +61,10 @@ DOMAIN_VOCAB = list({
 
 VOWEL_CANDIDATES = ["a", "e", "i", "o", "u"]
 
+# Distinct tokens in banking chat are few; remember each one's correction
+# (bounded LRU, per process; 0 disables it)
+TEXT_CORRECTION_CACHE_SIZE = int(os.getenv("TEXT_CORRECTION_CACHE_SIZE", 50000))
+
 
 def attempt_vowel_fill(word: str) -> List[str]:
     results = set()
@@ -76,7 +83,49 @@ def clean_text_basic(text: str) -> str:
     return text
 
 
+# Built once at import: typo / abbreviation maps merged (typos win, as in the
+# lookup order below) and a deletion index over DOMAIN_VOCAB.
+_EXACT = {**BANK_ABBREVIATIONS, **COMMON_TYPOS}
+_INDEX = DeletionIndex(DOMAIN_VOCAB)
+
+
+def _vowel_guesses(word: str) -> List[str]:
+    # attempt_vowel_fill in a fixed order (it returns a set's order)
+    if any(v in word for v in VOWEL_CANDIDATES):
+        return []
+    return [word[:i] + v + word[i:] for i in range(len(word) + 1) for v in VOWEL_CANDIDATES]
+
+
 def fuzzy_fix(token: str) -> str:
+    token = token or ""
+    exact = _EXACT.get(token)
+    if exact is not None:
+        return exact
+    if len(token) >= 5:
+        close = _INDEX.best(token, 0.78)
+        if close:
+            return close
+    if 3 <= len(token) <= 4:
+        close = _INDEX.best(token, 0.60)
+        if close:
+            return close
+    close = _INDEX.best_with_insert(token, _vowel_guesses(token), 0.70)
+    return close or token
+
+
+_fuzzy_fix_cached = lru_cache(maxsize=TEXT_CORRECTION_CACHE_SIZE)(fuzzy_fix)
+
+
+def correction_cache_stats() -> Dict[str, int]:
+    info = _fuzzy_fix_cached.cache_info()
+    return {"hits": info.hits, "misses": info.misses, "size": info.currsize, "maxsize": info.maxsize or 0}
+
+
+def fuzzy_fix_difflib(token: str) -> str:
+    """
+    Original linear-scan fuzzy_fix, kept as the reference implementation
+    for benchmarks/bench_fuzzy_fix.py (golden compatibility check).
+    """
     token = token or ""
     if token in COMMON_TYPOS:
         return COMMON_TYPOS[token]
@@ -108,44 +157,16 @@ def _build_gemini_prompt(user_text: str) -> str:
 
 
 
-def call_llm_endpoint(prompt: str, timeout: int = 8) -> Optional[str]:
-
-    url = os.getenv("LLM_API_URL")   # For gemini must contain the API key
-    if not url:
-        return None
-
-    # Gemini-format request
-    body = {
-        "contents": [
-            {
-                "parts": [
-                    {"text": prompt}
-                ]
-            }
-        ]
-    }
-
-    headers = {"Content-Type": "application/json"}
-
-    try:
-        resp = requests.post(url, headers=headers, json=body, timeout=timeout)
-        resp.raise_for_status()
-        data = resp.json()
-
-        if "candidates" in data:
-            cand = data["candidates"][0]
-            parts = cand.get("content", {}).get("parts", [])
-            if parts and "text" in parts[0]:
-                return parts[0]["text"].strip()
-
-        return None
+def call_llm_endpoint(prompt: str, timeout: Optional[float] = None) -> Optional[str]:
+    """
+    Correction prompt through the shared LLM client (cached, breaker-guarded).
+    `timeout` overrides the client's deadline (LLM_DEADLINE_SECONDS).
+    """
+    return complete_sync("correction", prompt, deadline=timeout)
 
-    except Exception:
-        return None
 
 
-
-def correct_typos_using_llm(text: str, timeout: int = 6) -> Optional[str]:
+def correct_typos_using_llm(text: str, timeout: Optional[float] = None) -> Optional[str]:
     use_llm = os.getenv("USE_LLM_CORRECTION", "false").lower() in ("1", "true", "yes")
     if not use_llm:
         return None
@@ -167,5 +188,19 @@ def correct_typos(text: str) -> str:
 
     clean = clean_text_basic(text)
     tokens = clean.split()
-    corrected = [fuzzy_fix(t) for t in tokens]
+    corrected = [_fuzzy_fix_cached(t) for t in tokens]
     return " ".join(corrected)
+
+
+def correct_batch(texts: Iterable[str]) -> List[str]:
+    """
+    Rule-based correct_typos() for many texts at once (no LLM call):
+    repeated texts are corrected once, and so is each distinct token in the
+    batch, through the shared token cache. Output order matches input order.
+    """
+    texts = list(texts)
+    distinct = list(dict.fromkeys(texts))
+    tokenized = [clean_text_basic(t).split() for t in distinct]
+    fixes = {tok: _fuzzy_fix_cached(tok) for tok in {t for tokens in tokenized for t in tokens}}
+    corrected = {text: " ".join(fixes[t] for t in tokens) for text, tokens in zip(distinct, tokenized)}
+    return [corrected[t] for t in texts]
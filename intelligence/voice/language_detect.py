@@ -0,0 +1,118 @@
+# intelligence/voice/language_detect.py
+# Tiered language detection for voice_i18n.detect_language.
+#
+#   1. script histogram: the text's code points are bucketed by Unicode block
+#      in one numpy pass (Latin / Devanagari / Bengali / other scripts / not a
+#      letter). Devanagari -> hi, Bengali -> bn, no letters -> default. Indic
+#      text routinely carries Latin words ("मेरा ATM card block करो"), so an
+#      Indic script wins once it is INDIC_MIN_SHARE of the letters.
+#   2. Latin-script text can only be ambiguous when more than one supported
+#      language is written in Latin; then (and only then) langdetect decides
+#      between them, with a fixed seed so the answer is the same every call.
+#
+# Results are always one of the supported languages (or the default).
+
+import os
+import threading
+from typing import Dict, Iterable, List
+
+import numpy as np
+
+INDIC_MIN_SHARE = float(os.getenv("LANG_DETECT_INDIC_MIN_SHARE", 0.2))
+LANGDETECT_SEED = 0
+
+# languages written in Latin script that langdetect can tell apart
+LATIN_SCRIPT_LANGS = {
+    "en", "es", "fr", "de", "pt", "it", "nl", "id", "ms", "tl", "sw", "tr", "vi", "pl", "ro",
+}
+
+# bucket ids
+NONE, LATIN, DEVANAGARI, BENGALI, OTHER = range(5)
+BUCKET_LANG = {DEVANAGARI: "hi", BENGALI: "bn"}
+
+# (first code point, bucket) - each range runs up to the next entry
+_BLOCKS = [
+    (0x0000, NONE),
+    (0x0041, LATIN), (0x005B, NONE),           # A-Z
+    (0x0061, LATIN), (0x007B, NONE),           # a-z
+    (0x00C0, LATIN), (0x00D7, NONE),           # Latin-1 letters (minus × and ÷)
+    (0x00D8, LATIN), (0x00F7, NONE),
+    (0x00F8, LATIN), (0x0250, NONE),           # ... Latin Extended-A/B
+    (0x0370, OTHER),                           # Greek, Cyrillic, Hebrew, Arabic, ...
+    (0x0900, DEVANAGARI),
+    (0x0980, BENGALI),
+    (0x0A00, OTHER),                           # Gurmukhi, Gujarati, Tamil, ..., Thai, ...
+    (0x1E00, LATIN), (0x1F00, OTHER),          # Latin Extended Additional (Vietnamese)
+    (0x2000, NONE),                            # punctuation, symbols, arrows
+    (0x3040, OTHER),                           # kana, CJK, Hangul
+    (0xD7B0, NONE),                            # surrogates, private use, forms
+    (0xFF21, LATIN), (0xFF3B, NONE),           # full-width A-Z
+    (0xFF41, LATIN), (0xFF5B, NONE),           # full-width a-z
+    (0x10000, NONE),                           # emoji and the rest of the astral planes
+]
+_STARTS = np.array([start for start, _ in _BLOCKS], dtype=np.uint32)
+_BUCKETS = np.array([bucket for _, bucket in _BLOCKS], dtype=np.intp)
+
+
+def script_histogram(text: str) -> np.ndarray:
+    """
+    Code point count per bucket (NONE, LATIN, DEVANAGARI, BENGALI, OTHER).
+    """
+    # lone surrogates (broken client input) land in the NONE bucket
+    codes = np.frombuffer(text.encode("utf-32-le", errors="surrogatepass"), dtype=np.uint32)
+    buckets = _BUCKETS[np.searchsorted(_STARTS, codes, side="right") - 1]
+    return np.bincount(buckets, minlength=OTHER + 1)
+
+
+_langdetect_lock = threading.Lock()
+_langdetect_ready = False
+
+
+def _langdetect_probabilities(text: str) -> Dict[str, float]:
+    global _langdetect_ready
+    from langdetect import DetectorFactory, detect_langs
+    from langdetect.lang_detect_exception import LangDetectException
+
+    with _langdetect_lock:
+        if not _langdetect_ready:
+            DetectorFactory.seed = LANGDETECT_SEED
+            _langdetect_ready = True
+        try:
+            return {r.lang: r.prob for r in detect_langs(text)}
+        except LangDetectException:
+            return {}
+
+
+def detect_script_language(text: str, supported: Iterable[str], default: str) -> str:
+    """
+    One of `supported` (or `default`) for `text`; see the module comment.
+    """
+    supported = set(supported)
+    if not text or not text.strip():
+        return default
+    counts = script_histogram(text)
+    letters = int(counts[LATIN] + counts[DEVANAGARI] + counts[BENGALI] + counts[OTHER])
+    if letters == 0:
+        return default
+
+    indic = DEVANAGARI if counts[DEVANAGARI] >= counts[BENGALI] else BENGALI
+    if counts[indic] and counts[indic] >= INDIC_MIN_SHARE * letters:
+        lang = BUCKET_LANG[indic]
+        return lang if lang in supported else default
+    if counts[OTHER] > counts[LATIN]:
+        return default
+
+    latin = sorted(supported & LATIN_SCRIPT_LANGS)
+    if not latin:
+        return default
+    if len(latin) == 1:
+        return latin[0]
+    return _pick_latin(text, latin, default)
+
+
+def _pick_latin(text: str, candidates: List[str], default: str) -> str:
+    probabilities = _langdetect_probabilities(text)
+    best = max(candidates, key=lambda lang: probabilities.get(lang, 0.0))
+    if probabilities.get(best, 0.0) > 0.0:
+        return best
+    return default if default in candidates else candidates[0]
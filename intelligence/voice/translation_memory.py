@@ -0,0 +1,284 @@
+# intelligence/voice/translation_memory.py
+# Translation memory for bot responses.
+#
+# Most of what the bot says is canned text from the `responses:` section of
+# rasa/domain.yml, so translations are produced once, at build time, and
+# stored in SQLite keyed by (source hash, target language). At runtime the
+# whole table is loaded into dicts; translate_text() looks there first and
+# only calls the LLM on a miss.
+#
+# Responses with slots ("... linked to {email} ...") are stored as templates:
+# the translation keeps the {placeholders}, and a filled-in message is matched
+# against the template and the slot values are put back in.
+#
+#   python -m intelligence.voice.translation_memory build              # hi + bn, needs LLM_API_URL
+#   python -m intelligence.voice.translation_memory build --force      # re-translate everything
+#   python -m intelligence.voice.translation_memory stats              # coverage, hit ratio, lookup latency
+
+import os
+import re
+import sys
+import time
+import sqlite3
+import asyncio
+import hashlib
+import logging
+import argparse
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Pattern, Tuple
+
+import yaml
+from dotenv import load_dotenv
+
+LOG = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+load_dotenv(dotenv_path=PROJECT_ROOT / ".env")
+
+DOMAIN_PATH = PROJECT_ROOT / "rasa" / "domain.yml"
+TRANSLATION_MEMORY_PATH = os.getenv("TRANSLATION_MEMORY_PATH") or str(PROJECT_ROOT / ".cache" / "translation_memory.db")
+USE_TRANSLATION_MEMORY = os.getenv("USE_TRANSLATION_MEMORY", "true").lower() in ("1", "true", "yes")
+
+BUILD_LANGS = ("hi", "bn")
+LANG_NAMES = {"en": "English", "hi": "Hindi", "bn": "Bengali"}
+
+_PLACEHOLDER = re.compile(r"\{(\w+)\}")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS translation_memory (
+    source_hash TEXT NOT NULL,
+    lang        TEXT NOT NULL,
+    source      TEXT NOT NULL,
+    translation TEXT NOT NULL,
+    created     REAL NOT NULL,
+    PRIMARY KEY (source_hash, lang)
+)
+"""
+
+
+def normalize_source(text: str) -> str:
+    # YAML block scalars keep trailing "  " / final newlines; they are not content
+    return " ".join(text.split())
+
+
+def source_hash(text: str) -> str:
+    return hashlib.sha256(normalize_source(text).encode("utf-8")).hexdigest()
+
+
+def _template_pattern(source: str) -> Pattern:
+    parts = _PLACEHOLDER.split(normalize_source(source))
+    # split() alternates literal text and placeholder names
+    regex = "".join(
+        re.escape(part) if i % 2 == 0 else f"(?P<{part}>.+?)"
+        for i, part in enumerate(parts)
+    )
+    return re.compile(regex + r"\Z")
+
+
+# =================================================
+# Runtime lookup
+# =================================================
+class TranslationMemory:
+    """
+    Read-mostly view of the translation memory table, held in memory.
+    """
+
+    def __init__(self, path: str = TRANSLATION_MEMORY_PATH):
+        self.path = path
+        self._exact: Dict[Tuple[str, str], str] = {}
+        self._templates: Dict[str, List[Tuple[Pattern, str]]] = {}
+        self._lock = threading.Lock()
+        self.lookups = 0
+        self.hits = 0
+        self.template_hits = 0
+        self.lookup_seconds = 0.0
+        self.max_lookup_seconds = 0.0
+        self.load()
+
+    def load(self) -> None:
+        exact: Dict[Tuple[str, str], str] = {}
+        templates: Dict[str, List[Tuple[Pattern, str]]] = {}
+        if Path(self.path).exists():
+            try:
+                conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True)
+                try:
+                    rows = conn.execute("SELECT source_hash, lang, source, translation FROM translation_memory").fetchall()
+                finally:
+                    conn.close()
+            except sqlite3.Error as e:
+                LOG.warning("Translation memory %s not loaded: %s", self.path, e)
+                rows = []
+            for digest, lang, source, translation in rows:
+                exact[(digest, lang)] = translation
+                if _PLACEHOLDER.search(source):
+                    templates.setdefault(lang, []).append((_template_pattern(source), translation))
+            LOG.info("📚 Translation memory: %d entries from %s", len(exact), self.path)
+        else:
+            LOG.info("Translation memory %s not built yet; every translation goes to the LLM", self.path)
+        with self._lock:
+            self._exact, self._templates = exact, templates
+
+    def __len__(self) -> int:
+        return len(self._exact)
+
+    def lookup(self, text: str, lang: str) -> Optional[str]:
+        start = time.perf_counter()
+        result = self._exact.get((source_hash(text), lang))
+        template_hit = False
+        if result is None and lang in self._templates:
+            normalized = normalize_source(text)
+            for pattern, translation in self._templates[lang]:
+                m = pattern.match(normalized)
+                if m:
+                    result = _PLACEHOLDER.sub(lambda p: m.groupdict().get(p.group(1), p.group(0)), translation)
+                    template_hit = True
+                    break
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self.lookups += 1
+            self.hits += result is not None
+            self.template_hits += template_hit
+            self.lookup_seconds += elapsed
+            self.max_lookup_seconds = max(self.max_lookup_seconds, elapsed)
+        return result
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "entries": len(self._exact),
+            "lookups": self.lookups,
+            "hits": self.hits,
+            "template_hits": self.template_hits,
+            "hit_ratio": round(self.hits / self.lookups, 4) if self.lookups else 0.0,
+            "mean_lookup_us": round(self.lookup_seconds / self.lookups * 1e6, 2) if self.lookups else 0.0,
+            "max_lookup_us": round(self.max_lookup_seconds * 1e6, 2),
+        }
+
+
+_memory: Optional[TranslationMemory] = None
+_memory_lock = threading.Lock()
+
+
+def get_translation_memory() -> TranslationMemory:
+    global _memory
+    if _memory is None:
+        with _memory_lock:
+            if _memory is None:
+                _memory = TranslationMemory()
+    return _memory
+
+
+# =================================================
+# Build time
+# =================================================
+def load_domain_responses(path: Path = DOMAIN_PATH) -> List[str]:
+    """
+    Distinct response texts of a Rasa domain file, in file order.
+    """
+    domain = yaml.safe_load(path.read_text(encoding="utf-8")) or {}
+    texts: Dict[str, None] = {}
+    for variants in (domain.get("responses") or {}).values():
+        for variant in variants or []:
+            text = (variant or {}).get("text")
+            if text and text.strip():
+                texts.setdefault(text.strip(), None)
+    return list(texts)
+
+
+def _build_prompt(lang: str) -> str:
+    return (
+        f"You translate a banking assistant's replies from English to {LANG_NAMES.get(lang, lang)}. "
+        "Keep HTML tags, URLs, emoji, numbers, line breaks and anything in {curly braces} exactly as they are. "
+        "Return ONLY the translated text and nothing else."
+    )
+
+
+async def _translate_all(todo: List[Tuple[str, str]], concurrency: int) -> List[Optional[str]]:
+    from intelligence.llm_client import get_llm_client
+
+    client = get_llm_client()
+    if not client.configured:
+        raise SystemExit("LLM_API_URL is not set; cannot build the translation memory")
+    # stay under the provider's rate limit; a 429 would open the breaker
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one(text: str, lang: str) -> Optional[str]:
+        async with sem:
+            return await client.complete("domain_translation", text, system=_build_prompt(lang), target=lang)
+
+    try:
+        return await asyncio.gather(*(one(text, lang) for text, lang in todo))
+    finally:
+        await client.aclose()
+
+
+def build(path: str, domain: Path, langs: List[str], force: bool, concurrency: int = 4) -> Tuple[int, int, int]:
+    """
+    Translate every domain response missing from the memory.
+    Returns (stored, already present, failed).
+    """
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path)
+    try:
+        conn.execute(SCHEMA)
+        have = {(h, lang) for h, lang in conn.execute("SELECT source_hash, lang FROM translation_memory")}
+        texts = load_domain_responses(domain)
+        todo = [
+            (text, lang) for text in texts for lang in langs
+            if force or (source_hash(text), lang) not in have
+        ]
+        present = len(texts) * len(langs) - len(todo)
+        results = asyncio.run(_translate_all(todo, concurrency)) if todo else []
+
+        rows, failed = [], 0
+        for (text, lang), translation in zip(todo, results):
+            # a translation that lost a slot placeholder cannot be filled in later
+            if not translation or set(_PLACEHOLDER.findall(text)) - set(_PLACEHOLDER.findall(translation)):
+                LOG.warning("No usable %s translation for: %.60r", lang, text)
+                failed += 1
+                continue
+            rows.append((source_hash(text), lang, normalize_source(text), translation, time.time()))
+        with conn:
+            conn.executemany("INSERT OR REPLACE INTO translation_memory VALUES (?, ?, ?, ?, ?)", rows)
+        return len(rows), present, failed
+    finally:
+        conn.close()
+
+
+def report(memory: TranslationMemory, domain: Path, langs: List[str]) -> None:
+    """
+    Coverage of the domain responses, then the lookup cost for hits and misses.
+    """
+    texts = load_domain_responses(domain)
+    for lang in langs:
+        covered = sum(memory.lookup(t, lang) is not None for t in texts)
+        print(f"{lang}: {covered}/{len(texts)} domain responses translated")
+    # a filled-in template and free text the memory cannot know
+    probes = [_PLACEHOLDER.sub("xyz@example.com", t) for t in texts if _PLACEHOLDER.search(t)]
+    probes += [f"free text message number {i}" for i in range(len(texts))]
+    for lang in langs:
+        for text in probes:
+            memory.lookup(text, lang)
+    print(f"{len(texts) * len(langs)} domain + {len(probes) * len(langs)} probe lookups: {memory.stats()}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    parser = argparse.ArgumentParser(description="Translation memory for rasa/domain.yml responses")
+    parser.add_argument("--db", default=TRANSLATION_MEMORY_PATH)
+    parser.add_argument("--domain", type=Path, default=DOMAIN_PATH)
+    parser.add_argument("--langs", nargs="+", default=list(BUILD_LANGS))
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_build = sub.add_parser("build", help="pre-translate every domain response")
+    p_build.add_argument("--force", action="store_true", help="re-translate entries that already exist")
+    p_build.add_argument("--concurrency", type=int, default=4, help="LLM calls in flight")
+    sub.add_parser("stats", help="coverage, hit ratio and lookup latency")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        start = time.perf_counter()
+        stored, present, failed = build(args.db, args.domain, args.langs, args.force, args.concurrency)
+        print(f"{stored} stored, {present} already present, {failed} failed in {time.perf_counter() - start:.1f}s -> {args.db}")
+        sys.exit(1 if failed else 0)
+    report(TranslationMemory(args.db), args.domain, args.langs)
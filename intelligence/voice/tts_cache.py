@@ -0,0 +1,359 @@
+# intelligence/voice/tts_cache.py
+# Content-addressed store for synthesized speech (voice_i18n.speak_response).
+#
+# Audio is keyed by sha256(voice, language, cleaned text) and kept as
+# <TTS_CACHE_DIR>/<2 hex>/<key>.mp3. Files are written to a temp name and
+# renamed into place, so concurrent requests never see half a file or
+# overwrite each other's audio, and every worker process shares the store.
+#
+# The store is an LRU bounded by TTS_CACHE_MAX_MB: a hit refreshes the
+# file's mtime, and when a write pushes the total over the limit the
+# directory is rescanned (other processes write here too) and the least
+# recently used files are removed down to 90% of it.
+#
+# The bot's canned replies can be rendered ahead of time, so speaking them
+# needs no synthesis at request time:
+#
+#   python -m intelligence.voice.tts_cache prerender                  # hi + bn
+#   python -m intelligence.voice.tts_cache prerender --langs hi --workers 8
+#   python -m intelligence.voice.tts_cache stats
+#
+# Only hi / bn go through this cache; speak_response says English locally
+# with pyttsx3. The texts come from the translation memory
+# (python -m intelligence.voice.translation_memory build). Responses with
+# {slot} placeholders are skipped: the filled-in text is never the same twice.
+
+import os
+import re
+import sys
+import time
+import hashlib
+import logging
+import argparse
+import tempfile
+import threading
+from io import BytesIO
+from pathlib import Path
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from dotenv import load_dotenv
+
+LOG = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+load_dotenv(dotenv_path=PROJECT_ROOT / ".env")
+
+TTS_CACHE_DIR = os.getenv("TTS_CACHE_DIR") or str(PROJECT_ROOT / ".cache" / "tts")
+TTS_CACHE_MAX_BYTES = int(os.getenv("TTS_CACHE_MAX_MB", 256)) * 1024 * 1024
+TTS_VOICE_TLD = os.getenv("TTS_VOICE_TLD", "co.in")          # gTTS accent (Google domain)
+
+# a hit refreshes the LRU position at most this often (one utime per file per minute)
+TOUCH_INTERVAL_SECONDS = 60
+LOW_WATERMARK = 0.9
+
+_TAG = re.compile(r"<[^>]+>")
+_SLOT = re.compile(r"\{\w+\}")
+
+
+def clean_for_speech(text: str) -> str:
+    """
+    Text as it is spoken: HTML tags (<br>, links) removed, whitespace collapsed.
+    """
+    return " ".join(_TAG.sub(" ", text or "").split())
+
+
+def _render_gtts(text: str, lang: str) -> bytes:
+    from gtts import gTTS
+
+    buf = BytesIO()
+    gTTS(text=text, lang=lang, tld=TTS_VOICE_TLD).write_to_fp(buf)
+    return buf.getvalue()
+
+
+class TTSCache:
+    """
+    path_for() / bytes_for() / stream() return cached audio, rendering it on
+    a miss. Paths may be evicted later; open them promptly.
+    """
+
+    def __init__(
+        self,
+        root: str = TTS_CACHE_DIR,
+        max_bytes: int = TTS_CACHE_MAX_BYTES,
+        voice: str = f"gtts/{TTS_VOICE_TLD}",
+        render: Callable[[str, str], bytes] = _render_gtts,
+    ):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.voice = voice
+        self.render = render
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, int]" = OrderedDict()   # key -> size, oldest first
+        self._bytes = 0
+        self._rendering: Dict[str, threading.Lock] = {}
+        self.hits = 0
+        self.misses = 0
+        self.failures = 0
+        self.evictions = 0
+        self.render_seconds = 0.0
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._scan()
+
+    # ---------------- keys / files ----------------
+    def key(self, text: str, lang: str) -> str:
+        return hashlib.sha256(f"{self.voice}\x1f{lang}\x1f{clean_for_speech(text)}".encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.mp3"
+
+    def _scan(self) -> None:
+        found: List[Tuple[float, str, int]] = []
+        stale = time.time() - 3600
+        for part in self.root.glob("*/*.part"):
+            # left behind by a process that died mid-write
+            try:
+                if part.stat().st_mtime < stale:
+                    part.unlink()
+            except FileNotFoundError:
+                pass
+        for path in self.root.glob("*/*.mp3"):
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            found.append((st.st_mtime, path.stem, st.st_size))
+        found.sort()
+        with self._lock:
+            self._entries = OrderedDict((key, size) for _, key, size in found)
+            self._bytes = sum(size for _, _, size in found)
+
+    # ---------------- lookup ----------------
+    def get(self, text: str, lang: str) -> Optional[Path]:
+        """
+        Cached audio for (text, lang), or None. Never renders.
+        """
+        key = self.key(text, lang)
+        path = self._path(key)
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            return None
+        now = time.time()
+        if now - st.st_mtime > TOUCH_INTERVAL_SECONDS:
+            try:
+                os.utime(path, (now, now))
+            except FileNotFoundError:
+                return None
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+            else:
+                # rendered by another process
+                self._entries[key] = st.st_size
+                self._bytes += st.st_size
+        return path
+
+    def path_for(self, text: str, lang: str) -> Optional[Path]:
+        """
+        Path of the audio for (text, lang), rendered on a miss.
+        None if there is nothing to say or synthesis failed.
+        """
+        clean = clean_for_speech(text)
+        if not clean:
+            return None
+        path = self.get(clean, lang)
+        if path is not None:
+            self.hits += 1
+            return path
+
+        key = self.key(clean, lang)
+        with self._lock:
+            render_lock = self._rendering.setdefault(key, threading.Lock())
+        # the same text requested concurrently is rendered once
+        try:
+            with render_lock:
+                path = self.get(clean, lang)
+                if path is not None:
+                    self.hits += 1
+                    return path
+                self.misses += 1
+                start = time.perf_counter()
+                try:
+                    audio = self.render(clean, lang)
+                except Exception:
+                    self.failures += 1
+                    LOG.exception("TTS render failed (%s)", lang)
+                    return None
+                finally:
+                    self.render_seconds += time.perf_counter() - start
+                return self.put(key, audio)
+        finally:
+            with self._lock:
+                self._rendering.pop(key, None)
+
+    def bytes_for(self, text: str, lang: str) -> Optional[bytes]:
+        for _ in range(2):
+            path = self.path_for(text, lang)
+            if path is None:
+                return None
+            try:
+                return path.read_bytes()
+            except FileNotFoundError:
+                continue   # evicted between lookup and read; render again
+        return None
+
+    def stream(self, text: str, lang: str, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+        """
+        Audio in chunks (e.g. for a StreamingResponse). Empty if unavailable.
+        """
+        path = self.path_for(text, lang)
+        if path is None:
+            return
+        try:
+            f = path.open("rb")
+        except FileNotFoundError:
+            data = self.bytes_for(text, lang)
+            if data:
+                yield data
+            return
+        # an open file survives eviction
+        with f:
+            while True:
+                block = f.read(chunk_size)
+                if not block:
+                    return
+                yield block
+
+    # ---------------- store / evict ----------------
+    def put(self, key: str, audio: bytes) -> Path:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(audio)
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except FileNotFoundError:
+                pass
+            raise
+        with self._lock:
+            self._bytes += len(audio) - self._entries.pop(key, 0)
+            self._entries[key] = len(audio)
+            over = self._bytes > self.max_bytes
+        if over:
+            self._evict(keep=key)
+        return path
+
+    def _evict(self, keep: str) -> None:
+        self._scan()
+        target = int(self.max_bytes * LOW_WATERMARK)
+        with self._lock:
+            victims = []
+            for key, size in self._entries.items():
+                if self._bytes <= target:
+                    break
+                if key == keep:
+                    continue
+                victims.append(key)
+                self._bytes -= size
+            for key in victims:
+                del self._entries[key]
+        for key in victims:
+            try:
+                self._path(key).unlink()
+                self.evictions += 1
+            except FileNotFoundError:
+                pass
+        if victims:
+            LOG.info("🧹 TTS cache evicted %d files (limit %d MB)", len(victims), self.max_bytes // (1024 * 1024))
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "failures": self.failures,
+            "evictions": self.evictions,
+            "mean_render_ms": round(self.render_seconds / self.misses * 1000, 1) if self.misses else 0.0,
+        }
+
+
+_tts_cache: Optional[TTSCache] = None
+_tts_cache_lock = threading.Lock()
+
+
+def get_tts_cache() -> TTSCache:
+    global _tts_cache
+    if _tts_cache is None:
+        with _tts_cache_lock:
+            if _tts_cache is None:
+                _tts_cache = TTSCache()
+    return _tts_cache
+
+
+# =================================================
+# Pre-rendering
+# =================================================
+def prerender(cache: TTSCache, domain: Path, langs: List[str], workers: int) -> Dict[str, int]:
+    """
+    Render every domain response in every language that is not cached yet.
+    Templates with {slot} placeholders are skipped.
+    """
+    from intelligence.voice.translation_memory import get_translation_memory, load_domain_responses
+
+    memory = get_translation_memory()
+    counts = {"rendered": 0, "cached": 0, "untranslated": 0, "templates": 0, "failed": 0}
+    todo: List[Tuple[str, str]] = []
+    for source in load_domain_responses(domain):
+        if _SLOT.search(source):
+            counts["templates"] += len(langs)
+            continue
+        for lang in langs:
+            text = source if lang == "en" else memory.lookup(source, lang)
+            if not text:
+                counts["untranslated"] += 1
+            elif cache.get(text, lang) is not None:
+                counts["cached"] += 1
+            else:
+                todo.append((text, lang))
+
+    # gTTS is a blocking HTTP call per text; render a few at a time
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for path in pool.map(lambda item: cache.path_for(*item), todo):
+            counts["rendered" if path is not None else "failed"] += 1
+    return counts
+
+
+if __name__ == "__main__":
+    from intelligence.voice.translation_memory import BUILD_LANGS, DOMAIN_PATH
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    parser = argparse.ArgumentParser(description="Content-addressed TTS cache for bot responses")
+    parser.add_argument("--dir", default=TTS_CACHE_DIR)
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_pre = sub.add_parser("prerender", help="render every rasa/domain.yml response")
+    p_pre.add_argument("--domain", type=Path, default=DOMAIN_PATH)
+    p_pre.add_argument("--langs", nargs="+", default=list(BUILD_LANGS))
+    p_pre.add_argument("--workers", type=int, default=4)
+    sub.add_parser("stats", help="entries and size on disk")
+    args = parser.parse_args()
+
+    tts = TTSCache(args.dir)
+    if args.command == "prerender":
+        start = time.perf_counter()
+        result = prerender(tts, args.domain, args.langs, args.workers)
+        print(f"{result} in {time.perf_counter() - start:.1f}s")
+        if result["untranslated"]:
+            print("untranslated responses are skipped; build the translation memory first", file=sys.stderr)
+        if tts.evictions:
+            print(f"{tts.evictions} files evicted: TTS_CACHE_MAX_MB is too small for the pre-rendered set", file=sys.stderr)
+    print(tts.stats())
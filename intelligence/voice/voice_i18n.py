@@ -1,14 +1,14 @@
 # core/utils/voice_i18n.py
-import re
 import logging
 import os
 from pathlib import Path
 from typing import Optional
 from dotenv import load_dotenv
 
-import requests
-from langdetect import detect as langdetect_detect
-from gtts import gTTS
+from intelligence.llm_client import complete_sync, get_llm_client
+from intelligence.voice.language_detect import detect_script_language
+from intelligence.voice.tts_cache import clean_for_speech, get_tts_cache
+from intelligence.voice.translation_memory import USE_TRANSLATION_MEMORY, get_translation_memory
 import speech_recognition as sr
 import pyttsx3
 
@@ -32,80 +32,55 @@ SUPPORTED_LANGS = {"en", "hi", "bn"}
 
 # -------------------- Language Detection (informational only) --------------------
 def detect_language(text: str) -> str:
-    if not text or not text.strip():
-        return DEFAULT_LANG
-    try:
-        return langdetect_detect(text)
-    except Exception:
-        pass
+    """
+    hi / bn from the script, langdetect only for ambiguous Latin text
+    (see intelligence/voice/language_detect.py). Always one of SUPPORTED_LANGS.
+    """
+    return detect_script_language(text, SUPPORTED_LANGS, DEFAULT_LANG)
 
-    if re.search(r"[\u0900-\u097F]", text):
-        return "hi"
-    if re.search(r"[\u0980-\u09FF]", text):
-        return "bn"
 
-    return DEFAULT_LANG
+# -------------------- LLM TRANSLATION --------------------
+def _translation_prompt(tgt: str) -> str:
+    return f"You are a helpful assistant that translates text to {tgt}. Return ONLY the translated text and nothing else."
 
 
-# -------------------- GEMINI TRANSLATION (CORRECT FORMAT) --------------------
-def _translate_via_llm(text: str, tgt: str, timeout: int = 10) -> Optional[str]:
+def _translate_via_llm(text: str, tgt: str, timeout: Optional[float] = None) -> Optional[str]:
     """
-    Groq API translator using OpenAI-compatible chat completions.
+    Translation through the shared LLM client (cached, breaker-guarded).
+    `timeout` overrides the client's deadline (LLM_DEADLINE_SECONDS).
     """
     if not USE_LLM_TRANSLATION or not LLM_API_URL or not LLM_API_KEY:
         LOG.warning("Translation backend misconfigured.")
         return None
+    return complete_sync("translation", text, system=_translation_prompt(tgt), target=tgt, deadline=timeout)
 
-    # Groq Payload Format
-    payload = {
-        "model": GROQ_MODEL,
-        "messages": [
-            {
-                "role": "system",
-                "content": f"You are a helpful assistant that translates text to {tgt}. Return ONLY the translated text and nothing else."
-            },
-            {
-                "role": "user",
-                "content": text
-            }
-        ],
-        "temperature": 0.2
-    }
-
-    try:
-        resp = requests.post(
-            LLM_API_URL,
-            headers={
-                "Content-Type": "application/json",
-                "Authorization": f"Bearer {LLM_API_KEY}"
-            },
-            json=payload,
-            timeout=timeout,
-        )
-        
-        if resp.status_code == 429:
-            LOG.error("Groq Quota Exceeded (429).")
-            return None
-            
-        resp.raise_for_status()
-        data = resp.json()
-
-        # Parse OpenAI-style response
-        if "choices" in data and len(data["choices"]) > 0:
-            return data["choices"][0]["message"]["content"].strip()
 
-        LOG.error("Groq response format not recognized: %s", data)
+async def _translate_via_llm_async(text: str, tgt: str, timeout: Optional[float] = None) -> Optional[str]:
+    if not USE_LLM_TRANSLATION or not LLM_API_URL or not LLM_API_KEY:
+        LOG.warning("Translation backend misconfigured.")
+        return None
+    return await get_llm_client().complete(
+        "translation", text, system=_translation_prompt(tgt), target=tgt, deadline=timeout
+    )
 
-    except Exception:
-        LOG.exception("Groq translation failed")
+# -------------------- Unified Translation API --------------------
+def _translate_from_memory(text: str, tgt: str) -> Optional[str]:
+    """
+    Pre-built translation of a domain response (no network call).
+    """
+    if not USE_TRANSLATION_MEMORY:
+        return None
+    return get_translation_memory().lookup(text, tgt)
 
-    return None
 
-# -------------------- Unified Translation API --------------------
 def translate_text(text: str, tgt: str) -> str:
     if not text or tgt not in SUPPORTED_LANGS:
         return text
 
+    remembered = _translate_from_memory(text, tgt)
+    if remembered:
+        return remembered
+
     if not USE_LLM_TRANSLATION:
         LOG.warning("Translation skipped: USE_LLM_TRANSLATION is set to False")
         return text
@@ -121,6 +96,21 @@ def translate_text(text: str, tgt: str) -> str:
     return text
 
 
+async def translate_text_async(text: str, tgt: str) -> str:
+    """
+    translate_text() for callers already on an event loop.
+    """
+    if not text or tgt not in SUPPORTED_LANGS:
+        return text
+    remembered = _translate_from_memory(text, tgt)
+    if remembered:
+        return remembered
+    if not USE_LLM_TRANSLATION or not LLM_API_URL:
+        return text
+    translated = await _translate_via_llm_async(text, tgt)
+    return translated or text
+
+
 # -------------------- Speech Recognition --------------------
 def listen_for_query(timeout: float = 5.0, prefer_lang: Optional[str] = None) -> Optional[str]:
     if sr is None:
@@ -150,19 +140,24 @@ def listen_for_query(timeout: float = 5.0, prefer_lang: Optional[str] = None) ->
 
 
 # -------------------- Text-to-Speech --------------------
-def speak_response(text: str, lang_code: Optional[str] = None):
-    clean = re.sub(r"<[^>]+>", "", text or "").strip()
+def synthesize_speech(text: str, lang_code: str) -> Optional[str]:
+    """
+    Path of an mp3 of `text` from the shared TTS cache (rendered on a miss).
+    """
+    path = get_tts_cache().path_for(text, lang_code)
+    return str(path) if path else None
+
+
+def speak_response(text: str, lang_code: Optional[str] = None) -> Optional[str]:
+    clean = clean_for_speech(text)
     if not clean:
-        return
+        return None
 
     if lang_code in ("hi", "bn"):
-        try:
-            tts = gTTS(text=clean, lang=lang_code)
-            path = os.path.join(os.getcwd(), "bankbot_tts.mp3")
-            tts.save(path)
-            return
-        except Exception:
-            LOG.warning("gTTS failed; falling back to pyttsx3")
+        path = synthesize_speech(clean, lang_code)
+        if path:
+            return path
+        LOG.warning("gTTS failed; falling back to pyttsx3")
 
     try:
         engine = pyttsx3.init()
@@ -171,6 +166,7 @@ def speak_response(text: str, lang_code: Optional[str] = None):
         engine.runAndWait()
     except Exception:
         LOG.exception("TTS failed")
+    return None
 
 
 # -------------------- CLI TEST HARNESS --------------------